@@ -0,0 +1 @@
+"""Sea Wolf — Ocean Cleanup game rules and headless tooling."""
@@ -0,0 +1,79 @@
+"""
+Content-hashed static asset bundle (no Streamlit import).
+
+Files under ``assets/`` are copied into Streamlit's ``static/`` folder as
+``<stem>.<hash><suffix>``. Relative ``url(...)`` references in stylesheets are
+rewritten to the hashed names first, so a stylesheet's hash changes whenever a
+font or image it points at does. ``static/manifest.json`` maps logical names
+to hashed ones. A hashed file never changes content, so it can be cached
+forever (see ``serve.py``).
+
+    python -m seawolf.assets        # build ahead of time (read-only deploys)
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+from typing import Dict
+
+ROOT = Path(__file__).resolve().parent.parent
+SRC_DIR = ROOT / "assets"
+OUT_DIR = ROOT / "static"
+MANIFEST = "manifest.json"
+HASH_LEN = 10
+
+_URL = re.compile(r"""url\((['"]?)(?!data:|[a-z]+:|/)([^'")]+)\1\)""")
+
+
+def hashed_name(rel: str, data: bytes) -> str:
+    p = Path(rel)
+    return p.with_name(f"{p.stem}.{hashlib.sha256(data).hexdigest()[:HASH_LEN]}{p.suffix}").as_posix()
+
+
+def _rewrite_css(rel: str, text: str, manifest: Dict[str, str]) -> str:
+    base = Path(rel).parent
+
+    def sub(m: re.Match) -> str:
+        target = (base / m.group(2)).as_posix()
+        if target not in manifest:
+            raise FileNotFoundError(f"{rel}: url({m.group(2)}) is not in {SRC_DIR.name}/")
+        return f"url({m.group(1)}{Path(manifest[target]).relative_to(base).as_posix()}{m.group(1)})"
+
+    return _URL.sub(sub, text)
+
+
+def build_assets(src: Path = SRC_DIR, out: Path = OUT_DIR) -> Dict[str, str]:
+    """Copy ``src`` into ``out`` under content-hashed names; returns the manifest."""
+    files = sorted(p.relative_to(src).as_posix() for p in src.rglob("*") if p.is_file())
+    manifest: Dict[str, str] = {}
+    # stylesheets last, so every file they reference is already hashed
+    for rel in sorted(files, key=lambda r: r.endswith(".css")):
+        data = (src / rel).read_bytes()
+        if rel.endswith(".css"):
+            data = _rewrite_css(rel, data.decode("utf-8"), manifest).encode("utf-8")
+        name = hashed_name(rel, data)
+        target = out / name
+        if not target.exists():
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target.write_bytes(data)
+        manifest[rel] = name
+
+    old = load_manifest(out)
+    for stale in set(old.values()) - set(manifest.values()):
+        (out / stale).unlink(missing_ok=True)
+    if manifest != old:
+        (out / MANIFEST).write_text(json.dumps(manifest, indent=1, sort_keys=True))
+    return manifest
+
+
+def load_manifest(out: Path = OUT_DIR) -> Dict[str, str]:
+    try:
+        return json.loads((out / MANIFEST).read_text())
+    except FileNotFoundError:
+        return {}
+
+
+if __name__ == "__main__":
+    for rel, name in build_assets().items():
+        print(f"{rel} → static/{name}")
@@ -0,0 +1,141 @@
+"""
+Batch game generator producing NumPy arrays instead of dict trees.
+
+Same distribution as ``generate_game`` (not the same games — it draws from a
+NumPy ``Generator``, not ``random.Random``):
+
+  - each attribute range uniform over ``POSSIBLE_RANGES``;
+  - site traits drawn without replacement from ``ALL_TRAITS`` while enough
+    unused traits remain, then 5 of all 15 per site;
+  - microbe attributes uniform 1–10; trait desired 30 %, undesired 15 %,
+    otherwise uniform over the site's 5 traits;
+  - names unique within a game, icons uniform.
+
+Pool slots per site follow ``seawolf.game.POOL_SLOTS``.
+"""
+
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+from .game import (
+    DEFAULT_CONFIG, NUM_SITES, FIXED_ATTRIBUTES, POSSIBLE_RANGES, ALL_TRAITS, PREFIXES, SUFFIXES, ICONS,
+    STEP2_SLOT, GIVEN_SLOT, ROUND_SLOT, POOL_SLOTS, name_at,
+)
+
+
+STEP2_SLOTS = slice(STEP2_SLOT, GIVEN_SLOT)
+GIVEN_SLOTS = slice(GIVEN_SLOT, ROUND_SLOT)
+ROUND_SLOTS = slice(ROUND_SLOT, POOL_SLOTS)
+SITE_TRAITS = 5
+NUM_NAMES = len(PREFIXES) * len(SUFFIXES)
+
+# Trait codes are indices into the site's ``all_traits``
+DESIRED, UNDESIRED = 0, 1
+
+_RANGES = np.array(POSSIBLE_RANGES, dtype=np.uint8)
+
+
+@dataclass
+class GameBatch:
+    attrs: np.ndarray        # (N, S, 28, 3) uint8, 1–10
+    traits: np.ndarray       # (N, S, 28) uint8, index into the site's 5 traits
+    site_traits: np.ndarray  # (N, S, 5) uint8, index into ALL_TRAITS (desired, undesired, 3 neutral)
+    ranges: np.ndarray       # (N, S, 3) uint8, index into POSSIBLE_RANGES
+    names: np.ndarray        # (N, S, 28) uint8 / uint16, index into the name namespace (``name_at``)
+    icons: np.ndarray        # (N, S, 28) uint8, index into ICONS
+
+    def __len__(self) -> int:
+        return self.attrs.shape[0]
+
+    def bounds(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Attribute ranges as (lo, hi) arrays of shape (N, S, 3)."""
+        r = _RANGES[self.ranges]
+        return r[..., 0], r[..., 1]
+
+    def game(self, k: int) -> Tuple[List[dict], Dict[int, dict]]:
+        """Materialize game ``k`` in the ``generate_game`` dict format."""
+        sites, all_microbes = [], {}
+        for si in range(self.attrs.shape[1]):
+            t5 = [ALL_TRAITS[t] for t in self.site_traits[k, si]]
+            sites.append({
+                "site_num": si + 1,
+                "attr_names": list(FIXED_ATTRIBUTES),
+                "attr_ranges": {a: POSSIBLE_RANGES[r] for a, r in zip(FIXED_ATTRIBUTES, self.ranges[k, si])},
+                "desired_trait": t5[0],
+                "undesired_trait": t5[1],
+                "neutral_traits": t5[2:],
+                "all_traits": t5,
+            })
+            pool = [self._microbe(k, si, slot, t5) for slot in range(POOL_SLOTS)]
+            all_microbes[si] = {
+                "step2": pool[STEP2_SLOTS],
+                "step3_given": pool[GIVEN_SLOTS],
+                "step3_rounds": [pool[ROUND_SLOT + 3 * r:ROUND_SLOT + 3 * r + 3] for r in range(4)],
+            }
+        return sites, all_microbes
+
+    def _microbe(self, k: int, si: int, slot: int, t5: List[str]) -> dict:
+        return {
+            "name": name_at(int(self.names[k, si, slot])),
+            "icon": ICONS[self.icons[k, si, slot]],
+            "attributes": {a: int(v) for a, v in zip(FIXED_ATTRIBUTES, self.attrs[k, si, slot])},
+            "trait": t5[self.traits[k, si, slot]],
+        }
+
+
+def _site_traits(rng: np.random.Generator, n: int, sites: int) -> np.ndarray:
+    out = np.empty((n, sites, SITE_TRAITS), dtype=np.uint8)
+    fresh = len(ALL_TRAITS) // SITE_TRAITS   # sites served from unused traits
+    perm = rng.permuted(np.tile(np.arange(len(ALL_TRAITS), dtype=np.uint8), (n, 1)), axis=1)
+    k = min(fresh, sites)
+    out[:, :k] = perm[:, :k * SITE_TRAITS].reshape(n, k, SITE_TRAITS)
+    for si in range(k, sites):
+        perm = rng.permuted(np.tile(np.arange(len(ALL_TRAITS), dtype=np.uint8), (n, 1)), axis=1)
+        out[:, si] = perm[:, :SITE_TRAITS]
+    return out
+
+
+def _fill(rng: np.random.Generator, b: GameBatch, s: slice):
+    n, sites = b.attrs[s].shape[:2]
+    shape = (n, sites, POOL_SLOTS)
+
+    b.ranges[s] = rng.integers(0, len(POSSIBLE_RANGES), (n, sites, len(FIXED_ATTRIBUTES)), dtype=np.uint8)
+    b.site_traits[s] = _site_traits(rng, n, sites)
+    b.attrs[s] = rng.integers(1, 11, shape + (len(FIXED_ATTRIBUTES),), dtype=np.uint8)
+
+    r = rng.random(shape)
+    traits = rng.integers(0, SITE_TRAITS, shape, dtype=np.uint8)
+    traits[r < DEFAULT_CONFIG.undesired_below] = UNDESIRED
+    traits[r < DEFAULT_CONFIG.p_desired] = DESIRED
+    b.traits[s] = traits
+
+    names = rng.permuted(np.tile(np.arange(NUM_NAMES, dtype=np.uint8), (n, 1)), axis=1)
+    b.names[s] = names[:, :sites * POOL_SLOTS].reshape(shape)
+    b.icons[s] = rng.integers(0, len(ICONS), shape, dtype=np.uint8)
+
+
+def generate_batch(n: int, seed=None, sites: int = NUM_SITES, chunk: int = 1 << 16) -> GameBatch:
+    """Generate ``n`` games as arrays, ``chunk`` games at a time."""
+    if sites * POOL_SLOTS > NUM_NAMES:
+        raise ValueError(f"{sites} sites need more than {NUM_NAMES} unique names")
+    rng = np.random.default_rng(seed)
+    b = GameBatch(
+        attrs=np.empty((n, sites, POOL_SLOTS, len(FIXED_ATTRIBUTES)), dtype=np.uint8),
+        traits=np.empty((n, sites, POOL_SLOTS), dtype=np.uint8),
+        site_traits=np.empty((n, sites, SITE_TRAITS), dtype=np.uint8),
+        ranges=np.empty((n, sites, len(FIXED_ATTRIBUTES)), dtype=np.uint8),
+        names=np.empty((n, sites, POOL_SLOTS), dtype=np.uint8),
+        icons=np.empty((n, sites, POOL_SLOTS), dtype=np.uint8),
+    )
+    for start in range(0, n, chunk):
+        _fill(rng, b, slice(start, min(start + chunk, n)))
+    return b
+
+
+def iter_batches(n: int, batch_size: int = 1 << 16, seed=None, sites: int = NUM_SITES) -> Iterator[GameBatch]:
+    """Yield ``n`` games in batches of ``batch_size`` from one reproducible stream."""
+    ss = np.random.SeedSequence(seed)
+    for child, start in zip(ss.spawn((n + batch_size - 1) // batch_size), range(0, n, batch_size)):
+        yield generate_batch(min(batch_size, n - start), seed=child, sites=sites)
@@ -0,0 +1,103 @@
+"""
+Throughput benchmarks: games per second on one core, per play path.
+
+    python -m seawolf.bench              # every benchmark
+    python -m seawolf.bench engine -n 5000
+
+  generate   ``generate_game``: 3 sites × 28 microbe dicts per game
+  engine     scripted ``GameEngine`` play of pregenerated games (first-choice script)
+  batch      ``generate_batch``: the same games as NumPy arrays
+  vecenv     ``play_batch`` of the random / greedy strategies over a pregenerated batch
+
+Measured on one core (Python 3.11, NumPy 2.4): generate ~1.3k, engine ~4k,
+batch ~77k, vecenv random ~85k and greedy ~40k games/s. The dict-based engine
+allocates ~84 microbe dicts and runs ~30 transitions per game, so it stays in
+the thousands; 100k games/s per core is the target of the array paths only.
+"""
+
+import argparse
+import time
+from typing import Callable, Dict
+
+from .game import generate_game
+from .engine import GameEngine, KEEP, TRIO
+from .batch import generate_batch
+from .vecenv import load_strategy, play_batch
+
+
+def scripted_game(eng: GameEngine) -> int:
+    """Play ``eng`` to the end always taking the first option; the total score."""
+    while eng.phase == "playing":
+        step = eng.cur_step
+        if step == "step0":
+            eng.review_saved(True)
+        elif step == "step1":
+            eng.confirm_profile(list(eng.site.all_traits[:2]))
+        elif step == "step2":
+            while eng.step2_current() is not None:
+                eng.categorize(KEEP)
+            eng.finish_step2()
+        elif step == "step3":
+            while eng.round_candidates():
+                eng.pick_candidate(0)
+            eng.finish_step3()
+        else:
+            eng.select_trio(range(TRIO))
+            eng.submit()
+    return eng.total_score()
+
+
+# ─── BENCHMARKS ───────────────────────────────────────────────────────────────
+# Each takes a game count and returns the seconds spent on the measured part only.
+def _generate(n: int) -> float:
+    t = time.perf_counter()
+    for seed in range(n):
+        generate_game(seed)
+    return time.perf_counter() - t
+
+
+def _engine(n: int) -> float:
+    games = [generate_game(seed) for seed in range(n)]
+    t = time.perf_counter()
+    for seed, game in enumerate(games):
+        scripted_game(GameEngine(seed, game=game))
+    return time.perf_counter() - t
+
+
+def _batch(n: int) -> float:
+    t = time.perf_counter()
+    generate_batch(n, seed=0)
+    return time.perf_counter() - t
+
+
+def _vecenv(n: int) -> float:
+    games = generate_batch(n, seed=0)
+    t = time.perf_counter()
+    for name in ("random", "greedy"):
+        play_batch(load_strategy(name), games)
+    return (time.perf_counter() - t) / 2
+
+
+BENCHMARKS: Dict[str, Callable[[int], float]] = {
+    "generate": _generate, "engine": _engine, "batch": _batch, "vecenv": _vecenv,
+}
+DEFAULT_GAMES = {"generate": 2_000, "engine": 2_000, "batch": 200_000, "vecenv": 100_000}
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("benchmarks", nargs="*", metavar="BENCHMARK",
+                    help=f"any of {', '.join(BENCHMARKS)} (default: all)")
+    ap.add_argument("-n", "--games", type=int, default=None, help="games per benchmark")
+    args = ap.parse_args(argv)
+
+    for name in args.benchmarks or BENCHMARKS:
+        if name not in BENCHMARKS:
+            ap.error(f"unknown benchmark {name!r}")
+        n = args.games or DEFAULT_GAMES[name]
+        dt = BENCHMARKS[name](n)
+        print(f"{name:>9}: {n / dt:10,.0f} games/s  ({n} games in {dt:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
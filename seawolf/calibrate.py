@@ -0,0 +1,208 @@
+"""
+Difficulty-calibrated game seeds.
+
+A seed is screened by the whole-game oracle: its par score must fall in the
+tier's band, and the par line must be as wide / narrow as the tier asks
+(``n_optimal`` = trios per site reaching the planned score). ``VettedPool``
+keeps a bounded queue of pre-screened seeds per tier, refilled by background
+workers, so starting a game never pays the solver cost: an empty queue hands
+back ``None`` and the caller deals an unvetted game instead.
+
+Workers are plain ``python -m seawolf.calibrate --serve`` processes fed one
+JSON batch per line. ``multiprocessing`` children re-run the parent's
+``__main__``, which under ``streamlit run`` is the app script (whose
+``streamlit.py`` name shadows the package in a fresh interpreter).
+
+    python -m seawolf.calibrate expert -n 5
+"""
+
+import argparse
+import json
+import queue
+import random
+import subprocess
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, TextIO
+
+from .game import generate_game
+from .oracle import solve_game
+
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass(frozen=True)
+class Tier:
+    name: str
+    label: str
+    par_min: int = 0
+    par_max: int = 300
+    min_optimal: int = 1                 # every site has at least this many optimal trios
+    max_optimal: Optional[int] = None    # some site has at most this many
+
+    def accepts(self, par: int, n_optimal: List[int]) -> bool:
+        if not self.par_min <= par <= self.par_max:
+            return False
+        narrowest = min(n_optimal)
+        if narrowest < self.min_optimal:
+            return False
+        return self.max_optimal is None or narrowest <= self.max_optimal
+
+
+# Acceptance rates on random seeds: easy ~25 %, normal ~43 %, hard ~32 %, expert ~11 %
+TIERS: Dict[str, Tier] = {t.name: t for t in (
+    Tier("easy", "🟢 Easy — 100% with room to spare", par_min=300, min_optimal=10),
+    Tier("normal", "🔵 Normal — par 280–300", par_min=280, min_optimal=2, max_optimal=9),
+    Tier("hard", "🟠 Hard — par 260–280, no perfect game", par_min=260, par_max=280),
+    Tier("expert", "🔴 Expert — 100% through a single trio", par_min=300, max_optimal=1),
+)}
+
+
+def random_seed() -> int:
+    return random.SystemRandom().randrange(2**31)
+
+
+def screen(seed: int, tier: str) -> bool:
+    """Does ``generate_game(seed)`` fall in ``tier``?"""
+    r = solve_game(*generate_game(seed))
+    return TIERS[tier].accepts(r.par_score, r.n_optimal)
+
+
+def screen_many(tier: str, seeds: Iterable[int]) -> List[int]:
+    """The seeds among ``seeds`` that fall in ``tier`` (worker entry point)."""
+    return [s for s in seeds if screen(s, tier)]
+
+
+def find_seed(tier: str, max_tries: int = 10_000) -> int:
+    """Synchronously draw random seeds until one falls in ``tier``."""
+    for _ in range(max_tries):
+        seed = random_seed()
+        if screen(seed, tier):
+            return seed
+    raise RuntimeError(f"no {tier} game found in {max_tries} tries")
+
+
+# ─── WORKERS ──────────────────────────────────────────────────────────────────
+def serve(inp: TextIO = sys.stdin, out: TextIO = sys.stdout):
+    """Worker loop: a ``[tier, seeds]`` JSON line in, the accepted seeds out, until EOF."""
+    for line in inp:
+        tier, seeds = json.loads(line)
+        out.write(json.dumps(screen_many(tier, seeds)) + "\n")
+        out.flush()
+
+
+class _Worker:
+    """One screening process, used by a single feeder at a time."""
+
+    def __init__(self):
+        self.proc = subprocess.Popen([sys.executable, "-m", __name__, "--serve"], cwd=ROOT,
+                                     stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+
+    def screen_many(self, tier: str, seeds: List[int]) -> List[int]:
+        self.proc.stdin.write(json.dumps([tier, seeds]) + "\n")
+        self.proc.stdin.flush()
+        line = self.proc.stdout.readline()
+        if not line:
+            raise EOFError("screening worker exited")
+        return json.loads(line)
+
+    def close(self):
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=2)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+
+
+class VettedPool:
+    """
+    Bounded queues of pre-screened seeds per tier, kept full in the background.
+
+    Nothing runs until the first ``pop``: then ``workers`` processes start and
+    one feeder thread per tier hands them batches of random seeds, blocking on
+    its queue when it is full. ``close`` stops both.
+    """
+
+    def __init__(self, tiers: Iterable[str] = TIERS, size: int = 16, batch: int = 8, workers: int = 2):
+        self.batch = batch
+        self.n_workers = workers
+        self.queues: Dict[str, "queue.Queue[int]"] = {t: queue.Queue(maxsize=size) for t in tiers}
+        self._idle: "queue.Queue[Optional[_Worker]]" = queue.Queue()
+        self._workers: List[_Worker] = []
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def _start(self):
+        with self._lock:
+            if self._threads or self._stop.is_set():
+                return
+            self._workers = [_Worker() for _ in range(self.n_workers)]
+            for w in self._workers:
+                self._idle.put(w)
+            self._threads = [threading.Thread(target=self._feed, args=(t,), name=f"vetted-{t}", daemon=True)
+                             for t in self.queues]
+            for th in self._threads:
+                th.start()
+
+    def _feed(self, tier: str):
+        q = self.queues[tier]
+        while not self._stop.is_set():
+            worker = self._idle.get()
+            if worker is None:   # closing
+                return
+            try:
+                found = worker.screen_many(tier, [random_seed() for _ in range(self.batch)])
+            except (OSError, EOFError, ValueError):   # worker gone (closing)
+                return
+            finally:
+                self._idle.put(worker)
+            for seed in found:
+                while not self._stop.is_set():
+                    try:
+                        q.put(seed, timeout=0.5)
+                        break
+                    except queue.Full:
+                        continue
+
+    def pop(self, tier: str) -> Optional[int]:
+        """A vetted seed for ``tier`` if one is queued, else ``None``; never screens inline."""
+        self._start()
+        try:
+            return self.queues[tier].get_nowait()
+        except queue.Empty:
+            return None
+
+    def levels(self) -> Dict[str, int]:
+        return {t: q.qsize() for t, q in self.queues.items()}
+
+    def close(self):
+        with self._lock:
+            self._stop.set()
+        for _ in self._threads:
+            self._idle.put(None)
+        for w in self._workers:
+            w.close()
+        for th in self._threads:
+            th.join(timeout=2)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("tiers", nargs="*", metavar="TIER", help=f"any of {', '.join(TIERS)} (default: all)")
+    ap.add_argument("-n", "--seeds", type=int, default=3, help="seeds to find per tier")
+    ap.add_argument("--serve", action="store_true", help="run as a VettedPool worker on stdin / stdout")
+    args = ap.parse_args(argv)
+
+    if args.serve:
+        serve()
+        return
+    for tier in args.tiers or TIERS:
+        print(f"{tier:>7}: {' '.join(str(find_seed(tier)) for _ in range(args.seeds))}")
+
+
+if __name__ == "__main__":
+    main()
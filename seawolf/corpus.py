@@ -0,0 +1,237 @@
+"""
+Compact binary game corpus with memory-mapped random access.
+
+File layout (little endian):
+
+  header (32 bytes): magic ``b"SWGC"``, version u16, sites u16,
+                     record words u32, game count u64, zero padding
+  records:           one fixed-size record of u32 words per game
+
+Record = flags word (bit 0: the game has a seed), seed word (u32, 0 when
+absent), then per site one header word and ``POOL_SLOTS`` microbe words (slot
+order as in ``seawolf.batch``):
+
+  site word:    bits 0–8   3 × 3-bit index into POSSIBLE_RANGES
+                bits 9–28  5 × 4-bit index into ALL_TRAITS (desired, undesired, neutral…)
+  microbe word: bits 0–11  3 × 4-bit attribute (1–10)
+                bits 12–14 trait, index into the site's 5 ``all_traits``
+                bits 15–19 index into PREFIXES
+                bits 20–23 index into SUFFIXES
+                bits 24–28 index into ICONS
+                bits 29–31 name generation (0 = "Cyro Virus", 1 = "Cyro Virus II", … 7 = "… VIII")
+
+Game #k lives at ``32 + 4 * k * record_words``, so fetching it is O(1)
+without parsing the rest of the file.
+"""
+
+import mmap
+import struct
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .game import (
+    FIXED_ATTRIBUTES, POSSIBLE_RANGES, ALL_TRAITS, SUFFIXES, ICONS, NUM_SITES, name_index,
+)
+from .batch import GameBatch, NUM_NAMES, POOL_SLOTS, SITE_TRAITS
+
+
+MAGIC = b"SWGC"
+VERSION = 1
+HEADER = struct.Struct("<4sHHIQ")
+HEADER_SIZE = 32
+HAS_SEED = 0x1
+MAX_SEED = 0xFFFFFFFF
+MAX_GENERATION = 7   # 3 bits
+
+N_ATTR = len(FIXED_ATTRIBUTES)
+_HEAD_WORDS = 2   # flags, seed
+_SITE_WORDS = 1 + POOL_SLOTS
+
+
+def record_words(sites: int = NUM_SITES) -> int:
+    return _HEAD_WORDS + sites * _SITE_WORDS
+
+
+# ─── ENCODING ─────────────────────────────────────────────────────────────────
+def _pool(pool: Dict) -> List[dict]:
+    return pool["step2"] + pool["step3_given"] + [m for r in pool["step3_rounds"] for m in r]
+
+
+def _name_index(name: str) -> int:
+    i = name_index(name)
+    if i // NUM_NAMES > MAX_GENERATION:
+        raise ValueError(f"name {name!r}: the corpus holds name generations up to {MAX_GENERATION + 1}")
+    return i
+
+
+def game_to_batch(sites: List[dict], microbes: Dict) -> GameBatch:
+    """One ``generate_game`` result as a 1-game GameBatch."""
+    n_sites = len(sites)
+    b = GameBatch(
+        attrs=np.zeros((1, n_sites, POOL_SLOTS, N_ATTR), dtype=np.uint8),
+        traits=np.zeros((1, n_sites, POOL_SLOTS), dtype=np.uint8),
+        site_traits=np.zeros((1, n_sites, SITE_TRAITS), dtype=np.uint8),
+        ranges=np.zeros((1, n_sites, N_ATTR), dtype=np.uint8),
+        names=np.zeros((1, n_sites, POOL_SLOTS), dtype=np.uint16),
+        icons=np.zeros((1, n_sites, POOL_SLOTS), dtype=np.uint8),
+    )
+    for si, site in enumerate(sites):
+        t5 = site["all_traits"]
+        b.site_traits[0, si] = [ALL_TRAITS.index(t) for t in t5]
+        b.ranges[0, si] = [POSSIBLE_RANGES.index(tuple(site["attr_ranges"][a])) for a in FIXED_ATTRIBUTES]
+        for slot, m in enumerate(_pool(microbes[si])):
+            b.attrs[0, si, slot] = [m["attributes"][a] for a in FIXED_ATTRIBUTES]
+            b.traits[0, si, slot] = t5.index(m["trait"])
+            b.names[0, si, slot] = _name_index(m["name"])
+            b.icons[0, si, slot] = ICONS.index(m["icon"])
+    return b
+
+
+def _check_seeds(seeds: np.ndarray, n: int) -> np.ndarray:
+    seeds = np.asarray(seeds)
+    if seeds.shape != (n,):
+        raise ValueError(f"expected {n} seeds, got shape {seeds.shape}")
+    if seeds.dtype.kind not in "iu" and seeds.dtype != object:
+        raise ValueError(f"seeds must be integers, got {seeds.dtype}")
+    if n and (seeds.min() < 0 or seeds.max() > MAX_SEED):
+        raise ValueError(f"seeds must fit in 32 bits (0 to {MAX_SEED})")
+    return seeds.astype(np.uint32)
+
+
+def encode_batch(b: GameBatch, seeds: Optional[np.ndarray] = None) -> np.ndarray:
+    """GameBatch (and optionally one 32-bit seed per game) → (N, record_words) u32 records."""
+    n, sites = b.attrs.shape[:2]
+    u32 = np.uint32
+
+    site_w = np.zeros((n, sites), dtype=u32)
+    for a in range(N_ATTR):
+        site_w |= b.ranges[..., a].astype(u32) << u32(3 * a)
+    for t in range(SITE_TRAITS):
+        site_w |= b.site_traits[..., t].astype(u32) << u32(9 + 4 * t)
+
+    gen, i = np.divmod(b.names.astype(u32), u32(NUM_NAMES))
+    if gen.size and gen.max() > MAX_GENERATION:
+        raise ValueError(f"the corpus holds name generations up to {MAX_GENERATION + 1}")
+    p, s = np.divmod(i, u32(len(SUFFIXES)))
+    mic_w = b.traits.astype(u32) << u32(12)
+    for a in range(N_ATTR):
+        mic_w |= b.attrs[..., a].astype(u32) << u32(4 * a)
+    mic_w |= p << u32(15)
+    mic_w |= s << u32(20)
+    mic_w |= b.icons.astype(u32) << u32(24)
+    mic_w |= gen << u32(29)
+
+    rec = np.empty((n, record_words(sites)), dtype=u32)
+    if seeds is None:
+        rec[:, 0] = rec[:, 1] = 0
+    else:
+        rec[:, 0] = HAS_SEED
+        rec[:, 1] = _check_seeds(seeds, n)
+    body = rec[:, _HEAD_WORDS:].reshape(n, sites, _SITE_WORDS)
+    body[..., 0] = site_w
+    body[..., 1:] = mic_w
+    return rec
+
+
+def decode_batch(rec: np.ndarray, sites: int = NUM_SITES) -> GameBatch:
+    """(N, record_words) u32 records → GameBatch."""
+    n = rec.shape[0]
+    body = rec[:, _HEAD_WORDS:].reshape(n, sites, _SITE_WORDS)
+    site_w, mic_w = body[..., 0], body[..., 1:]
+    u8 = np.uint8
+
+    ranges = np.stack([(site_w >> (3 * a)) & 0x7 for a in range(N_ATTR)], axis=-1).astype(u8)
+    site_traits = np.stack([(site_w >> (9 + 4 * t)) & 0xF for t in range(SITE_TRAITS)], axis=-1).astype(u8)
+    attrs = np.stack([(mic_w >> (4 * a)) & 0xF for a in range(N_ATTR)], axis=-1).astype(u8)
+    names = (mic_w >> 29) * NUM_NAMES + ((mic_w >> 15) & 0x1F) * len(SUFFIXES) + ((mic_w >> 20) & 0xF)
+    return GameBatch(
+        attrs=attrs,
+        traits=((mic_w >> 12) & 0x7).astype(u8),
+        site_traits=site_traits,
+        ranges=ranges,
+        names=names.astype(np.uint16),
+        icons=((mic_w >> 24) & 0x1F).astype(u8),
+    )
+
+
+# ─── FILES ────────────────────────────────────────────────────────────────────
+class CorpusWriter:
+    """Append games to a corpus file; the game count is patched in on close."""
+
+    def __init__(self, path: str, sites: int = NUM_SITES):
+        self.sites = sites
+        self.count = 0
+        self._f = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        self._f.seek(0)
+        self._f.write(HEADER.pack(MAGIC, VERSION, self.sites, record_words(self.sites), self.count)
+                      .ljust(HEADER_SIZE, b"\0"))
+
+    def add_game(self, sites: List[dict], microbes: Dict, seed: Optional[int] = None):
+        self.add_batch(game_to_batch(sites, microbes), None if seed is None else np.array([seed]))
+
+    def add_batch(self, b: GameBatch, seeds: Optional[np.ndarray] = None):
+        if b.attrs.shape[1] != self.sites:
+            raise ValueError(f"corpus holds {self.sites}-site games, got {b.attrs.shape[1]}")
+        self._f.write(encode_batch(b, seeds).astype("<u4", copy=False).tobytes())
+        self.count += len(b)
+
+    def close(self):
+        if not self._f.closed:
+            end = self._f.tell()
+            self._write_header()
+            self._f.seek(end)
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class Corpus:
+    """Read-only, memory-mapped corpus; ``corpus[k]`` is game #k as dicts."""
+
+    def __init__(self, path: str):
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.sites, words, self.count = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a v{VERSION} Sea Wolf corpus")
+        if words != record_words(self.sites):
+            raise ValueError(f"{path}: unexpected record size {words}")
+        self.records = np.frombuffer(self._mm, dtype="<u4", count=self.count * words,
+                                     offset=HEADER_SIZE).reshape(self.count, words)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, k: int) -> Tuple[List[dict], Dict]:
+        if k < 0:
+            k += self.count
+        if not 0 <= k < self.count:
+            raise IndexError(k)
+        return decode_batch(self.records[k:k + 1], self.sites).game(0)
+
+    def seed(self, k: int) -> Optional[int]:
+        flags, seed = self.records[k, :_HEAD_WORDS].tolist()
+        return seed if flags & HAS_SEED else None
+
+    def batch(self, start: int, stop: int) -> GameBatch:
+        """Games ``start:stop`` decoded straight into arrays."""
+        return decode_batch(self.records[start:stop], self.sites)
+
+    def close(self):
+        self.records = None
+        self._mm.close()
+        self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
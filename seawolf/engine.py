@@ -0,0 +1,372 @@
+"""
+Headless Sea Wolf game engine.
+
+Holds the complete per-game state that used to live in ``st.session_state``
+and exposes the step0 → step4 flow as plain method calls, so games can be
+driven by the Streamlit view, by scripts, or by simulations without a rerun
+per transition. Must not import streamlit.
+
+The state is only the seed plus small ints: every per-site selection is a
+bitmask of refs into the game's immutable pool (see ``seawolf.game.microbe_ref``),
+and the Step 4 selection a bitmask of prospect positions, so membership and
+dedup are bit tests and ``state()`` is a handful of ints. The materialized game
+itself comes from a shared cache keyed by seed, unless one is handed in explicitly.
+"""
+
+from dataclasses import dataclass
+from typing import Callable, List, Tuple, Dict, Optional
+
+from .game import (
+    DEFAULT_CONFIG, NUM_SITES, TOTAL_TIME, PENALTY, FIXED_ATTRIBUTES, STEP2_SLOT, GIVEN_SLOT, ROUND_SLOT, SiteReqs, cached_game,
+    microbe_ref, microbe_at, mask_refs, refs_mask, to_microbe, to_site, score_treatment, build_step3_initial_mask,
+)
+
+
+STEP2_POOL = DEFAULT_CONFIG.step2_pool
+STEP3_GIVEN = DEFAULT_CONFIG.step3_given
+STEP3_ROUNDS = DEFAULT_CONFIG.step3_rounds
+ROUND_CANDIDATES = DEFAULT_CONFIG.round_candidates
+TRIO = 3
+
+KEEP, SAVE, REJECT = "keep", "save", "reject"
+
+
+class InvalidTransition(ValueError):
+    """Raised when a transition is not allowed in the current phase / step."""
+
+
+@dataclass
+class SelectionPreview:
+    """Provisional Step 4 result for the microbes selected so far."""
+    count: int
+    averages: Dict[str, float]
+    in_range: Dict[str, bool]
+    has_desired: bool
+    undesired: int
+    score: int
+
+
+class GameEngine:
+    """State machine for one game (3 sites × steps 0–4)."""
+
+    __slots__ = (
+        "seed", "phase", "cur_site", "cur_step",
+        "s2_index", "s0_index", "s3_round",
+        "s2_kept", "s2_saved", "s2_rejected", "s3_prospects", "s4_selection",
+        "site_scores", "site_details", "start_time", "_game", "_loader",
+        "s4_sums", "s4_desired", "s4_undesired",
+    )
+
+    def __init__(self, seed: int, start_time: Optional[float] = None, game=None,
+                 loader: Callable = cached_game):
+        self.seed = seed
+        self._game = game          # pinned game (scripts / tools); else looked up by seed
+        self._loader = loader
+
+        self.phase = "playing"
+        self.cur_site, self.cur_step = 0, "step1"
+        self.start_time = start_time
+
+        self.s2_index, self.s0_index, self.s3_round = 0, 0, 0
+        # per-site ref bitmasks
+        self.s2_kept: List[int] = [0] * NUM_SITES
+        self.s2_saved: List[int] = [0] * NUM_SITES
+        self.s2_rejected: List[int] = [0] * NUM_SITES
+        self.s3_prospects: List[int] = [0] * NUM_SITES
+        # bitmask of positions in the current site's prospect list, plus running totals over them
+        self.s4_selection = 0
+        self.s4_sums: List[int] = [0] * len(FIXED_ATTRIBUTES)
+        self.s4_desired = self.s4_undesired = 0
+        self.site_scores: Dict[int, int] = {}
+        self.site_details: Dict[int, List[str]] = {}
+
+    # ─── VIEWS ────────────────────────────────────────────────────────────────
+    @property
+    def game(self):
+        return self._game if self._game is not None else self._loader(self.seed)
+
+    @property
+    def sites(self) -> List[dict]:
+        return self.game[0]
+
+    @property
+    def microbes(self) -> Dict:
+        return self.game[1]
+
+    @property
+    def site(self) -> SiteReqs:
+        return self.site_reqs(self.cur_site)
+
+    def site_reqs(self, si: int) -> SiteReqs:
+        return to_site(self.sites[si])
+
+    def microbe(self, ref: int) -> dict:
+        return microbe_at(self.microbes, ref)
+
+    def materialize(self, mask: int) -> List[dict]:
+        """Microbes of a ref bitmask, in ref order."""
+        microbes = self.microbes
+        return [microbe_at(microbes, r) for r in mask_refs(mask)]
+
+    @property
+    def is_last_site(self) -> bool:
+        return self.cur_site >= NUM_SITES - 1
+
+    def prev_saved(self) -> List[int]:
+        """Refs saved for the current site during the previous site's Step 2."""
+        return mask_refs(self.s2_saved[self.cur_site - 1]) if self.cur_site > 0 else []
+
+    def step0_current(self) -> Optional[dict]:
+        saved = self.prev_saved()
+        return self.microbe(saved[self.s0_index]) if self.s0_index < len(saved) else None
+
+    def step2_pool(self) -> List[dict]:
+        return self.microbes[self.cur_site]["step2"]
+
+    def step2_current(self) -> Optional[dict]:
+        if self.s2_index >= STEP2_POOL:
+            return None
+        return self.microbe(microbe_ref(self.cur_site, STEP2_SLOT + self.s2_index))
+
+    def round_candidates(self) -> List[dict]:
+        if self.s3_round >= STEP3_ROUNDS:
+            return []
+        return self.microbes[self.cur_site]["step3_rounds"][self.s3_round]
+
+    def prospect_refs(self, si: Optional[int] = None) -> List[int]:
+        return mask_refs(self.s3_prospects[self.cur_site if si is None else si])
+
+    def prospects(self) -> List[dict]:
+        return self.materialize(self.s3_prospects[self.cur_site])
+
+    def selected(self) -> List[int]:
+        """Step 4: selected prospect positions, ascending."""
+        return mask_refs(self.s4_selection)
+
+    def preview(self) -> SelectionPreview:
+        """Live Step 4 preview from the running totals (no pass over the selection)."""
+        site = self.site
+        n = self.s4_selection.bit_count()
+        averages, in_range = {}, {}
+        for a, total in zip(FIXED_ATTRIBUTES, self.s4_sums):
+            lo, hi = site.attr_ranges[a]
+            averages[a] = total / n if n else 0.0
+            in_range[a] = n > 0 and lo * n <= total <= hi * n
+        penalties = sum(not ok for ok in in_range.values()) + (self.s4_desired == 0) + self.s4_undesired
+        return SelectionPreview(n, averages, in_range, self.s4_desired > 0, self.s4_undesired,
+                                max(0, 100 - penalties * PENALTY))
+
+    @property
+    def deadline(self) -> Optional[float]:
+        """Wall-clock time (same clock as ``start_time``) at which the game expires."""
+        return None if self.start_time is None else self.start_time + TOTAL_TIME
+
+    def total_score(self) -> int:
+        return sum(self.site_scores.get(i, 0) for i in range(NUM_SITES))
+
+    # ─── TRANSITIONS ──────────────────────────────────────────────────────────
+    def _require(self, step: str):
+        if self.phase != "playing" or self.cur_step != step:
+            raise InvalidTransition(f"expected {step}, game is at {self.phase}/{self.cur_step}")
+
+    def review_saved(self, keep: bool):
+        """Step 0: keep or reject the next microbe saved from the previous site."""
+        self._require("step0")
+        saved = self.prev_saved()
+        if self.s0_index >= len(saved):
+            raise InvalidTransition("no saved microbe left to review")
+        if keep:
+            self.s2_kept[self.cur_site] |= 1 << saved[self.s0_index]
+        self.s0_index += 1
+        if self.s0_index >= len(saved):
+            self.cur_step = "step1"
+            self.s0_index = 0
+
+    def confirm_profile(self, chosen: List[str]):
+        """Step 1: confirm a profile of exactly 2 characteristics."""
+        self._require("step1")
+        if len(chosen) != 2:
+            raise InvalidTransition("select exactly 2 characteristics")
+        self.cur_step = "step2"
+        self.s2_index = 0
+
+    def categorize(self, action: str):
+        """Step 2: keep / save / reject the microbe currently shown."""
+        self._require("step2")
+        if self.s2_index >= STEP2_POOL:
+            raise InvalidTransition("all microbes already categorized")
+        si = self.cur_site
+        bit = 1 << microbe_ref(si, STEP2_SLOT + self.s2_index)
+        if action == KEEP:
+            self.s2_kept[si] |= bit
+        elif action == SAVE:
+            if self.is_last_site:
+                raise InvalidTransition("cannot save microbes on the last site")
+            self.s2_saved[si] |= bit
+        elif action == REJECT:
+            self.s2_rejected[si] |= bit
+        else:
+            raise InvalidTransition(f"unknown action {action!r}")
+        self.s2_index += 1
+
+    def categorize_all(self, actions: List[str], names: Optional[List[str]] = None):
+        """
+        Step 2: categorize every remaining microbe at once, all or nothing.
+        ``names``, if given, must match the remaining pool in order (a client
+        that rendered a different pool is refused rather than misapplied).
+        """
+        self._require("step2")
+        remaining = self.step2_pool()[self.s2_index:]
+        if len(actions) != len(remaining):
+            raise InvalidTransition(f"expected {len(remaining)} actions, got {len(actions)}")
+        if names is not None and list(names) != [m["name"] for m in remaining]:
+            raise InvalidTransition("categorization does not match this site's microbes")
+        for a in actions:
+            if a not in (KEEP, SAVE, REJECT):
+                raise InvalidTransition(f"unknown action {a!r}")
+            if a == SAVE and self.is_last_site:
+                raise InvalidTransition("cannot save microbes on the last site")
+        for a in actions:
+            self.categorize(a)
+
+    def finish_step2(self):
+        """Step 2 → Step 3, seeding the prospect pool from kept microbes."""
+        self._require("step2")
+        if self.s2_index < STEP2_POOL:
+            raise InvalidTransition("microbes left to categorize")
+        si = self.cur_site
+        self.cur_step = "step3"
+        self.s3_round = 0
+        given = refs_mask(microbe_ref(si, GIVEN_SLOT + j) for j in range(STEP3_GIVEN))
+        self.s3_prospects[si] = build_step3_initial_mask(self.s2_kept[si], given)
+
+    def pick_candidate(self, ci: int):
+        """Step 3: pick candidate ``ci`` (0–2) of the current round."""
+        self._require("step3")
+        if self.s3_round >= STEP3_ROUNDS:
+            raise InvalidTransition("no rounds left")
+        if not 0 <= ci < ROUND_CANDIDATES:
+            raise InvalidTransition(f"no candidate {ci} in this round")
+        ref = microbe_ref(self.cur_site, ROUND_SLOT + ROUND_CANDIDATES * self.s3_round + ci)
+        self.s3_prospects[self.cur_site] |= 1 << ref   # a duplicate is the same bit
+        self.s3_round += 1
+
+    def finish_step3(self):
+        """Step 3 → Step 4."""
+        self._require("step3")
+        if self.s3_round < STEP3_ROUNDS:
+            raise InvalidTransition("prospect rounds left to play")
+        self.cur_step = "step4"
+        self._clear_selection()
+
+    def _clear_selection(self):
+        self.s4_selection = 0
+        self.s4_sums = [0] * len(FIXED_ATTRIBUTES)
+        self.s4_desired = self.s4_undesired = 0
+
+    def _tally(self, pi: int, sign: int):
+        m = self.microbe(self.prospect_refs()[pi])
+        site = self.sites[self.cur_site]
+        attrs = m["attributes"]
+        for i, a in enumerate(FIXED_ATTRIBUTES):
+            self.s4_sums[i] += sign * attrs[a]
+        if m["trait"] == site["desired_trait"]:
+            self.s4_desired += sign
+        elif m["trait"] == site["undesired_trait"]:
+            self.s4_undesired += sign
+
+    def set_selected(self, pi: int, selected: bool):
+        """Step 4: add or remove prospect ``pi`` from the treatment."""
+        self._require("step4")
+        if not 0 <= pi < self.s3_prospects[self.cur_site].bit_count():
+            raise InvalidTransition(f"no prospect {pi}")
+        bit = 1 << pi
+        if not selected:
+            if self.s4_selection & bit:
+                self.s4_selection ^= bit
+                self._tally(pi, -1)
+        elif not self.s4_selection & bit:
+            if self.s4_selection.bit_count() >= TRIO:
+                raise InvalidTransition(f"already {TRIO} microbes selected")
+            self.s4_selection |= bit
+            self._tally(pi, +1)
+
+    def toggle_selected(self, pi: int):
+        """Step 4: flip prospect ``pi`` in / out of the treatment."""
+        self.set_selected(pi, not self.s4_selection >> pi & 1)
+
+    def select_trio(self, picks: List[int]):
+        """Step 4: replace the selection with exactly the given prospects."""
+        self._require("step4")
+        picks = set(picks)
+        n = self.s3_prospects[self.cur_site].bit_count()
+        if len(picks) != TRIO or not all(0 <= pi < n for pi in picks):
+            raise InvalidTransition(f"a treatment needs {TRIO} distinct prospects")
+        self._clear_selection()
+        for pi in picks:
+            self.s4_selection |= 1 << pi
+            self._tally(pi, +1)
+
+    def submit(self) -> Tuple[int, List[str]]:
+        """Step 4: score the selected trio and move to the next site / results."""
+        self._require("step4")
+        if self.s4_selection.bit_count() != TRIO:
+            raise InvalidTransition(f"select exactly {TRIO} microbes")
+        si = self.cur_site
+        prospects = self.prospect_refs()
+        trio = [to_microbe(self.microbe(prospects[j])) for j in self.selected()]
+        score, details = score_treatment(self.site, trio)
+        self.site_scores[si] = score
+        self.site_details[si] = details
+        self._next_site_or_results()
+        return score, details
+
+    def time_up(self):
+        """Zero every unfinished site and end the game."""
+        for i in range(NUM_SITES):
+            if i not in self.site_scores:
+                self.site_scores[i] = 0
+                self.site_details[i] = ["⏰ Time's up — site not completed"]
+        self.phase = "results"
+
+    def _next_site_or_results(self):
+        si = self.cur_site
+        if si < NUM_SITES - 1:
+            self.cur_site = si + 1
+            # Step 0 only if previous site saved microbes exist
+            self.cur_step = "step0" if self.s2_saved[si] else "step1"
+
+            self._clear_selection()
+            self.s2_index = 0
+            self.s0_index = 0
+            self.s3_round = 0
+        else:
+            self.phase = "results"
+
+    # ─── PERSISTENCE ──────────────────────────────────────────────────────────
+    _STATE = ("seed", "phase", "cur_site", "cur_step", "s2_index", "s0_index", "s3_round",
+              "s2_kept", "s2_saved", "s2_rejected", "s3_prospects", "s4_selection", "start_time")
+
+    def state(self) -> dict:
+        """JSON-ready snapshot: ints, masks and the per-site results."""
+        out = {k: getattr(self, k) for k in self._STATE}
+        for k in ("s2_kept", "s2_saved", "s2_rejected", "s3_prospects"):
+            out[k] = list(out[k])
+        out["site_scores"] = [self.site_scores.get(i) for i in range(NUM_SITES)]
+        out["site_details"] = [self.site_details.get(i) for i in range(NUM_SITES)]
+        return out
+
+    @classmethod
+    def from_state(cls, state: dict, **kwargs) -> "GameEngine":
+        """Inverse of ``state()``; ``kwargs`` go to the constructor (game / loader)."""
+        eng = cls(state["seed"], **kwargs)
+        for k in cls._STATE:
+            setattr(eng, k, list(state[k]) if isinstance(state[k], list) else state[k])
+        eng.site_scores = {i: sc for i, sc in enumerate(state["site_scores"]) if sc is not None}
+        eng.site_details = {i: d for i, d in enumerate(state["site_details"]) if d is not None}
+        selection, eng.s4_selection = eng.s4_selection, 0
+        if selection:
+            for pi in mask_refs(selection):   # rebuild the running totals
+                eng.s4_selection |= 1 << pi
+                eng._tally(pi, +1)
+        return eng
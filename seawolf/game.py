@@ -0,0 +1,546 @@
+"""
+Sea Wolf game rules: constants, one-time game generation and scoring.
+
+Pure Python — no Streamlit import — so the rules can be shared by the UI,
+the headless engine and offline tools.
+"""
+
+import hashlib
+import json
+import random
+from dataclasses import dataclass, asdict
+from functools import lru_cache
+from typing import Callable, List, Tuple, Dict, Optional
+
+
+# ─── BALANCE ──────────────────────────────────────────────────────────────────
+@dataclass(frozen=True)
+class GameConfig:
+    """
+    Game-balance constants. ``DEFAULT_CONFIG`` is the game as shipped, and
+    the module constants below are its values; the UI and ``GameEngine`` only
+    play the default. Generation, scoring, ``simulate`` and ``oracle`` accept
+    other configs for offline tools (``seawolf.sweep``).
+    """
+    num_sites: int = 3
+    penalty: int = 20
+    # trait draw: desired, else undesired, else uniform over the site's 5 traits
+    p_desired: float = 0.30
+    p_undesired: float = 0.15
+    possible_ranges: Tuple[Tuple[int, int], ...] = (
+        (1, 3), (2, 4), (3, 5), (4, 6), (5, 7), (6, 8), (7, 9), (8, 10))
+    step2_pool: int = 10
+    step3_given: int = 6
+    step3_rounds: int = 4
+    round_candidates: int = 3
+    treatment_size: int = 3
+
+    def __post_init__(self):
+        if self.num_sites < 1 or self.penalty < 1:
+            raise ValueError("num_sites and penalty must be positive")
+        if not (0 <= self.p_desired and 0 <= self.p_undesired and self.p_desired + self.p_undesired <= 1):
+            raise ValueError("trait probabilities must be in [0, 1] and sum to at most 1")
+        if not self.possible_ranges or not all(1 <= lo <= hi <= 10 for lo, hi in self.possible_ranges):
+            raise ValueError("possible_ranges must be non-empty (lo, hi) pairs within 1–10")
+        if self.treatment_size < 1 or min(self.step2_pool, self.step3_rounds, self.round_candidates) < 1:
+            raise ValueError("pool and treatment sizes must be positive")
+        if self.step3_given + self.step3_rounds < self.treatment_size:
+            raise ValueError("Step 4 pool smaller than a treatment")
+        object.__setattr__(self, "possible_ranges", tuple(tuple(r) for r in self.possible_ranges))
+
+    # Pool slot layout of a site, see POOL SLOTS
+    @property
+    def given_slot(self) -> int:
+        return self.step2_pool
+
+    @property
+    def round_slot(self) -> int:
+        return self.step2_pool + self.step3_given
+
+    @property
+    def pool_slots(self) -> int:
+        return self.round_slot + self.step3_rounds * self.round_candidates
+
+    @property
+    def undesired_below(self) -> float:
+        # rounded so that 0.30 + 0.15 is exactly the 0.45 threshold the shipped game draws against
+        return round(self.p_desired + self.p_undesired, 12)
+
+    def key(self) -> str:
+        """Stable short hash of the values (cache key)."""
+        return hashlib.sha256(json.dumps(asdict(self), sort_keys=True).encode()).hexdigest()[:16]
+
+
+DEFAULT_CONFIG = GameConfig()
+
+
+# ─── CONSTANTS ────────────────────────────────────────────────────────────────
+TOTAL_TIME = 30 * 60
+NUM_SITES = DEFAULT_CONFIG.num_sites
+PENALTY = DEFAULT_CONFIG.penalty
+
+FIXED_ATTRIBUTES = ["Permeability", "Mobility", "Energy"]
+
+# Always width-2 intervals
+POSSIBLE_RANGES = list(DEFAULT_CONFIG.possible_ranges)
+
+ALL_TRAITS = [
+    "Heat-resistant", "Aerobic", "Hydrophilic", "Bioluminescent",
+    "Acidophilic", "UV-tolerant", "Phosphorus-removing",
+    "Cryogenic", "Alkaliphilic", "Photosensitive",
+    "Thermophilic", "Anaerobic", "Magnetotactic",
+    "Halophilic", "Chemotrophic",
+]
+
+PREFIXES = [
+    "Cyro", "Ops", "Neo", "Flux", "Zeta", "Axo", "Viro", "Plex",
+    "Kino", "Rho", "Sigma", "Tau", "Delta", "Omni", "Hexa", "Tera",
+    "Lyso", "Quor", "Myco", "Ecto", "Endo", "Para", "Xeno", "Meso"
+]
+
+SUFFIXES = ["Virus", "Amoeba", "Bacillus", "Spore", "Phage", "Coccus", "Flagella", "Microbe", "Cell", "Filament"]
+
+ICONS = ["🦠", "🧫", "🔬", "💊", "🧬", "⚗️", "🫧", "🌀", "💠", "🔮",
+         "🟣", "🔵", "🟢", "🟡", "⭕", "🔷", "🔶", "💎", "🌐", "⚛️"]
+
+
+# ─── DATA CLASSES ─────────────────────────────────────────────────────────────
+@dataclass
+class Microbe:
+    name: str
+    icon: str
+    attributes: Dict[str, int]   # Permeability, Mobility, Energy (1-10)
+    trait: str                   # exactly 1 trait
+
+    def __hash__(self):
+        return hash(self.name)
+
+    def __eq__(self, other):
+        return isinstance(other, Microbe) and self.name == other.name
+
+
+@dataclass
+class SiteReqs:
+    site_num: int
+    attr_names: List[str]
+    attr_ranges: Dict[str, Tuple[int, int]]
+    desired_trait: str
+    undesired_trait: str
+    neutral_traits: List[str]
+    all_traits: List[str]
+
+
+# ─── POOL SLOTS ───────────────────────────────────────────────────────────────
+# Every microbe of a game is addressed by a small int "ref" = site * POOL_SLOTS + slot.
+# Slots: 0–9 step2, 10–15 step3_given, 16–27 step3_rounds (round r, candidate c at 16 + 3*r + c).
+STEP2_SLOT, GIVEN_SLOT, ROUND_SLOT = 0, DEFAULT_CONFIG.given_slot, DEFAULT_CONFIG.round_slot
+POOL_SLOTS = DEFAULT_CONFIG.pool_slots
+
+
+def microbe_ref(si: int, slot: int) -> int:
+    return si * POOL_SLOTS + slot
+
+
+def microbe_at(microbes: Dict, ref: int) -> dict:
+    si, slot = divmod(ref, POOL_SLOTS)
+    pool = microbes[si]
+    if slot < GIVEN_SLOT:
+        return pool["step2"][slot]
+    if slot < ROUND_SLOT:
+        return pool["step3_given"][slot - GIVEN_SLOT]
+    r, c = divmod(slot - ROUND_SLOT, 3)
+    return pool["step3_rounds"][r][c]
+
+
+# Sets of refs are int bitmasks (bit ``ref`` set). Ascending ref order is also
+# the order the flow adds microbes in (carried < own Step 2 < given < rounds).
+def mask_refs(mask: int) -> List[int]:
+    """Refs in ``mask``, ascending."""
+    refs = []
+    while mask:
+        low = mask & -mask
+        refs.append(low.bit_length() - 1)
+        mask ^= low
+    return refs
+
+
+def refs_mask(refs) -> int:
+    mask = 0
+    for r in refs:
+        mask |= 1 << r
+    return mask
+
+
+# ─── GENERATION (one-time at game start) ──────────────────────────────────────
+# Every draw is a pure function of (seed, what, ..., draw index): a counter-based
+# splitmix64 stream, so a site or a single microbe is generated without replaying
+# the rest of the game, and without seeding a Mersenne Twister per microbe.
+_M64 = (1 << 64) - 1
+_GOLDEN = 0x9E3779B97F4A7C15
+
+# Stream domains
+_SITE, _MICROBE, _TRAITS = 1, 2, 3
+
+
+def _mix64(x: int) -> int:
+    """splitmix64 finalizer."""
+    x = (x + _GOLDEN) & _M64
+    x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+    x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _M64
+    return x ^ (x >> 31)
+
+
+class _Draws:
+    """
+    Counter-based stream: draw k of key (seed, *path) is ``_mix64(key + k·γ)``
+    (the splitmix64 sequence started at the key). Covers the subset of the
+    ``random.Random`` API that generation uses.
+    """
+    __slots__ = ("_state",)
+
+    def __init__(self, seed: int, *path: int):
+        h = _mix64(seed & _M64)
+        for x in path:
+            h = _mix64(h ^ x)
+        self._state = h
+
+    def _next(self) -> int:
+        self._state = (self._state + _GOLDEN) & _M64
+        x = self._state
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & _M64
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & _M64
+        return x ^ (x >> 31)
+
+    def below(self, n: int) -> int:
+        """Uniform on ``range(n)`` (rejection, no modulo bias)."""
+        limit = _M64 + 1 - (_M64 + 1) % n
+        while True:
+            x = self._next()
+            if x < limit:
+                return x % n
+
+    def fork(self, x: int) -> "_Draws":
+        """The stream at path (*path, x); only meaningful before any draw."""
+        child = _Draws.__new__(_Draws)
+        child._state = _mix64(self._state ^ x)
+        return child
+
+    def random(self) -> float:
+        return (self._next() >> 11) * (1.0 / (1 << 53))
+
+    def choice(self, seq):
+        return seq[self.below(len(seq))]
+
+    def sample(self, population, k: int) -> list:
+        pool = list(population)
+        for i in range(k):
+            j = i + self.below(len(pool) - i)
+            pool[i], pool[j] = pool[j], pool[i]
+        return pool[:k]
+
+
+def _stream(seed: int, *key) -> random.Random:
+    """A full ``random.Random`` keyed by (seed, *key) — for players, not generation."""
+    return random.Random(":".join(map(str, (seed,) + key)))
+
+
+_ROMAN = ((1000, "M"), (900, "CM"), (500, "D"), (400, "CD"), (100, "C"), (90, "XC"),
+          (50, "L"), (40, "XL"), (10, "X"), (9, "IX"), (5, "V"), (4, "IV"), (1, "I"))
+
+
+def _roman(n: int) -> str:
+    out = ""
+    for v, r in _ROMAN:
+        q, n = divmod(n, v)
+        out += r * q
+    return out
+
+
+def _from_roman(text: str) -> int:
+    n, i = 0, 0
+    for v, r in _ROMAN:
+        while text.startswith(r, i):
+            n, i = n + v, i + len(r)
+    if not n or i != len(text) or _roman(n) != text:
+        raise ValueError(f"{text!r} is not a roman numeral")
+    return n
+
+
+def name_at(index: int) -> str:
+    """
+    Name ``index`` of the namespace: the PREFIX × SUFFIX pairs ("Cyro Virus"),
+    then the same pairs again per generation ("Cyro Virus II", …).
+    """
+    gen, i = divmod(index, len(PREFIXES) * len(SUFFIXES))
+    p, s = divmod(i, len(SUFFIXES))
+    name = f"{PREFIXES[p]} {SUFFIXES[s]}"
+    return f"{name} {_roman(gen + 1)}" if gen else name
+
+
+def name_index(name: str) -> int:
+    """Inverse of ``name_at``; ``ValueError`` for anything it cannot produce."""
+    parts = name.split(" ")
+    try:
+        if not 2 <= len(parts) <= 3:
+            raise ValueError
+        gen = _from_roman(parts[2]) - 1 if len(parts) == 3 else 0
+        if len(parts) == 3 and not gen:   # the first generation carries no numeral
+            raise ValueError
+        i = PREFIXES.index(parts[0]) * len(SUFFIXES) + SUFFIXES.index(parts[1])
+    except ValueError:
+        raise ValueError(f"{name!r} is not a generated microbe name") from None
+    return gen * len(PREFIXES) * len(SUFFIXES) + i
+
+
+class NameAllocator:
+    """
+    Unique microbe names for one game: draw k → a distinct name in O(1).
+
+    The namespace is the PREFIX × SUFFIX pairs, extended by whole "generations"
+    ("Cyro Virus II", "Cyro Virus III", …) until it holds ``capacity`` names.
+    Draws go through a seeded Feistel permutation of the namespace (cycle-walking
+    off the power-of-4 domain), so they never collide and never retry.
+    """
+
+    ROUNDS = 4
+
+    def __init__(self, seed: int, capacity: int):
+        base = len(PREFIXES) * len(SUFFIXES)
+        self.capacity = capacity
+        self.size = base * max(1, -(-capacity // base))
+        self._half = max(1, (self.size - 1).bit_length() + 1) // 2
+        self._mask = (1 << self._half) - 1
+        self._keys = [_mix64((seed & _M64) * self.ROUNDS + r) for r in range(self.ROUNDS)]
+        # Round functions as lookup tables when a game draws at least as many names as a half-domain
+        self._tables = ([[_mix64(k ^ x) & self._mask for x in range(self._mask + 1)] for k in self._keys]
+                        if self._mask < capacity else None)
+
+    def _permute(self, x: int) -> int:
+        h, mask, tables = self._half, self._mask, self._tables
+        while True:
+            left, right = x >> h, x & mask
+            if tables:
+                for f in tables:
+                    left, right = right, left ^ f[right]
+            else:
+                for k in self._keys:
+                    left, right = right, left ^ (_mix64(k ^ right) & mask)
+            x = (left << h) | right
+            if x < self.size:
+                return x
+
+    def index(self, k: int) -> int:
+        """Namespace index of draw ``k``."""
+        if not 0 <= k < self.capacity:
+            raise IndexError(f"name draw {k} outside capacity {self.capacity}")
+        return self._permute(k)
+
+    def __getitem__(self, k: int) -> str:
+        return name_at(self.index(k))
+
+
+def _make_microbe(name: str, rng: _Draws, site_traits: List[str], desired: str, undesired: str,
+                  config: GameConfig = DEFAULT_CONFIG) -> dict:
+    """Create a microbe dict (serializable for session state)."""
+    # One bounded draw, read in mixed radix: attributes 1-10, icon, fallback trait
+    code = rng.below(10 ** len(FIXED_ATTRIBUTES) * len(ICONS) * len(site_traits))
+    code, other = divmod(code, len(site_traits))
+    code, icon = divmod(code, len(ICONS))
+    attrs = {}
+    for a in FIXED_ATTRIBUTES:
+        code, v = divmod(code, 10)
+        attrs[a] = v + 1
+    # Each microbe gets exactly 1 trait from the site's 5 traits
+    r = rng.random()
+    if r < config.p_desired:
+        trait = desired
+    elif r < config.undesired_below:
+        trait = undesired
+    else:
+        trait = site_traits[other]  # could be any of the 5
+    return {
+        "name": name,
+        "icon": ICONS[icon],
+        "attributes": attrs,
+        "trait": trait,
+    }
+
+
+def _site_traits(seed: int, si: int) -> List[str]:
+    """
+    The site's 5 traits. Sites draw without replacement from ALL_TRAITS while
+    unused traits remain (slices of one game-wide permutation), then 5 of all 15.
+    """
+    fresh = len(ALL_TRAITS) // 5
+    if si < fresh:
+        return list(_trait_perm(seed)[si * 5:si * 5 + 5])
+    return _Draws(seed, _TRAITS, si + 1).sample(ALL_TRAITS, 5)
+
+
+@lru_cache(maxsize=64)
+def _trait_perm(seed: int) -> Tuple[str, ...]:
+    """The game-wide permutation the first sites take their traits from (once per game)."""
+    return tuple(_Draws(seed, _TRAITS, 0).sample(ALL_TRAITS, len(ALL_TRAITS) // 5 * 5))
+
+
+def _make_site(seed: int, si: int, config: GameConfig = DEFAULT_CONFIG) -> dict:
+    """Create a site requirements dict."""
+    rng = _Draws(seed, _SITE, si)
+    ranges = {a: rng.choice(config.possible_ranges) for a in FIXED_ATTRIBUTES}
+    t5 = _site_traits(seed, si)
+
+    return {
+        "site_num": si + 1,
+        "attr_names": list(FIXED_ATTRIBUTES),
+        "attr_ranges": ranges,
+        "desired_trait": t5[0],
+        "undesired_trait": t5[1],
+        "neutral_traits": t5[2:],
+        "all_traits": t5,
+    }
+
+
+def _names(seed: int, sites: int = NUM_SITES, config: GameConfig = DEFAULT_CONFIG) -> NameAllocator:
+    return NameAllocator(seed, sites * config.pool_slots)
+
+
+def generate_microbe(seed: int, si: int, slot: int, site: Optional[dict] = None,
+                     names: Optional[NameAllocator] = None, config: GameConfig = DEFAULT_CONFIG) -> dict:
+    """The microbe in pool ``slot`` of site ``si`` — depends only on (seed, si, slot)."""
+    site = site or _make_site(seed, si, config)
+    names = names or _names(seed, max(config.num_sites, si + 1), config)
+    return _slot_microbe(_Draws(seed, _MICROBE, si), si, slot, site, names, config)
+
+
+def _slot_microbe(draws: _Draws, si: int, slot: int, site: dict, names: NameAllocator,
+                  config: GameConfig) -> dict:
+    return _make_microbe(names[si * config.pool_slots + slot], draws.fork(slot),
+                         site["all_traits"], site["desired_trait"], site["undesired_trait"], config)
+
+
+def generate_site(seed: int, si: int, names: Optional[NameAllocator] = None,
+                  config: GameConfig = DEFAULT_CONFIG) -> Tuple[dict, dict]:
+    """Site ``si`` of game ``seed``: its requirements dict and its microbe pool."""
+    site = _make_site(seed, si, config)
+    names = names or _names(seed, max(config.num_sites, si + 1), config)
+    draws = _Draws(seed, _MICROBE, si)
+    pool = [_slot_microbe(draws, si, slot, site, names, config) for slot in range(config.pool_slots)]
+    given, rounds, c = config.given_slot, config.round_slot, config.round_candidates
+    return site, {
+        "step2": pool[STEP2_SLOT:given],
+        "step3_given": pool[given:rounds],
+        "step3_rounds": [pool[rounds + c * r:rounds + c * r + c] for r in range(config.step3_rounds)],
+    }
+
+
+def generate_game(seed=None, config: GameConfig = DEFAULT_CONFIG):
+    """Generate all sites and all microbes upfront. Returns serializable dicts."""
+    if seed is None:
+        seed = random.randrange(2**31)
+    names = _names(seed, config.num_sites, config)
+    sites, all_microbes = [], {}
+    for si in range(config.num_sites):
+        site, pool = generate_site(seed, si, names, config)
+        sites.append(site)
+        all_microbes[si] = pool
+    return sites, all_microbes
+
+
+@lru_cache(maxsize=256)
+def cached_game(seed: int):
+    """Shared, bounded (LRU) game cache keyed by seed. Treat the result as immutable."""
+    return generate_game(seed)
+
+
+# ─── HELPERS (dict -> dataclass) ──────────────────────────────────────────────
+def to_microbe(d: dict) -> Microbe:
+    return Microbe(name=d["name"], icon=d["icon"], attributes=d["attributes"], trait=d["trait"])
+
+
+def to_site(d: dict) -> SiteReqs:
+    ar = {}
+    for k, v in d["attr_ranges"].items():
+        ar[k] = tuple(v) if isinstance(v, list) else v
+    return SiteReqs(
+        site_num=d["site_num"],
+        attr_names=d["attr_names"],
+        attr_ranges=ar,
+        desired_trait=d["desired_trait"],
+        undesired_trait=d["undesired_trait"],
+        neutral_traits=d["neutral_traits"],
+        all_traits=d["all_traits"],
+    )
+
+
+# ─── SCORING ──────────────────────────────────────────────────────────────────
+def score_treatment(site: SiteReqs, trio: List[Microbe],
+                    config: GameConfig = DEFAULT_CONFIG) -> Tuple[int, List[str]]:
+    """Score a treatment of any size (``config.treatment_size`` microbes in play)."""
+    details, penalties = [], 0
+
+    for a in site.attr_names:
+        vals = [m.attributes[a] for m in trio]
+        avg = sum(vals) / len(trio)
+        lo, hi = site.attr_ranges[a]
+        ok = lo <= avg <= hi
+        details.append(f"{'✅' if ok else '❌'} {a}: avg {avg:.1f} (range {lo}–{hi})")
+        if not ok:
+            penalties += 1
+
+    has_d = any(m.trait == site.desired_trait for m in trio)
+    details.append(f"{'✅' if has_d else '❌'} Desired «{site.desired_trait}»: {'present' if has_d else 'MISSING'}")
+    if not has_d:
+        penalties += 1
+
+    bad = [m.name for m in trio if m.trait == site.undesired_trait]
+    if not bad:
+        details.append(f"✅ Undesired «{site.undesired_trait}»: absent")
+    else:
+        penalties += len(bad)
+        details.append(f"❌ Undesired «{site.undesired_trait}»: found in {', '.join(bad)} "
+                       f"(−{len(bad) * config.penalty}%)")
+
+    return max(0, 100 - penalties * config.penalty), details
+
+
+# ─── STEP 3 ───────────────────────────────────────────────────────────────────
+def _name(m: dict) -> str:
+    return m.get("name")
+
+
+def build_step3_initial_prospects(kept: List, given: List, key: Callable = _name, size: int = 6) -> List:
+    """
+    Start Step 3 with microbes kept in Step 2 (up to ``size``),
+    then fill with step3_given to reach ``size`` (no duplicates by ``key``).
+    """
+    prospects0 = []
+    seen = set()
+
+    for m in kept:
+        n = key(m)
+        if n is not None and n not in seen:
+            prospects0.append(m)
+            seen.add(n)
+        if len(prospects0) == size:
+            return prospects0
+
+    for m in given:
+        n = key(m)
+        if n is not None and n not in seen:
+            prospects0.append(m)
+            seen.add(n)
+        if len(prospects0) == size:
+            break
+
+    return prospects0
+
+
+def build_step3_initial_mask(kept: int, given: int, size: int = 6) -> int:
+    """``build_step3_initial_prospects`` on ref bitmasks: a duplicate is the same bit."""
+    out = 0
+    for src in (kept, given):
+        while src and out.bit_count() < size:
+            low = src & -src
+            out |= low
+            src ^= low
+    return out
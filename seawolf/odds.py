@@ -0,0 +1,298 @@
+"""
+Outcome probabilities from the generation rules: exact where closed-form, sampled for pool maxima.
+
+Attributes are iid uniform on 1–10 (``_make_microbe``), traits iid desired /
+undesired / neutral with fixed odds, and each site range iid uniform over
+``POSSIBLE_RANGES``. A trio's penalties therefore factor per attribute: the
+attribute-sum distribution of 3 microbes (a convolution) against the range,
+plus a trait term. Averaging over random sites happens per attribute before
+convolving, since ranges are independent across attributes.
+
+Exact here:
+  - the score distribution of a random trio (for a given site, or a random one);
+  - the joint penalties of two trios sharing 0–2 microbes, hence the mean and
+    variance of the number of trios reaching each score in an n-microbe pool.
+
+Pool maxima are not closed-form: the C(n, 3) trios overlap, and the exact law
+of their best score ranges over all 1000^n attribute pools. From the two
+moments ``pool_odds`` only derives a lower bound on P(best ≥ s)
+(Dawson–Sankoff), and a loose one: 0.16 for a 100 % trio in a 10-pool, where
+the true value is about 0.30.
+
+Sampled, not exact: the best-score law of a pool, hence P(best = 100) and
+E[best], is a Monte Carlo estimate. ``SAMPLED_BEST`` ships the table
+(``sample_best`` regenerates it) and ``sampled_headline`` returns its figures
+as ``SampledEstimate`` values that carry their standard error.
+
+    python -m seawolf.odds -n 10
+    python -m seawolf.odds --table         # regenerate SAMPLED_BEST
+"""
+
+import argparse
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import product
+from math import comb
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from .game import DEFAULT_CONFIG, FIXED_ATTRIBUTES, PENALTY, POSSIBLE_RANGES, SiteReqs
+from .solver import TRIO, best_scores
+from .simulate import SITE_BINS
+
+
+ATTR_VALUES = range(1, 11)            # each attribute uniform on 1–10
+SITE_TRAITS = 5
+# _make_microbe: desired, else undesired, else uniform over the site's 5 traits
+_P_OTHER = 1 - DEFAULT_CONFIG.p_desired - DEFAULT_CONFIG.p_undesired
+P_DESIRED = DEFAULT_CONFIG.p_desired + _P_OTHER / SITE_TRAITS
+P_UNDESIRED = DEFAULT_CONFIG.p_undesired + _P_OTHER / SITE_TRAITS
+P_NEUTRAL = 1 - P_DESIRED - P_UNDESIRED
+DESIRED, UNDESIRED, NEUTRAL = 0, 1, 2
+_TRAIT_ODDS = (P_DESIRED, P_UNDESIRED, P_NEUTRAL)
+
+MAX_PENALTIES = len(FIXED_ATTRIBUTES) + 1 + TRIO    # every attribute, no desired, 3 undesired
+
+Ranges = Optional[Tuple[Tuple[int, int], ...]]      # per attribute; None = random site
+
+
+def _ranges(site: Optional[SiteReqs]) -> Ranges:
+    return None if site is None else tuple(site.attr_ranges[a] for a in site.attr_names)
+
+
+# ─── CONVOLUTIONS ─────────────────────────────────────────────────────────────
+@lru_cache(maxsize=None)
+def sum_pmf(k: int) -> np.ndarray:
+    """P(sum of ``k`` attribute values = s), indexed by s."""
+    one = np.zeros(max(ATTR_VALUES) + 1)
+    one[list(ATTR_VALUES)] = 1 / len(ATTR_VALUES)
+    pmf = np.ones(1)
+    for _ in range(k):
+        pmf = np.convolve(pmf, one)
+    pmf.setflags(write=False)
+    return pmf
+
+
+@lru_cache(maxsize=None)
+def _miss_table(shared: int, lo: int, hi: int) -> np.ndarray:
+    """
+    (2, 2) joint law of (trio 1 misses, trio 2 misses) the range on one
+    attribute, for two trios sharing ``shared`` microbes.
+    """
+    rest = np.concatenate([[0], np.cumsum(sum_pmf(TRIO - shared))])
+    table = np.zeros((2, 2))
+    for s, p in enumerate(sum_pmf(shared)):
+        a, b = np.clip((TRIO * lo - s, TRIO * hi - s + 1), 0, len(rest) - 1)
+        hit = rest[b] - rest[a]
+        m = np.array([hit, 1 - hit])
+        table += p * np.outer(m, m)
+    return table
+
+
+def _attr_table(shared: int, rng: Optional[Tuple[int, int]]) -> np.ndarray:
+    if rng is not None:
+        return _miss_table(shared, *rng)
+    return sum(_miss_table(shared, *r) for r in POSSIBLE_RANGES) / len(POSSIBLE_RANGES)
+
+
+@lru_cache(maxsize=None)
+def _trait_table(shared: int) -> np.ndarray:
+    """Joint law of the two trios' trait penalties (no desired: 1, each undesired: 1)."""
+    table = np.zeros((TRIO + 2, TRIO + 2))
+    for traits in product(range(len(_TRAIT_ODDS)), repeat=2 * TRIO - shared):
+        p = np.prod([_TRAIT_ODDS[t] for t in traits])
+        one, two = traits[:TRIO], traits[:shared] + traits[TRIO:]
+        table[_trait_penalties(one), _trait_penalties(two)] += p
+    return table
+
+
+def _trait_penalties(trio: Tuple[int, ...]) -> int:
+    return (DESIRED not in trio) + trio.count(UNDESIRED)
+
+
+def _convolve2(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    out = np.zeros((a.shape[0] + b.shape[0] - 1, a.shape[1] + b.shape[1] - 1))
+    for (i, j), p in np.ndenumerate(a):
+        out[i:i + b.shape[0], j:j + b.shape[1]] += p * b
+    return out
+
+
+@lru_cache(maxsize=1024)
+def _pair_penalties(shared: int, ranges: Ranges) -> np.ndarray:
+    table = _trait_table(shared)
+    for i in range(len(FIXED_ATTRIBUTES)):
+        table = _convolve2(table, _attr_table(shared, None if ranges is None else ranges[i]))
+    table.setflags(write=False)
+    return table
+
+
+def pair_penalty_pmf(shared: int, site: Optional[SiteReqs] = None) -> np.ndarray:
+    """
+    (P, P) joint law of the penalty counts of two random trios sharing
+    ``shared`` microbes (0–3), at ``site`` or a random site.
+    """
+    return _pair_penalties(shared, _ranges(site))
+
+
+def trio_penalty_pmf(site: Optional[SiteReqs] = None) -> np.ndarray:
+    """P(a random trio gets p penalties), indexed by p."""
+    return np.diag(pair_penalty_pmf(TRIO, site)).copy()
+
+
+def score_levels(penalty_pmf: np.ndarray) -> np.ndarray:
+    """Penalty law → law over site scores 0, 20, …, 100 (``SITE_BINS`` entries)."""
+    out = np.zeros(SITE_BINS)
+    np.add.at(out, np.maximum(0, SITE_BINS - 1 - np.arange(len(penalty_pmf))), penalty_pmf)
+    return out
+
+
+def trio_score_pmf(site: Optional[SiteReqs] = None) -> np.ndarray:
+    """P(a random trio scores 20·i), indexed by i."""
+    return score_levels(trio_penalty_pmf(site))
+
+
+# ─── POOLS ────────────────────────────────────────────────────────────────────
+@dataclass
+class PoolOdds:
+    """Per score level 0, 20, …, 100 (index i ↔ score ≥ 20·i) for an n-microbe pool."""
+    n: int
+    trio: np.ndarray       # P(a given trio scores ≥ level)
+    mean: np.ndarray       # E[number of trios scoring ≥ level]
+    var: np.ndarray        # its variance
+    lower: np.ndarray      # lower bound on P(best trio scores ≥ level)
+
+    def best_lower(self) -> float:
+        """Lower bound on the expected best score of the pool."""
+        return float(PENALTY * self.lower[1:].sum())
+
+
+def _at_most(table: np.ndarray, penalties: int) -> float:
+    return float(table[:penalties + 1, :penalties + 1].sum())
+
+
+def pool_odds(n: int = 10, site: Optional[SiteReqs] = None) -> PoolOdds:
+    """Exact trio-count moments and a best-score lower bound for ``n`` random microbes."""
+    if n < TRIO:
+        raise ValueError(f"a pool needs at least {TRIO} microbes")
+    trios = comb(n, TRIO)
+    # ordered pairs of trios sharing j microbes, per trio
+    pairs = [comb(TRIO, j) * comb(n - TRIO, TRIO - j) for j in range(TRIO + 1)]
+    tables = [pair_penalty_pmf(j, site) for j in range(TRIO + 1)]
+
+    levels = range(SITE_BINS)
+    trio = np.array([_at_most(tables[TRIO], SITE_BINS - 1 - i) if i else 1.0 for i in levels])
+    both = np.array([[_at_most(t, SITE_BINS - 1 - i) if i else 1.0 for t in tables] for i in levels])
+    mean = trios * trio
+    second = trios * (both @ pairs)
+    lower = np.array([_dawson_sankoff(mean[i], (second[i] - mean[i]) / 2) for i in levels])
+    return PoolOdds(n, trio, mean, second - mean ** 2, lower)
+
+
+def _dawson_sankoff(s1: float, s2: float) -> float:
+    """
+    Lower bound on P(any A_i) from S1 = Σ P(A_i) and S2 = Σ_{i<j} P(A_i ∩ A_j).
+    (Two moments give no useful upper bound here: trios sharing microbes are
+    strongly dependent, so the Kwerel and Hunter bounds stay near 1.)
+    """
+    if s1 <= 0:
+        return 0.0
+    k = int(2 * s2 // s1) + 1
+    return min(1.0, max(0.0, 2 * s1 / (k + 1) - 2 * s2 / (k * (k + 1))))
+
+
+# ─── SAMPLED MAXIMA ───────────────────────────────────────────────────────────
+SAMPLED_POOLS = 1_000_000
+
+# P(best trio scores 20·i), i = 0…5, for n random microbes at a random site;
+# sample_best(n, SAMPLED_POOLS, seed=n), so each entry has a standard error ≤ 0.0005.
+SAMPLED_BEST: Dict[int, Tuple[float, ...]] = {
+    3: (0.1316, 0.2234, 0.3306, 0.2321, 0.0738, 0.0085),
+    4: (0.0304, 0.0887, 0.2819, 0.3789, 0.1907, 0.0295),
+    5: (0.0074, 0.0332, 0.1785, 0.4114, 0.3072, 0.0623),
+    6: (0.0018, 0.0121, 0.1029, 0.3778, 0.4014, 0.1039),
+    7: (0.0004, 0.0043, 0.0572, 0.3190, 0.4683, 0.1508),
+    8: (0.0001, 0.0016, 0.0308, 0.2598, 0.5062, 0.2015),
+    9: (0.0000, 0.0006, 0.0164, 0.2059, 0.5242, 0.2530),
+    10: (0.0000, 0.0002, 0.0088, 0.1607, 0.5268, 0.3035),
+    11: (0.0000, 0.0001, 0.0046, 0.1253, 0.5186, 0.3515),
+    12: (0.0000, 0.0000, 0.0025, 0.0972, 0.5025, 0.3978),
+}
+
+
+def sample_best(n: int, pools: int, seed=None, chunk: int = 1 << 16) -> np.ndarray:
+    """
+    Counts of the best trio score (index i ↔ 20·i) over ``pools`` random
+    sites, each with ``n`` random microbes, solved by ``solver.best_scores``.
+    """
+    rng = np.random.default_rng(seed)
+    ranges = np.array(POSSIBLE_RANGES, dtype=np.int16)
+    counts = np.zeros(SITE_BINS, dtype=np.int64)
+    for s in range(0, pools, chunk):
+        m = min(chunk, pools - s)
+        attrs = rng.integers(ATTR_VALUES.start, ATTR_VALUES.stop, size=(m, n, len(FIXED_ATTRIBUTES)),
+                             dtype=np.int16)
+        traits = rng.choice(len(_TRAIT_ODDS), size=(m, n), p=_TRAIT_ODDS)
+        r = ranges[rng.integers(len(ranges), size=(m, len(FIXED_ATTRIBUTES)))]
+        best = best_scores(attrs, traits == DESIRED, traits == UNDESIRED, TRIO * r[..., 0], TRIO * r[..., 1])
+        counts += np.bincount(best // PENALTY, minlength=SITE_BINS)
+    return counts
+
+
+def sampled_best(n: int = 10) -> np.ndarray:
+    """P(best trio scores 20·i) for an ``n``-microbe pool: the sampled estimate in ``SAMPLED_BEST``."""
+    if n not in SAMPLED_BEST:
+        raise KeyError(f"no sampled table for {n}-microbe pools (have {min(SAMPLED_BEST)}–{max(SAMPLED_BEST)}); "
+                       f"use sample_best")
+    return np.array(SAMPLED_BEST[n])
+
+
+@dataclass(frozen=True)
+class SampledEstimate:
+    """A Monte Carlo estimate (not an exact figure) and its standard error."""
+    value: float
+    stderr: float
+
+    def __str__(self) -> str:
+        return f"{self.value:.4g} ± {self.stderr:.1g}"
+
+
+def sampled_headline(n: int = 10) -> Tuple[SampledEstimate, SampledEstimate]:
+    """(P(the pool holds a 100 % trio), expected best score), estimated from ``SAMPLED_BEST``."""
+    pmf = sampled_best(n)
+    scores = PENALTY * np.arange(SITE_BINS)
+    perfect, mean = float(pmf[-1]), float(scores @ pmf)
+    var = float((scores - mean) ** 2 @ pmf)
+    return (SampledEstimate(perfect, (perfect * (1 - perfect) / SAMPLED_POOLS) ** 0.5),
+            SampledEstimate(mean, (var / SAMPLED_POOLS) ** 0.5))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("-n", "--pool", type=int, default=10, help="microbes in the pool")
+    ap.add_argument("--table", action="store_true", help="re-sample and print SAMPLED_BEST")
+    args = ap.parse_args(argv)
+
+    if args.table:
+        print("SAMPLED_BEST: Dict[int, Tuple[float, ...]] = {")
+        for n in range(TRIO, 13):
+            counts = sample_best(n, SAMPLED_POOLS, seed=n)
+            print(f"    {n}: ({', '.join(f'{p:.4f}' for p in counts / SAMPLED_POOLS)}),")
+        print("}")
+        return
+
+    odds = pool_odds(args.pool)
+    sampled = sampled_best(args.pool) if args.pool in SAMPLED_BEST else None
+    print(f"random site, {args.pool}-microbe pool")
+    print("score   P(trio ≥)   E[trios ≥]   sd     P(best ≥)   sampled estimate")
+    for i in range(1, SITE_BINS):
+        print(f"  ≥{PENALTY * i:3d}   {odds.trio[i]:8.4f}   {odds.mean[i]:9.3f}  {np.sqrt(odds.var[i]):6.3f}"
+              f"   ≥ {odds.lower[i]:.3f}" + (f"     {sampled[i:].sum():.3f}" if sampled is not None else ""))
+    print(f"E[trio score] {PENALTY * np.arange(SITE_BINS) @ trio_score_pmf():.2f}   E[best] ≥ {odds.best_lower():.1f}")
+    if sampled is not None:
+        perfect, best = sampled_headline(args.pool)
+        print(f"sampled estimates ({SAMPLED_POOLS} pools): P(100 % trio) {perfect}   E[best] {best}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Whole-game oracle: the best total score reachable for a generated game.
+
+A site's score depends only on its final trio, so the oracle searches trios
+over everything that *could* reach the Step 4 pool — microbes carried over
+in Step 0, the site's Step 2 pool, the ``step3_given`` fillers and one
+candidate per Step 3 round — and keeps only trios the flow can produce:
+
+  - kept microbes enter the pool first, so ``given[j]`` is only reached when
+    fewer than ``6 - j`` microbes were kept (an optimal play keeps exactly
+    the trio members, nothing else);
+  - at most one candidate per round;
+  - a carried microbe is available only if the previous site did not keep it
+    (saving every Step 2 microbe that is not kept is never worse).
+
+The only coupling between sites is which of the previous site's Step 2
+microbes its trio consumed. That bitmask is the memo key; trios are visited
+best-first and the search stops as soon as ``trio score + best score of the
+remaining sites`` cannot beat the best total found.
+
+Treatments of ``config.treatment_size`` microbes are enumerated exhaustively,
+so the cost grows as C(n, k) in the candidate universe; for single pools of
+larger variants use ``solver.best_treatment``.
+"""
+
+from dataclasses import dataclass
+from typing import List, Dict, Tuple
+
+import numpy as np
+
+from .game import DEFAULT_CONFIG, GameConfig, generate_game, to_site
+from .engine import GameEngine, KEEP, SAVE, REJECT
+from .solver import combo_index, trio_scores, pool_arrays, site_bounds
+
+
+# Item sources in a site's candidate universe
+CARRY, OWN, GIVEN, ROUND = 0, 1, 2, 3
+
+
+@dataclass
+class SitePlan:
+    step0_keep: List[int]      # indices into the previous site's Step 2 pool kept in Step 0
+    step2_actions: List[str]   # KEEP / SAVE / REJECT for each Step 2 microbe
+    round_picks: List[int]     # candidate picked in each Step 3 round
+    trio: List[str]            # names of the treatment microbes
+    score: int
+
+
+@dataclass
+class OracleResult:
+    par_score: int
+    site_scores: List[int]
+    plan: List[SitePlan]
+    n_optimal: List[int]       # trios per site reaching its planned score (how narrow the par line is)
+
+
+class _SiteTrios:
+    """Feasible trios of one site, best score first, with their carry/keep masks."""
+
+    def __init__(self, site, pool: Dict, carried: List[dict], config: GameConfig = DEFAULT_CONFIG):
+        c, size = config.round_candidates, config.treatment_size
+        items, src, aux = [], [], []
+        for k, m in enumerate(carried):
+            items.append(m); src.append(CARRY); aux.append(k)
+        for k, m in enumerate(pool["step2"]):
+            items.append(m); src.append(OWN); aux.append(k)
+        for k, m in enumerate(pool["step3_given"]):
+            items.append(m); src.append(GIVEN); aux.append(k)
+        for r, cands in enumerate(pool["step3_rounds"]):
+            for j, m in enumerate(cands):
+                items.append(m); src.append(ROUND); aux.append(r * c + j)
+        self.items, self.src, self.aux = items, src, aux
+
+        attrs, desired, undesired = pool_arrays(site, items)
+        lo3, hi3 = site_bounds(site, size)
+        scores = trio_scores(attrs, desired, undesired, lo3, hi3, config.penalty, size)
+        idx = combo_index(len(items), size)
+
+        src_a = np.array(src)[idx]
+        aux_a = np.array(aux)[idx]
+        bits = np.where((src_a == CARRY) | (src_a == OWN), 1 << aux_a, 0)
+        pmask = np.where(src_a == CARRY, bits, 0).sum(axis=1)
+        umask = np.where(src_a == OWN, bits, 0).sum(axis=1)
+
+        n_kept = (src_a <= OWN).sum(axis=1)
+        max_given = np.where(src_a == GIVEN, aux_a, -1).max(axis=1)
+        ok = max_given + n_kept < config.step3_given
+
+        # distinct Step 3 rounds; non-round members get distinct negative ids
+        rnd = np.sort(np.where(src_a == ROUND, aux_a // c, -1 - np.arange(size)), axis=1)
+        ok &= (np.diff(rnd, axis=1) != 0).all(axis=1)
+
+        order = np.argsort(-scores[ok], kind="stable")
+        self.scores = scores[ok][order].tolist()
+        self.pmask = pmask[ok][order].tolist()
+        self.umask = umask[ok][order].tolist()
+        self.trios = idx[ok][order].tolist()
+
+
+def solve_game(sites: List[dict], microbes: Dict, config: GameConfig = DEFAULT_CONFIG) -> OracleResult:
+    """Best total score over all sites and the plan that reaches it."""
+    num_sites = config.num_sites
+    site_trios = []
+    for si in range(num_sites):
+        carried = microbes[si - 1]["step2"] if si > 0 else []
+        site_trios.append(_SiteTrios(to_site(sites[si]), microbes[si], carried, config))
+
+    memo: Dict[Tuple[int, int], Tuple[int, int]] = {}
+
+    def best_from(si: int, consumed: int) -> int:
+        """Best total of sites si.. given the previous site's kept mask."""
+        if si == num_sites:
+            return 0
+        key = (si, consumed)
+        if key in memo:
+            return memo[key][0]
+        t = site_trios[si]
+        ceiling = best_from(si + 1, 0)   # nothing consumed is the best case
+        best, arg = -1, -1
+        for k, sc in enumerate(t.scores):
+            if sc + ceiling <= best:
+                break
+            if t.pmask[k] & consumed:
+                continue
+            total = sc + best_from(si + 1, t.umask[k])
+            if total > best:
+                best, arg = total, k
+        memo[key] = (best, arg)
+        return best
+
+    par = best_from(0, 0)
+
+    plan, site_scores, n_optimal, consumed = [], [], [], 0
+    for si in range(num_sites):
+        k = memo[(si, consumed)][1]
+        t = site_trios[si]
+        plan.append(_site_plan(t, k, last=(si == num_sites - 1), config=config))
+        site_scores.append(t.scores[k])
+        n_optimal.append(sum(1 for j, sc in enumerate(t.scores)
+                             if sc == t.scores[k] and not t.pmask[j] & consumed))
+        consumed = t.umask[k]
+    return OracleResult(par, site_scores, plan, n_optimal)
+
+
+def _site_plan(t: _SiteTrios, k: int, last: bool, config: GameConfig = DEFAULT_CONFIG) -> SitePlan:
+    members = t.trios[k]
+    c = config.round_candidates
+    step0_keep, kept, picks = [], set(), [0] * config.step3_rounds
+    for i in members:
+        if t.src[i] == CARRY:
+            step0_keep.append(t.aux[i])
+        elif t.src[i] == OWN:
+            kept.add(t.aux[i])
+        elif t.src[i] == ROUND:
+            picks[t.aux[i] // c] = t.aux[i] % c
+    actions = [KEEP if j in kept else (REJECT if last else SAVE)
+               for j in range(sum(1 for s in t.src if s == OWN))]
+    return SitePlan(sorted(step0_keep), actions, picks,
+                    [t.items[i]["name"] for i in members], t.scores[k])
+
+
+def par_score(seed: int) -> int:
+    """Best total score (out of 300) reachable for ``generate_game(seed)``."""
+    return solve_game(*generate_game(seed)).par_score
+
+
+def play_plan(eng: GameEngine, plan: List[SitePlan]) -> int:
+    """Drive ``eng`` through an oracle plan; returns the total score."""
+    for si, sp in enumerate(plan):
+        if eng.cur_step == "step0":
+            prev = eng.microbes[si - 1]["step2"]
+            keep = {prev[j]["name"] for j in sp.step0_keep}
+            while eng.cur_step == "step0":
+                eng.review_saved(eng.step0_current()["name"] in keep)
+        eng.confirm_profile(["plan", "plan"])
+        for action in sp.step2_actions:
+            eng.categorize(action)
+        eng.finish_step2()
+        for ci in sp.round_picks:
+            eng.pick_candidate(ci)
+        eng.finish_step3()
+        names = [m["name"] for m in eng.prospects()]
+        eng.select_trio([names.index(n) for n in sp.trio])
+        eng.submit()
+    return eng.total_score()
@@ -0,0 +1,157 @@
+"""
+HTML fragments for the Streamlit view (no Streamlit import).
+
+A card depends only on the microbe and the site's requirements, both immutable
+for a given game, so the builders are memoized on the primitive values they
+render. The caches are module-level and therefore shared by every session in
+the server process; ``render_cache_stats`` exposes their hit / miss counters.
+"""
+
+import random
+from functools import lru_cache
+from typing import Dict, List, Tuple
+
+from .game import FIXED_ATTRIBUTES, Microbe, SiteReqs
+from .engine import SelectionPreview
+
+
+CARD_CACHE_SIZE = 4096    # 3 sites × 28 slots × 3 borders ≈ 250 entries per game
+SITE_CACHE_SIZE = 512
+
+Ranges = Tuple[Tuple[str, int, int], ...]
+
+
+def fmt_time(s: int) -> str:
+    return f"{s // 60:02d}:{s % 60:02d}"
+
+
+def _ranges(site: SiteReqs) -> Ranges:
+    return tuple((a, *site.attr_ranges[a]) for a in site.attr_names)
+
+
+def score_class(score: float) -> str:
+    return "hi" if score >= 80 else ("md" if score >= 40 else "lo")
+
+
+@lru_cache(maxsize=64)
+def trait_html(t: str, desired: str, undesired: str) -> str:
+    if t == desired:
+        return f"<span class='t d'>✅ {t}</span>"
+    if t == undesired:
+        return f"<span class='t u'>🚫 {t}</span>"
+    return f"<span class='t'>⚪ {t}</span>"
+
+
+# ─── CARDS ────────────────────────────────────────────────────────────────────
+# Border tones, see assets/seawolf.css
+PLAIN, FOCUS, REVIEW, CANDIDATE, SELECTED, UNSELECTED = "", "f", "r", "c", "on", "off"
+
+
+def card(m: Microbe, site: SiteReqs, tone: str = PLAIN) -> str:
+    values = tuple((a, m.attributes[a]) for a in site.attr_names)
+    return _card(m.name, m.icon, values, m.trait, site.desired_trait, site.undesired_trait, tone)
+
+
+@lru_cache(maxsize=CARD_CACHE_SIZE)
+def _card(name: str, icon: str, values: Tuple[Tuple[str, int], ...], trait: str,
+          desired: str, undesired: str, tone: str) -> str:
+    attrs = "".join(f"<span>{a}: <b>{v}</b></span>" for a, v in values)
+    return (f"<div class='c {tone}'><div class='cn'>{icon} {name}</div>"
+            f"<div class='ca'>{attrs}</div><div>{trait_html(trait, desired, undesired)}</div></div>")
+
+
+def card_grid(cards: List[str], columns: int = 2) -> str:
+    """Cards laid out column by column in one element (first half left, as before)."""
+    rows = -(-len(cards) // columns)
+    return (f"<div class='g' style='grid-template-columns:repeat({columns},minmax(0,1fr));"
+            f"grid-template-rows:repeat({rows},auto);'>" + "".join(cards) + "</div>")
+
+
+def category_lists(groups: List[Tuple[str, str, List[dict]]]) -> str:
+    """Step 2 kept / saved / rejected lists side by side, as one element."""
+    cols = "".join(
+        f"<div class='cat-sec'><div class='cat-hd {cls}'>{label} ({len(items)})</div>"
+        + "".join(f"<div class='cat-it'>{m['icon']} {m['name']}</div>" for m in items)
+        + "</div>"
+        for label, cls, items in groups
+    )
+    return f"<div class='gc' style='grid-template-columns:repeat({len(groups)},minmax(0,1fr));'>{cols}</div>"
+
+
+def prospect_table(prospects: List[Microbe], site: SiteReqs) -> str:
+    """Compact one-row-per-microbe table; attribute values inside the site's range are highlighted."""
+    rows = tuple((m.icon, m.name, tuple(m.attributes[a] for a in site.attr_names), m.trait) for m in prospects)
+    return _prospect_table(rows, _ranges(site), site.desired_trait, site.undesired_trait)
+
+
+@lru_cache(maxsize=SITE_CACHE_SIZE)
+def _prospect_table(rows: Tuple[Tuple[str, str, Tuple[int, ...], str], ...], ranges: Ranges,
+                    desired: str, undesired: str) -> str:
+    head = "".join(f"<th>{a} <span class='mu'>{lo}–{hi}</span></th>" for a, lo, hi in ranges)
+    body = "".join(
+        f"<tr><td>{icon} {name}</td>"
+        + "".join(f"<td class='{'hi' if lo <= v <= hi else 'mu'}'>{v}</td>" for v, (_, lo, hi) in zip(values, ranges))
+        + f"<td>{trait_html(trait, desired, undesired)}</td></tr>"
+        for icon, name, values, trait in rows
+    )
+    return f"<table class='tbl'><tr><th>Microbe</th>{head}<th>Trait</th></tr>{body}</table>"
+
+
+# ─── SITES ────────────────────────────────────────────────────────────────────
+def site_box(site: SiteReqs) -> str:
+    return _site_box(site.site_num, _ranges(site), site.desired_trait, site.undesired_trait)
+
+
+@lru_cache(maxsize=SITE_CACHE_SIZE)
+def _site_box(site_num: int, ranges: Ranges, desired: str, undesired: str) -> str:
+    rows = "".join(f"<div class='sr'><div>📊 {a}</div><div>{lo} – {hi}</div></div>" for a, lo, hi in ranges)
+    return (f"<div class='s'><div class='sh'>📍 Site {site_num} — Requirements</div><div>{rows}</div>"
+            f"<div class='st'><span class='t d tb'>✅ Desired: {desired}</span>"
+            f"<span class='t u tb'>🚫 Undesired: {undesired}</span></div></div>")
+
+
+def next_site_preview(next_site: SiteReqs) -> str:
+    """Show a single attribute hint for the next site (like the real game)."""
+    return _next_site_preview(next_site.site_num, _ranges(next_site),
+                              next_site.desired_trait, next_site.undesired_trait)
+
+
+@lru_cache(maxsize=SITE_CACHE_SIZE)
+def _next_site_preview(site_num: int, ranges: Ranges, desired: str, undesired: str) -> str:
+    rng = random.Random(site_num)
+    a = rng.choice(FIXED_ATTRIBUTES)
+    lo, hi = {name: (lo, hi) for name, lo, hi in ranges}[a]
+    show_trait = desired if rng.random() < 0.5 else undesired
+    trait_label = "Desired" if show_trait == desired else "Undesired"
+    return (f"<div class='nx'><span class='k'>👁 Next site preview — </span>"
+            f"<span class='v'>{a}: {lo}–{hi}</span><span class='h'>{trait_label}: {show_trait}</span></div>")
+
+
+# ─── STEP 4 PREVIEW ───────────────────────────────────────────────────────────
+def preview_box(pv: SelectionPreview, site: SiteReqs) -> str:
+    """Provisional score and per-attribute averages for the current Step 4 selection."""
+    attrs = "".join(
+        f"<span>{'✅' if pv.in_range[a] else '❌'} {a}: <b>{pv.averages[a]:.1f}</b> "
+        f"<span class='mu'>({lo}–{hi})</span></span>"
+        for a in site.attr_names for lo, hi in [site.attr_ranges[a]]
+    )
+    return (f"<div class='pv'><span class='mu'>Provisional score ({pv.count} / 3):</span>"
+            f"<b class='sc {score_class(pv.score)}'>{pv.score}%</b><div class='pa'>{attrs}</div>"
+            f"<div class='pt'><span>{'✅' if pv.has_desired else '❌'} Desired «{site.desired_trait}»</span>"
+            f"<span>{'✅' if not pv.undesired else '❌'} Undesired «{site.undesired_trait}» × {pv.undesired}</span>"
+            f"</div></div>")
+
+
+# ─── STATS ────────────────────────────────────────────────────────────────────
+_CACHES = {"card": _card, "site_box": _site_box, "next_site_preview": _next_site_preview,
+           "prospect_table": _prospect_table, "trait": trait_html}
+
+
+def render_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hits, misses, current size and capacity of each render cache."""
+    return {name: fn.cache_info()._asdict() for name, fn in _CACHES.items()}
+
+
+def clear_render_caches():
+    for fn in _CACHES.values():
+        fn.cache_clear()
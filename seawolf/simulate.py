@@ -0,0 +1,251 @@
+"""
+Monte Carlo strategy simulator.
+
+Plays scripted strategies through the game rules (``generate_game``,
+``build_step3_initial_prospects``, ``score_treatment``) over ranges of seeds.
+Work is split into fixed seed ranges and sharded over a process pool; each
+shard generates a game once for all the strategies being compared and reduces
+the scores to histograms, so the result only depends on the seed range, never
+on the number of workers.
+
+    python -m seawolf.simulate greedy keep_desired random -n 1000000
+"""
+
+import argparse
+import random
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .game import (
+    DEFAULT_CONFIG, NUM_SITES, PENALTY, GameConfig, SiteReqs, _stream, generate_game, to_microbe, to_site,
+    score_treatment, build_step3_initial_prospects,
+)
+from .engine import KEEP, SAVE, REJECT, TRIO
+from .solver import best_treatment
+
+
+SITE_BINS = 100 // PENALTY + 1                # site scores 0, 20, …, 100
+TOTAL_BINS = NUM_SITES * (SITE_BINS - 1) + 1  # totals 0, 20, …, 300
+
+
+# ─── STRATEGIES ───────────────────────────────────────────────────────────────
+class Strategy:
+    """
+    Scripted player. Each hook sees the site's requirements and plain microbe
+    dicts; ``rng`` is a per-game stream, so runs are reproducible.
+    """
+    name = "base"
+
+    def decide_step0(self, site: SiteReqs, m: dict, rng: random.Random) -> bool:
+        """Keep a microbe saved for this site by the previous one?"""
+        return False
+
+    def categorize_step2(self, site: SiteReqs, m: dict, last: bool, rng: random.Random) -> str:
+        """KEEP, SAVE (not on the last site) or REJECT."""
+        return KEEP
+
+    def pick_step3(self, site: SiteReqs, candidates: List[dict], prospects: List[dict],
+                   rng: random.Random) -> int:
+        """Index of the candidate to add this round."""
+        return 0
+
+    def choose_trio_step4(self, site: SiteReqs, prospects: List[dict], rng: random.Random,
+                          size: int = TRIO) -> Tuple[int, ...]:
+        """``size`` prospect indices; the base player finds a best treatment (branch-and-bound)."""
+        return best_treatment(site, prospects, size)[1]
+
+
+def distance(site: SiteReqs, m: dict) -> int:
+    """How far a microbe's attributes fall outside the site's ranges, summed."""
+    return sum(max(0, lo - m["attributes"][a], m["attributes"][a] - hi)
+               for a in site.attr_names for lo, hi in [site.attr_ranges[a]])
+
+
+class KeepDesired(Strategy):
+    """Keep anything with the desired trait, save the rest unless undesired."""
+    name = "keep_desired"
+
+    def decide_step0(self, site, m, rng):
+        return m["trait"] == site.desired_trait
+
+    def categorize_step2(self, site, m, last, rng):
+        if m["trait"] == site.desired_trait:
+            return KEEP
+        return REJECT if last or m["trait"] == site.undesired_trait else SAVE
+
+    def pick_step3(self, site, candidates, prospects, rng):
+        traits = [c["trait"] for c in candidates]
+        if site.desired_trait in traits:
+            return traits.index(site.desired_trait)
+        return next((i for i, t in enumerate(traits) if t != site.undesired_trait), 0)
+
+
+class Greedy(Strategy):
+    """Rank microbes by attribute distance to the site's ranges, undesired traits last."""
+    name = "greedy"
+    max_distance = 2
+
+    def fit(self, site: SiteReqs, m: dict) -> Tuple[int, int, int]:
+        return (m["trait"] == site.undesired_trait, distance(site, m), m["trait"] != site.desired_trait)
+
+    def decide_step0(self, site, m, rng):
+        return self.fit(site, m)[:2] <= (False, self.max_distance)
+
+    def categorize_step2(self, site, m, last, rng):
+        if self.decide_step0(site, m, rng):
+            return KEEP
+        return REJECT if last else SAVE     # saving is free: the next site decides in Step 0
+
+    def pick_step3(self, site, candidates, prospects, rng):
+        return min(range(len(candidates)), key=lambda i: self.fit(site, candidates[i]))
+
+    def choose_trio_step4(self, site, prospects, rng, size=TRIO):
+        return tuple(sorted(range(len(prospects)), key=lambda i: self.fit(site, prospects[i]))[:size])
+
+
+class RandomPlayer(Strategy):
+    """Uniformly random legal moves."""
+    name = "random"
+
+    def decide_step0(self, site, m, rng):
+        return rng.random() < 0.5
+
+    def categorize_step2(self, site, m, last, rng):
+        return rng.choice((KEEP, REJECT) if last else (KEEP, SAVE, REJECT))
+
+    def pick_step3(self, site, candidates, prospects, rng):
+        return rng.randrange(len(candidates))
+
+    def choose_trio_step4(self, site, prospects, rng, size=TRIO):
+        return tuple(rng.sample(range(len(prospects)), size))
+
+
+STRATEGIES: Dict[str, Strategy] = {s.name: s for s in (KeepDesired(), Greedy(), RandomPlayer())}
+
+
+# ─── ONE GAME ─────────────────────────────────────────────────────────────────
+def play_game(strategy: Strategy, seed: int, game=None, config: GameConfig = DEFAULT_CONFIG) -> List[int]:
+    """Site scores of ``strategy`` on ``generate_game(seed, config)`` (or ``game``, if already generated)."""
+    sites, microbes = game if game is not None else generate_game(seed, config)
+    rng = _stream(seed, "sim", strategy.name)
+    scores, carried = [], []
+    for si in range(config.num_sites):
+        site, pool = to_site(sites[si]), microbes[si]
+        last = si == config.num_sites - 1
+
+        kept = [m for m in carried if strategy.decide_step0(site, m, rng)]
+        carried = []
+        for m in pool["step2"]:
+            action = strategy.categorize_step2(site, m, last, rng)
+            if action == KEEP:
+                kept.append(m)
+            elif action == SAVE:
+                if last:
+                    raise ValueError(f"{strategy.name}: cannot save microbes on the last site")
+                carried.append(m)
+            elif action != REJECT:
+                raise ValueError(f"{strategy.name}: unknown action {action!r}")
+
+        prospects = build_step3_initial_prospects(kept, pool["step3_given"], size=config.step3_given)
+        for cands in pool["step3_rounds"]:
+            pick = cands[strategy.pick_step3(site, cands, prospects, rng)]
+            if all(p["name"] != pick["name"] for p in prospects):
+                prospects.append(pick)
+
+        k = config.treatment_size
+        trio = strategy.choose_trio_step4(site, prospects, rng, k)
+        if len(set(trio)) != k:
+            raise ValueError(f"{strategy.name}: a treatment needs {k} distinct prospects")
+        score, _ = score_treatment(site, [to_microbe(prospects[i]) for i in trio], config)
+        scores.append(score)
+    return scores
+
+
+# ─── SHARDED RUNS ─────────────────────────────────────────────────────────────
+@dataclass
+class SimResult:
+    strategy: str
+    games: int
+    site_hist: np.ndarray    # (NUM_SITES, SITE_BINS) counts of each site score
+    total_hist: np.ndarray   # (TOTAL_BINS,) counts of each game total
+
+    @property
+    def scores(self) -> np.ndarray:
+        """Total score of each histogram bin."""
+        return np.arange(TOTAL_BINS) * PENALTY
+
+    def mean(self) -> float:
+        return float(self.scores @ self.total_hist / max(1, self.games))
+
+    def quantile(self, q: float) -> int:
+        """The ``q`` quantile of game totals."""
+        cdf = np.cumsum(self.total_hist)
+        return int(self.scores[np.searchsorted(cdf, q * self.games)])
+
+    def __add__(self, other: "SimResult") -> "SimResult":
+        return SimResult(self.strategy, self.games + other.games,
+                         self.site_hist + other.site_hist, self.total_hist + other.total_hist)
+
+
+def run_shard(names: Tuple[str, ...], start: int, stop: int) -> List[SimResult]:
+    """Seeds ``start:stop`` played by each strategy, reduced to histograms (worker entry point)."""
+    site_hist = np.zeros((len(names), NUM_SITES, SITE_BINS), dtype=np.int64)
+    total_hist = np.zeros((len(names), TOTAL_BINS), dtype=np.int64)
+    strategies = [STRATEGIES[name] for name in names]
+    for seed in range(start, stop):
+        game = generate_game(seed)
+        for k, strategy in enumerate(strategies):
+            scores = play_game(strategy, seed, game)
+            for si, sc in enumerate(scores):
+                site_hist[k, si, sc // PENALTY] += 1
+            total_hist[k, sum(scores) // PENALTY] += 1
+    return [SimResult(name, stop - start, site_hist[k], total_hist[k]) for k, name in enumerate(names)]
+
+
+def shards(start: int, n: int, size: int) -> List[Tuple[int, int]]:
+    return [(s, min(s + size, start + n)) for s in range(start, start + n, size)]
+
+
+def simulate(strategies: Iterable[str], n: int, start: int = 0, workers: Optional[int] = None,
+             shard_size: int = 10_000) -> Dict[str, SimResult]:
+    """
+    Play every strategy on seeds ``start:start+n``. ``workers=1`` runs inline;
+    otherwise shards go to a process pool (default: one worker per CPU).
+    """
+    names = tuple(strategies)
+    unknown = set(names) - set(STRATEGIES)
+    if unknown:
+        raise ValueError(f"unknown strategies: {', '.join(sorted(unknown))}")
+    ranges = shards(start, n, shard_size)
+    if workers == 1:
+        parts = [run_shard(names, a, b) for a, b in ranges]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(run_shard, [names] * len(ranges), *zip(*ranges)))
+    results: Dict[str, SimResult] = {}
+    for part in parts:
+        for r in part:
+            results[r.strategy] = results[r.strategy] + r if r.strategy in results else r
+    return results
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("strategies", nargs="*", metavar="STRATEGY",
+                    help=f"any of {', '.join(STRATEGIES)} (default: all)")
+    ap.add_argument("-n", "--games", type=int, default=100_000)
+    ap.add_argument("--start", type=int, default=0, help="first seed")
+    ap.add_argument("-j", "--workers", type=int, default=None)
+    ap.add_argument("--shard", type=int, default=10_000, help="games per task")
+    args = ap.parse_args(argv)
+
+    for name, r in simulate(args.strategies or STRATEGIES, args.games, args.start, args.workers, args.shard).items():
+        print(f"{name:>13}: mean {r.mean():6.1f}  p10 {r.quantile(.1):3d}  median {r.quantile(.5):3d}  "
+              f"p90 {r.quantile(.9):3d}  perfect {r.total_hist[-1] / r.games:6.2%}  ({r.games} games)")
+
+
+if __name__ == "__main__":
+    main()
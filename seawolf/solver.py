@@ -0,0 +1,190 @@
+"""
+Step 4 solvers.
+
+``solve_treatment`` scores every C(n, k) treatment of a prospect pool at once
+with NumPy. Integer attribute sums are checked against ``[k*lo, k*hi]``, which
+is the same test as ``lo <= avg <= hi`` in ``score_treatment`` without the
+division. That is the right tool for the shipped game (C(10, 3) = 120), but
+C(n, k) explodes for larger variants; ``best_treatment`` finds one best
+treatment by branch-and-bound instead.
+"""
+
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import combinations
+from typing import List, Tuple
+
+import numpy as np
+
+from .game import PENALTY, SiteReqs
+
+
+TRIO = 3
+
+
+@dataclass
+class TreatmentSolution:
+    best_score: int
+    optimal: List[Tuple[int, ...]]            # every trio reaching best_score
+    ranked: List[Tuple[int, Tuple[int, ...]]]  # (score, trio), best first
+
+
+@lru_cache(maxsize=64)
+def combo_index(n: int, k: int = TRIO) -> np.ndarray:
+    """(C(n,k), k) array of prospect indices, in ``itertools.combinations`` order."""
+    idx = np.fromiter((i for c in combinations(range(n), k) for i in c), dtype=np.intp)
+    idx = idx.reshape(-1, k)
+    idx.setflags(write=False)
+    return idx
+
+
+def trio_index(n: int) -> np.ndarray:
+    return combo_index(n, TRIO)
+
+
+def pool_arrays(site: SiteReqs, pool: List[dict]):
+    """Pool dicts → (attrs (n,3) int, desired (n,) bool, undesired (n,) bool)."""
+    attrs = np.array([[m["attributes"][a] for a in site.attr_names] for m in pool], dtype=np.int16)
+    attrs = attrs.reshape(len(pool), len(site.attr_names))
+    traits = [m["trait"] for m in pool]
+    desired = np.array([t == site.desired_trait for t in traits], dtype=bool)
+    undesired = np.array([t == site.undesired_trait for t in traits], dtype=bool)
+    return attrs, desired, undesired
+
+
+def site_bounds(site: SiteReqs, size: int = TRIO) -> Tuple[np.ndarray, np.ndarray]:
+    """Treatment attribute-sum bounds ``(size*lo, size*hi)`` per attribute."""
+    lo = np.array([site.attr_ranges[a][0] for a in site.attr_names], dtype=np.int16)
+    hi = np.array([site.attr_ranges[a][1] for a in site.attr_names], dtype=np.int16)
+    return size * lo, size * hi
+
+
+def trio_scores(attrs: np.ndarray, desired: np.ndarray, undesired: np.ndarray,
+                lo3: np.ndarray, hi3: np.ndarray, penalty: int = PENALTY, size: int = TRIO) -> np.ndarray:
+    """
+    Score every treatment of ``size`` microbes of one or many pools.
+
+    attrs: (..., n, A) ints; desired / undesired: (..., n) bools;
+    lo3 / hi3: (..., A) sum bounds for ``size`` members. Returns (..., C(n,size)) int scores.
+    """
+    idx = combo_index(attrs.shape[-2], size)
+    sums = attrs[..., idx, :].sum(axis=-2, dtype=np.int16)          # (..., C, A)
+    lo3 = np.expand_dims(lo3, -2)
+    hi3 = np.expand_dims(hi3, -2)
+    penalties = ((sums < lo3) | (sums > hi3)).sum(axis=-1)
+    penalties += ~desired[..., idx].any(axis=-1)
+    penalties += undesired[..., idx].sum(axis=-1)
+    return np.maximum(0, 100 - penalty * penalties)
+
+
+def solve_treatment(site: SiteReqs, pool: List[dict], top: int = 0,
+                    size: int = TRIO, penalty: int = PENALTY) -> TreatmentSolution:
+    """
+    Best Step 4 treatment for ``pool``, exhaustively.
+
+    Returns the best score, every optimal treatment (as sorted prospect
+    indices) and the treatments ranked by score — all of them, or the best ``top``.
+    """
+    if len(pool) < size:
+        return TreatmentSolution(0, [], [])
+    attrs, desired, undesired = pool_arrays(site, pool)
+    lo3, hi3 = site_bounds(site, size)
+    scores = trio_scores(attrs, desired, undesired, lo3, hi3, penalty, size)
+    idx = combo_index(len(pool), size)
+
+    best = int(scores.max())
+    optimal = [tuple(int(i) for i in t) for t in idx[scores == best]]
+
+    order = np.argsort(-scores, kind="stable")
+    if top:
+        order = order[:top]
+    ranked = [(int(scores[k]), tuple(int(i) for i in idx[k])) for k in order]
+    return TreatmentSolution(best, optimal, ranked)
+
+
+def best_scores(attrs: np.ndarray, desired: np.ndarray, undesired: np.ndarray,
+                lo3: np.ndarray, hi3: np.ndarray, chunk: int = 1 << 16) -> np.ndarray:
+    """Best treatment score of each pool in a batch: (P, n, A) → (P,), ``chunk`` pools at a time."""
+    out = np.empty(attrs.shape[0], dtype=np.int64)
+    for s in range(0, attrs.shape[0], chunk):
+        e = s + chunk
+        out[s:e] = trio_scores(attrs[s:e], desired[s:e], undesired[s:e], lo3[s:e], hi3[s:e]).max(axis=-1)
+    return out
+
+
+# ─── BRANCH AND BOUND ─────────────────────────────────────────────────────────
+def best_treatment(site: SiteReqs, pool: List[dict], size: int = TRIO,
+                   penalty: int = PENALTY) -> Tuple[int, Tuple[int, ...]]:
+    """
+    One best treatment of ``size`` microbes from ``pool``: (score, sorted indices).
+
+    Depth-first over prospects ordered most promising first (no undesired
+    trait, close to the ranges, desired trait), so a good incumbent comes
+    early. A branch is cut when a lower bound on its penalties reaches the
+    incumbent's:
+
+      - undesired members so far, plus those forced when fewer clean
+        prospects remain than picks;
+      - no desired trait, if none is picked and none remains;
+      - each attribute whose sum cannot reach ``[size*lo, size*hi]`` even with
+        the smallest / largest values left (per-suffix sorted sums).
+
+    The search stops at the first penalty-free treatment.
+    """
+    n = len(pool)
+    if n < size:
+        return 0, ()
+    attrs, desired, undesired = pool_arrays(site, pool)
+    lo, hi = (b.tolist() for b in site_bounds(site, size))
+    ranges = [site.attr_ranges[a] for a in site.attr_names]
+    n_attr = len(lo)
+
+    def distance(i: int) -> int:
+        return sum(max(0, r_lo - v, v - r_hi) for v, (r_lo, r_hi) in zip(attrs[i].tolist(), ranges))
+
+    order = sorted(range(n), key=lambda i: (bool(undesired[i]), distance(i), not desired[i]))
+    vals = [attrs[i].tolist() for i in order]
+    good = [bool(desired[i]) for i in order]
+    bad = [int(undesired[i]) for i in order]
+
+    # smin[i][r][a] / smax[i][r][a]: smallest / largest sum of r values of attribute a among items i..n-1
+    inf = 10 ** 9
+    smin = [[[0] * n_attr] + [[inf] * n_attr for _ in range(size)] for _ in range(n + 1)]
+    smax = [[[0] * n_attr] + [[-inf] * n_attr for _ in range(size)] for _ in range(n + 1)]
+    clean_left = [0] * (n + 1)
+    desired_left = [False] * (n + 1)
+    for i in range(n - 1, -1, -1):
+        v, nxt_min, nxt_max = vals[i], smin[i + 1], smax[i + 1]
+        for r in range(1, size + 1):
+            smin[i][r] = [min(nxt_min[r][a], v[a] + nxt_min[r - 1][a]) for a in range(n_attr)]
+            smax[i][r] = [max(nxt_max[r][a], v[a] + nxt_max[r - 1][a]) for a in range(n_attr)]
+        clean_left[i] = clean_left[i + 1] + (not bad[i])
+        desired_left[i] = desired_left[i + 1] or good[i]
+
+    best_pen, best_pick = n_attr + 1 + size + 1, ()
+    picked: List[int] = []
+
+    def search(i: int, r: int, sums: List[int], has_desired: bool, n_bad: int):
+        nonlocal best_pen, best_pick
+        if r == 0:
+            pen = n_bad + (not has_desired) + sum(1 for a in range(n_attr) if not lo[a] <= sums[a] <= hi[a])
+            if pen < best_pen:
+                best_pen, best_pick = pen, tuple(picked)
+            return
+        if n - i < r:
+            return
+        bound = n_bad + max(0, r - clean_left[i]) + (not (has_desired or desired_left[i]))
+        lows, highs = smin[i][r], smax[i][r]
+        for a in range(n_attr):
+            if sums[a] + lows[a] > hi[a] or sums[a] + highs[a] < lo[a]:
+                bound += 1
+        if bound >= best_pen:
+            return
+        picked.append(i)
+        search(i + 1, r - 1, [s + x for s, x in zip(sums, vals[i])], has_desired or good[i], n_bad + bad[i])
+        picked.pop()
+        if best_pen:
+            search(i + 1, r, sums, has_desired, n_bad)
+
+    search(0, size, [0] * n_attr, False, 0)
+    return max(0, 100 - penalty * best_pen), tuple(sorted(order[i] for i in best_pick))
@@ -0,0 +1,200 @@
+"""
+Parameter sweeps over the game-balance constants (``GameConfig``).
+
+Every grid point plays its seeds twice: the greedy strategy from
+``seawolf.simulate`` and the oracle par score from ``seawolf.oracle``. The
+result is the distribution of both totals and of the gap between them. Seed
+ranges are cut into fixed shards run on a process pool. Each shard is cached
+on disk as ``<config key>-<start>-<stop>.npz``, so re-running a sweep only
+computes new grid points and new seeds.
+
+    python -m seawolf.sweep --set penalty=15,20,25 --set p_desired=0.2,0.3 -n 2000
+    python -m seawolf.sweep --set possible_ranges="1-3 4-6 8-10;2-5 6-9" -n 500
+"""
+
+import argparse
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, fields, replace
+from itertools import product
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from .game import DEFAULT_CONFIG, GameConfig, generate_game
+from .oracle import solve_game
+from .simulate import STRATEGIES, play_game
+
+
+CACHE_DIR = Path(__file__).resolve().parent.parent / ".sweep_cache"
+CACHE_VERSION = 1     # bump when the rules, the oracle or the greedy strategy change
+SHARD_SIZE = 250
+
+
+# ─── RESULTS ──────────────────────────────────────────────────────────────────
+@dataclass
+class SweepPoint:
+    config: GameConfig
+    games: int
+    greedy: np.ndarray   # counts of greedy totals, indexed by total score
+    oracle: np.ndarray   # counts of par totals
+    gap: np.ndarray      # counts of par − greedy
+
+    @classmethod
+    def empty(cls, config: GameConfig) -> "SweepPoint":
+        size = 100 * config.num_sites + 1
+        return cls(config, 0, *(np.zeros(size, dtype=np.int64) for _ in range(3)))
+
+    def __add__(self, other: "SweepPoint") -> "SweepPoint":
+        return SweepPoint(self.config, self.games + other.games, self.greedy + other.greedy,
+                          self.oracle + other.oracle, self.gap + other.gap)
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "greedy": _mean(self.greedy), "greedy_p10": _quantile(self.greedy, .1),
+            "greedy_p50": _quantile(self.greedy, .5), "greedy_p90": _quantile(self.greedy, .9),
+            "par": _mean(self.oracle), "gap": _mean(self.gap),
+            "gap_zero": float(self.gap[0] / max(1, self.games)),
+        }
+
+
+def _mean(hist: np.ndarray) -> float:
+    return float(np.arange(len(hist)) @ hist / max(1, hist.sum()))
+
+
+def _quantile(hist: np.ndarray, q: float) -> int:
+    return int(np.searchsorted(np.cumsum(hist), q * hist.sum()))
+
+
+# ─── SHARDS ───────────────────────────────────────────────────────────────────
+def shard_path(cache_dir: Path, config: GameConfig, start: int, stop: int) -> Path:
+    return Path(cache_dir) / f"v{CACHE_VERSION}-{config.key()}-{start}-{stop}.npz"
+
+
+def _load(path: Path, config: GameConfig) -> Optional[SweepPoint]:
+    try:
+        with np.load(path) as f:
+            if json.loads(str(f["config"])) != json.loads(json.dumps(asdict(config))):
+                return None
+            return SweepPoint(config, int(f["games"]), f["greedy"], f["oracle"], f["gap"])
+    except (FileNotFoundError, OSError, KeyError, ValueError):
+        return None
+
+
+def _save(path: Path, point: SweepPoint):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(f".{os.getpid()}.tmp.npz")
+    np.savez(tmp, config=json.dumps(asdict(point.config)), games=point.games,
+             greedy=point.greedy, oracle=point.oracle, gap=point.gap)
+    os.replace(tmp, path)
+
+
+def run_shard(config: GameConfig, start: int, stop: int, cache_dir: Path = CACHE_DIR) -> SweepPoint:
+    """Seeds ``start:stop`` under ``config`` (worker entry point); writes the shard to the cache."""
+    greedy = STRATEGIES["greedy"]
+    point = SweepPoint.empty(config)
+    point.games = stop - start
+    for seed in range(start, stop):
+        game = generate_game(seed, config)
+        g = sum(play_game(greedy, seed, game, config))
+        par = solve_game(*game, config).par_score
+        if par < g:
+            raise RuntimeError(f"oracle below greedy for seed {seed} under {config}")
+        point.greedy[g] += 1
+        point.oracle[par] += 1
+        point.gap[par - g] += 1
+    _save(shard_path(cache_dir, config, start, stop), point)
+    return point
+
+
+def shards(start: int, stop: int, size: int = SHARD_SIZE) -> List[Tuple[int, int]]:
+    """``start:stop`` cut at multiples of ``size``, so longer runs reuse earlier shards."""
+    edges = sorted({start, stop, *range((start // size + 1) * size, stop, size)})
+    return list(zip(edges, edges[1:]))
+
+
+def sweep(configs: Iterable[GameConfig], n: int, start: int = 0, workers: Optional[int] = None,
+          shard_size: int = SHARD_SIZE, cache_dir: Path = CACHE_DIR) -> List[SweepPoint]:
+    """
+    Evaluate every config on seeds ``start:start+n``. Cached shards are read
+    back; the rest run inline (``workers=1``) or on a process pool.
+    """
+    configs = list(configs)
+    results = [SweepPoint.empty(c) for c in configs]
+    todo = []
+    for i, config in enumerate(configs):
+        for a, b in shards(start, start + n, shard_size):
+            cached = _load(shard_path(cache_dir, config, a, b), config)
+            if cached is not None:
+                results[i] += cached
+            else:
+                todo.append((i, a, b))
+
+    args = [(configs[i], a, b, cache_dir) for i, a, b in todo]
+    if workers == 1:
+        parts = [run_shard(*job) for job in args]
+    elif args:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parts = list(pool.map(run_shard, *zip(*args)))
+    else:
+        parts = []
+    for (i, _, _), part in zip(todo, parts):
+        results[i] += part
+    return results
+
+
+# ─── GRID ─────────────────────────────────────────────────────────────────────
+def grid(base: GameConfig = DEFAULT_CONFIG, **axes: Iterable) -> List[GameConfig]:
+    """Every combination of the given field values, other fields from ``base``."""
+    names = list(axes)
+    return [replace(base, **dict(zip(names, values))) for values in product(*axes.values())]
+
+
+def _parse_axis(spec: str) -> Tuple[str, list]:
+    """``field=v1,v2,…``; ranges as ``possible_ranges=1-3 2-4;3-5 5-7`` (alternatives split by ``;``)."""
+    name, _, values = spec.partition("=")
+    types = {f.name: f.type for f in fields(GameConfig)}
+    if name not in types:
+        raise ValueError(f"unknown field {name!r} (fields: {', '.join(types)})")
+    if name == "possible_ranges":
+        return name, [tuple(tuple(int(x) for x in r.split("-")) for r in alt.split())
+                      for alt in values.split(";")]
+    return name, [types[name](v) for v in values.split(",")]
+
+
+def _label(value) -> str:
+    if isinstance(value, tuple):
+        return " ".join(f"{lo}-{hi}" for lo, hi in value)
+    return str(value)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("--set", action="append", default=[], metavar="FIELD=V1,V2", dest="axes",
+                    help=f"grid axis; fields: {', '.join(f.name for f in fields(GameConfig))}")
+    ap.add_argument("-n", "--games", type=int, default=1000)
+    ap.add_argument("--start", type=int, default=0, help="first seed")
+    ap.add_argument("-j", "--workers", type=int, default=None)
+    ap.add_argument("--shard", type=int, default=SHARD_SIZE, help="games per task (cache granularity)")
+    ap.add_argument("--cache", type=Path, default=CACHE_DIR)
+    args = ap.parse_args(argv)
+
+    axes = dict(_parse_axis(a) for a in args.axes)
+    configs = grid(**axes)
+    points = sweep(configs, args.games, args.start, args.workers, args.shard, args.cache)
+
+    cols = list(axes) or ["config"]
+    print("  ".join(f"{c:>14}" for c in cols)
+          + "  greedy   p10  p50  p90     par    gap  gap=0")
+    for p in points:
+        s = p.summary()
+        label = [_label(getattr(p.config, c)) if c != "config" else "default" for c in cols]
+        print("  ".join(f"{v:>14}" for v in label)
+              + f"  {s['greedy']:6.1f}  {s['greedy_p10']:4d} {s['greedy_p50']:4d} {s['greedy_p90']:4d}"
+              f"  {s['par']:6.1f} {s['gap']:6.1f}  {s['gap_zero']:5.1%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,368 @@
+"""
+Vectorized environment: K games stepped in lockstep over a ``GameBatch``.
+
+Apart from Step 0 (how many microbes were saved), every game goes through the
+same sequence of decisions, so one ``step`` takes an action array for the
+whole batch and advances every game at once. State lives in NumPy arrays;
+Python overhead is paid per decision, not per game.
+
+Decisions per site (Step 1 does not affect scoring and is skipped):
+
+  step0  previous site's Step 2 slot j, for games that saved it   bool keep
+  step2  Step 2 slot j = 0…9                                       KEEP_CODE / SAVE_CODE / REJECT_CODE
+  step3  round r = 0…3, pick one of three candidates               0–2
+  step4  the treatment, as a bitmask of prospect positions         3 bits set
+
+The rules match ``GameEngine``: kept microbes (carried ones first) seed the
+prospect pool up to 6, the given microbes fill it, round picks are appended.
+
+    python -m seawolf.vecenv greedy keep_desired -n 1000000
+"""
+
+import argparse
+import importlib
+from dataclasses import dataclass
+from typing import Dict, Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+from .game import NUM_SITES, PENALTY, STEP2_SLOT, GIVEN_SLOT, ROUND_SLOT
+from .engine import InvalidTransition, STEP2_POOL, STEP3_GIVEN, STEP3_ROUNDS, ROUND_CANDIDATES, TRIO
+from .batch import GameBatch, DESIRED, UNDESIRED, iter_batches
+from .solver import trio_index, trio_scores
+from .simulate import SimResult, SITE_BINS, TOTAL_BINS
+
+
+KEEP_CODE, SAVE_CODE, REJECT_CODE = 0, 1, 2
+INITIAL_PROSPECTS = 6
+MAX_PROSPECTS = INITIAL_PROSPECTS + STEP3_ROUNDS
+
+
+@dataclass
+class Observation:
+    """
+    One decision for the whole batch. ``attrs`` / ``desired`` / ``undesired``
+    describe M microbes per game: the one under review (step0, step2), the
+    round's candidates (step3) or the prospect pool (step4, ``valid`` marks
+    filled positions). Traits are relative to the current site.
+    """
+    step: str
+    site: int
+    index: int                 # Step 2 slot / round number
+    last: bool                 # last site: saving is not allowed
+    active: np.ndarray         # (K,) games this decision applies to
+    attrs: np.ndarray          # (K, M, A) int16
+    desired: np.ndarray        # (K, M) bool
+    undesired: np.ndarray      # (K, M) bool
+    valid: np.ndarray          # (K, M) bool
+    lo: np.ndarray             # (K, A) site range bounds
+    hi: np.ndarray
+
+    def distance(self) -> np.ndarray:
+        """(K, M) summed distance of each microbe's attributes to the site's ranges."""
+        lo, hi = self.lo[:, None], self.hi[:, None]
+        return np.maximum(0, np.maximum(lo - self.attrs, self.attrs - hi)).sum(axis=-1)
+
+
+# ─── ENVIRONMENT ──────────────────────────────────────────────────────────────
+class VecEnv:
+    """
+    Gym-like lockstep environment over a ``GameBatch``::
+
+        obs = env.reset(batch)
+        while not done:
+            obs, reward, done = env.step(policy(obs))
+
+    ``reward`` is each game's site score after a step4 action, else 0. An
+    invalid action raises ``InvalidTransition`` and ends the episode.
+    """
+
+    def __init__(self, games: Optional[GameBatch] = None):
+        self.games = games
+        self.obs: Optional[Observation] = None
+        self.done = True
+        if games is not None:
+            self.reset()
+
+    def reset(self, games: Optional[GameBatch] = None) -> Observation:
+        if games is not None:
+            self.games = games
+        g = self.games
+        k, sites = len(g), g.attrs.shape[1]
+        self._rows = np.arange(k)
+        self._one = np.ones((k, 1), dtype=bool)
+        lo, hi = g.bounds()
+        self.lo, self.hi = lo.astype(np.int16), hi.astype(np.int16)
+        self.attrs = g.attrs.astype(np.int16)
+        self.traits = np.take_along_axis(g.site_traits, g.traits, axis=2)   # (K, S, 28) index into ALL_TRAITS
+        self.scores = np.zeros((k, sites), dtype=np.int64)
+
+        self.p_attrs = np.zeros((k, MAX_PROSPECTS, self.attrs.shape[-1]), dtype=np.int16)
+        self.p_traits = np.zeros((k, MAX_PROSPECTS), dtype=self.traits.dtype)
+        self.p_count = np.zeros(k, dtype=np.intp)
+        self.saved = np.zeros(k, dtype=np.uint16)    # Step 2 slots saved at the current site
+
+        self._reward = self._no_reward = np.zeros(k, dtype=np.int64)
+        self.done = False
+        self._flow = self._play()
+        self.obs = next(self._flow)
+        return self.obs
+
+    def step(self, action) -> Tuple[Optional[Observation], np.ndarray, bool]:
+        if self.done:
+            raise InvalidTransition("episode is over, call reset()")
+        try:
+            self.obs = self._flow.send(np.asarray(action))
+        except StopIteration:
+            self.obs, self.done = None, True
+        except InvalidTransition:
+            self.obs, self.done = None, True
+            raise
+        reward, self._reward = self._reward, self._no_reward
+        return self.obs, reward, self.done
+
+    # ─── FLOW ─────────────────────────────────────────────────────────────────
+    def _play(self) -> Iterator[Observation]:
+        sites = self.scores.shape[1]
+        everyone = np.ones(len(self._rows), dtype=bool)
+        for si in range(sites):
+            last = si == sites - 1
+            carried, self.saved = self.saved, np.zeros_like(self.saved)
+            self.p_count[:] = 0
+
+            if si:
+                for j in range(STEP2_POOL):
+                    active = (carried >> j & 1).astype(bool)
+                    if active.any():
+                        keep = yield self._view("step0", si, j, si - 1, STEP2_SLOT + j, 1, last, active)
+                        self._append(active & keep.astype(bool), si - 1, STEP2_SLOT + j, INITIAL_PROSPECTS)
+
+            for j in range(STEP2_POOL):
+                code = yield self._view("step2", si, j, si, STEP2_SLOT + j, 1, last, everyone)
+                if ((code < KEEP_CODE) | (code > REJECT_CODE)).any():
+                    raise InvalidTransition("Step 2 actions are KEEP_CODE, SAVE_CODE or REJECT_CODE")
+                if last and (code == SAVE_CODE).any():
+                    raise InvalidTransition("cannot save microbes on the last site")
+                self._append(code == KEEP_CODE, si, STEP2_SLOT + j, INITIAL_PROSPECTS)
+                self.saved |= (code == SAVE_CODE).astype(np.uint16) << j
+
+            for j in range(STEP3_GIVEN):
+                self._append(everyone, si, GIVEN_SLOT + j, INITIAL_PROSPECTS)
+
+            for r in range(STEP3_ROUNDS):
+                first = ROUND_SLOT + ROUND_CANDIDATES * r
+                ci = yield self._view("step3", si, r, si, first, ROUND_CANDIDATES, last, everyone)
+                if ((ci < 0) | (ci >= ROUND_CANDIDATES)).any():
+                    raise InvalidTransition(f"Step 3 picks are 0–{ROUND_CANDIDATES - 1}")
+                self._append(everyone, si, first + ci, MAX_PROSPECTS)
+
+            mask = yield self._prospects(si, last)
+            self.scores[:, si] = self._reward = self._score(si, mask)
+
+    def _append(self, rows: np.ndarray, src: int, slot, limit: int):
+        """Append microbe ``slot`` (scalar or per game) of site ``src`` to the prospects of ``rows``."""
+        k = np.flatnonzero(rows & (self.p_count < limit))
+        slot = slot[k] if np.ndim(slot) else slot
+        pos = self.p_count[k]
+        self.p_attrs[k, pos] = self.attrs[k, src, slot]
+        self.p_traits[k, pos] = self.traits[k, src, slot]
+        self.p_count[k] += 1
+
+    def _traits(self, si: int, traits: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        st = self.games.site_traits[:, si, None]
+        return traits == st[..., DESIRED], traits == st[..., UNDESIRED]
+
+    def _view(self, step: str, si: int, index: int, src: int, first: int, count: int,
+              last: bool, active: np.ndarray) -> Observation:
+        """Microbes ``first:first+count`` of site ``src`` (contiguous slots: views, no gather)."""
+        slots = slice(first, first + count)
+        desired, undesired = self._traits(si, self.traits[:, src, slots])
+        valid = self._one if count == 1 else np.ones((len(self._rows), count), dtype=bool)
+        return Observation(step, si, index, last, active, self.attrs[:, src, slots], desired, undesired,
+                           valid, self.lo[:, si], self.hi[:, si])
+
+    def _prospects(self, si: int, last: bool) -> Observation:
+        valid = np.arange(MAX_PROSPECTS) < self.p_count[:, None]
+        desired, undesired = self._traits(si, self.p_traits)
+        return Observation("step4", si, 0, last, np.ones(len(self._rows), dtype=bool), self.p_attrs,
+                           desired & valid, undesired & valid, valid, self.lo[:, si], self.hi[:, si])
+
+    def _score(self, si: int, mask: np.ndarray) -> np.ndarray:
+        """Site scores of the treatments in ``mask``; same rules as ``score_treatment``."""
+        picked = (mask[:, None] >> np.arange(MAX_PROSPECTS) & 1).astype(bool)
+        valid = np.arange(MAX_PROSPECTS) < self.p_count[:, None]
+        if (mask >> MAX_PROSPECTS).any() or (picked & ~valid).any() or (picked.sum(axis=1) != TRIO).any():
+            raise InvalidTransition(f"a treatment needs {TRIO} distinct prospects")
+        sums = (self.p_attrs * picked[..., None]).sum(axis=1)
+        desired, undesired = self._traits(si, self.p_traits)
+        penalties = ((sums < TRIO * self.lo[:, si]) | (sums > TRIO * self.hi[:, si])).sum(axis=1)
+        penalties += ~(desired & picked).any(axis=1)
+        penalties += (undesired & picked).sum(axis=1)
+        return np.maximum(0, 100 - PENALTY * penalties)
+
+
+# ─── STRATEGIES ───────────────────────────────────────────────────────────────
+class BatchStrategy:
+    """
+    Policy over a whole batch; the vectorized counterpart of
+    ``seawolf.simulate.Strategy``. Each hook gets an ``Observation`` and the
+    policy's generator, and returns one action per game.
+    """
+    name = "base"
+
+    def act(self, obs: Observation, rng: np.random.Generator) -> np.ndarray:
+        return getattr(self, _HOOKS[obs.step])(obs, rng)
+
+    def decide_step0(self, obs: Observation, rng: np.random.Generator) -> np.ndarray:
+        """(K,) bool: keep the saved microbe?"""
+        return np.zeros(len(obs.active), dtype=bool)
+
+    def categorize_step2(self, obs: Observation, rng: np.random.Generator) -> np.ndarray:
+        """(K,) KEEP_CODE, SAVE_CODE or REJECT_CODE."""
+        return np.full(len(obs.active), KEEP_CODE)
+
+    def pick_step3(self, obs: Observation, rng: np.random.Generator) -> np.ndarray:
+        """(K,) candidate index."""
+        return np.zeros(len(obs.active), dtype=np.intp)
+
+    def choose_trio_step4(self, obs: Observation, rng: np.random.Generator) -> np.ndarray:
+        """(K,) bitmask of three prospect positions; the base policy takes the best trio."""
+        return best_trio(obs)
+
+
+_HOOKS = {"step0": "decide_step0", "step2": "categorize_step2",
+          "step3": "pick_step3", "step4": "choose_trio_step4"}
+
+
+def positions_mask(positions: np.ndarray) -> np.ndarray:
+    """(K, 3) prospect positions → (K,) bitmask."""
+    return np.bitwise_or.reduce(1 << positions.astype(np.int64), axis=-1)
+
+
+def best_trio(obs: Observation) -> np.ndarray:
+    """First best trio of each pool, in ``itertools.combinations`` order (as ``solve_treatment``)."""
+    idx = trio_index(obs.attrs.shape[1])
+    scores = trio_scores(obs.attrs, obs.desired, obs.undesired, TRIO * obs.lo, TRIO * obs.hi)
+    scores = np.where(obs.valid[:, idx].all(axis=-1), scores, -1)
+    return positions_mask(idx[scores.argmax(axis=1)])
+
+
+class KeepDesired(BatchStrategy):
+    """Keep anything with the desired trait, save the rest unless undesired."""
+    name = "keep_desired"
+
+    def decide_step0(self, obs, rng):
+        return obs.desired[:, 0]
+
+    def categorize_step2(self, obs, rng):
+        drop = REJECT_CODE if obs.last else np.where(obs.undesired[:, 0], REJECT_CODE, SAVE_CODE)
+        return np.where(obs.desired[:, 0], KEEP_CODE, drop)
+
+    def pick_step3(self, obs, rng):
+        return (~obs.desired + obs.undesired.astype(np.int8)).argmin(axis=1)
+
+
+class Greedy(BatchStrategy):
+    """Rank microbes by attribute distance to the site's ranges, undesired traits last."""
+    name = "greedy"
+    max_distance = 2
+
+    @staticmethod
+    def fit(obs: Observation) -> np.ndarray:
+        """(K, M) sort key: (undesired, distance, not desired), lexicographic."""
+        return 1000 * obs.undesired + 2 * obs.distance() + ~obs.desired
+
+    def decide_step0(self, obs, rng):
+        return ~obs.undesired[:, 0] & (obs.distance()[:, 0] <= self.max_distance)
+
+    def categorize_step2(self, obs, rng):
+        return np.where(self.decide_step0(obs, rng), KEEP_CODE, REJECT_CODE if obs.last else SAVE_CODE)
+
+    def pick_step3(self, obs, rng):
+        return self.fit(obs).argmin(axis=1)
+
+    def choose_trio_step4(self, obs, rng):
+        key = np.where(obs.valid, self.fit(obs), np.iinfo(np.int64).max)
+        return positions_mask(np.argsort(key, axis=1, kind="stable")[:, :TRIO])
+
+
+class RandomPlayer(BatchStrategy):
+    """Uniformly random legal moves."""
+    name = "random"
+
+    def decide_step0(self, obs, rng):
+        return rng.random(len(obs.active)) < 0.5
+
+    def categorize_step2(self, obs, rng):
+        return rng.choice((KEEP_CODE, REJECT_CODE) if obs.last else (KEEP_CODE, SAVE_CODE, REJECT_CODE),
+                          len(obs.active))
+
+    def pick_step3(self, obs, rng):
+        return rng.integers(0, ROUND_CANDIDATES, len(obs.active))
+
+    def choose_trio_step4(self, obs, rng):
+        key = np.where(obs.valid, rng.random(obs.valid.shape), 2.0)
+        return positions_mask(np.argsort(key, axis=1)[:, :TRIO])
+
+
+BATCH_STRATEGIES: Dict[str, BatchStrategy] = {
+    s.name: s for s in (BatchStrategy(), KeepDesired(), Greedy(), RandomPlayer())
+}
+
+
+def load_strategy(spec: Union[str, BatchStrategy]) -> BatchStrategy:
+    """A registered name, ``"package.module:Class"`` (instantiated) or a strategy instance."""
+    if isinstance(spec, BatchStrategy):
+        return spec
+    if spec in BATCH_STRATEGIES:
+        return BATCH_STRATEGIES[spec]
+    module, _, attr = spec.partition(":")
+    if not attr:
+        raise ValueError(f"unknown strategy {spec!r} (registered: {', '.join(BATCH_STRATEGIES)})")
+    obj = getattr(importlib.import_module(module), attr)
+    return obj() if isinstance(obj, type) else obj
+
+
+# ─── RUNS ─────────────────────────────────────────────────────────────────────
+def play_batch(strategy: BatchStrategy, games: GameBatch,
+               rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    """(K, S) site scores of ``strategy`` on every game of ``games``."""
+    rng = rng if rng is not None else np.random.default_rng()
+    env = VecEnv(games)
+    obs, done = env.obs, False
+    while not done:
+        obs, _, done = env.step(strategy.act(obs, rng))
+    return env.scores
+
+
+def evaluate(strategy: Union[str, BatchStrategy], n: int, seed=None, batch_size: int = 1 << 14) -> SimResult:
+    """Play ``n`` games from ``iter_batches(n, batch_size, seed)``, reduced to histograms."""
+    strategy = load_strategy(strategy)
+    rng = np.random.default_rng(None if seed is None else (seed, 1))
+    site_hist = np.zeros((NUM_SITES, SITE_BINS), dtype=np.int64)
+    total_hist = np.zeros(TOTAL_BINS, dtype=np.int64)
+    for games in iter_batches(n, batch_size, seed):
+        scores = play_batch(strategy, games, rng) // PENALTY
+        for si in range(NUM_SITES):
+            site_hist[si] += np.bincount(scores[:, si], minlength=SITE_BINS)
+        total_hist += np.bincount(scores.sum(axis=1), minlength=TOTAL_BINS)
+    return SimResult(strategy.name, n, site_hist, total_hist)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    ap.add_argument("strategies", nargs="*", metavar="STRATEGY",
+                    help=f"any of {', '.join(BATCH_STRATEGIES)} or package.module:Class (default: all)")
+    ap.add_argument("-n", "--games", type=int, default=100_000)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--batch", type=int, default=1 << 14, help="games stepped in lockstep")
+    args = ap.parse_args(argv)
+
+    for spec in args.strategies or BATCH_STRATEGIES:
+        r = evaluate(spec, args.games, args.seed, args.batch)
+        print(f"{r.strategy:>13}: mean {r.mean():6.1f}  p10 {r.quantile(.1):3d}  median {r.quantile(.5):3d}  "
+              f"p90 {r.quantile(.9):3d}  perfect {r.total_hist[-1] / r.games:6.2%}  ({r.games} games)")
+
+
+if __name__ == "__main__":
+    main()
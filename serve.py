@@ -0,0 +1,43 @@
+"""
+Production entry point: ``streamlit run serve.py``.
+
+Same app as ``streamlit run streamlit.py`` (needs Streamlit 1.57+, the first
+release with ``st.App``), plus year-long ``Cache-Control`` on the content-hashed
+files in app/static/ (see ``seawolf/assets.py``), so repeat visits never
+revalidate them.
+"""
+
+import re
+
+import streamlit as st
+
+if not hasattr(st, "App"):   # older releases would run this file as a page script
+    raise RuntimeError(f"serve.py needs Streamlit 1.57 or later for st.App (installed: {st.__version__}); "
+                     "upgrade with `pip install -r requirements.txt`, or run `streamlit run streamlit.py`")
+
+from starlette.middleware import Middleware
+
+IMMUTABLE = b"public, max-age=31536000, immutable"
+_HASHED = re.compile(r"/app/static/.+\.[0-9a-f]{10}\.\w+$")
+
+
+class ImmutableAssets:
+    """ASGI middleware: cache content-hashed static files for a year."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not _HASHED.search(scope["path"]):
+            return await self.app(scope, receive, send)
+
+        async def send_cached(message):
+            if message["type"] == "http.response.start" and message["status"] == 200:
+                headers = [(k, v) for k, v in message.get("headers", []) if k.lower() != b"cache-control"]
+                message = {**message, "headers": headers + [(b"cache-control", IMMUTABLE)]}
+            await send(message)
+
+        await self.app(scope, receive, send_cached)
+
+
+app = st.App("streamlit.py", middleware=[Middleware(ImmutableAssets)])
@@ -13,410 +13,346 @@ Scoring:
   - -20% if desired trait missing
   - -20% per undesired microbe in trio (max -60%)
 
+Layout:
+  - seawolf/game.py    rules, generation and scoring (no Streamlit)
+  - seawolf/engine.py  headless GameEngine driving the step0 → step4 flow
+  - seawolf/render.py  memoized HTML fragments (cards, site boxes)
+  - assets/            stylesheet and bundled fonts, served from static/ under content-hashed names
+  - serve.py           same app plus year-long cache headers on those files
+  - streamlit.py       thin Streamlit view over the engine; ?page=ops&token=… shows cache stats
+                       (only when SEAWOLF_OPS_TOKEN is set on the server); SEAWOLF_PAYLOAD_METER=1
+                       adds per-view rerun payload sizes
+
 FIX APPLIED:
   - Step 3 prospect pool now INITIALIZES with microbes kept in Step 2 (up to 6),
     then fills remaining slots with the 6 "given" microbes (no duplicates).
 """
 
 import streamlit as st
-import random
+import streamlit.components.v1 as components
+import hmac
+import math
+import os
+import threading
 import time
-from dataclasses import dataclass
-from typing import List, Tuple, Dict, Set
-
-
-# ─── CONSTANTS ────────────────────────────────────────────────────────────────
-TOTAL_TIME = 30 * 60
-NUM_SITES = 3
-PENALTY = 20
-
-FIXED_ATTRIBUTES = ["Permeability", "Mobility", "Energy"]
-
-# Always width-2 intervals
-POSSIBLE_RANGES = [(1, 3), (2, 4), (3, 5), (4, 6), (5, 7), (6, 8), (7, 9), (8, 10)]
-
-ALL_TRAITS = [
-    "Heat-resistant", "Aerobic", "Hydrophilic", "Bioluminescent",
-    "Acidophilic", "UV-tolerant", "Phosphorus-removing",
-    "Cryogenic", "Alkaliphilic", "Photosensitive",
-    "Thermophilic", "Anaerobic", "Magnetotactic",
-    "Halophilic", "Chemotrophic",
-]
-
-PREFIXES = [
-    "Cyro", "Ops", "Neo", "Flux", "Zeta", "Axo", "Viro", "Plex",
-    "Kino", "Rho", "Sigma", "Tau", "Delta", "Omni", "Hexa", "Tera",
-    "Lyso", "Quor", "Myco", "Ecto", "Endo", "Para", "Xeno", "Meso"
-]
-
-SUFFIXES = ["Virus", "Amoeba", "Bacillus", "Spore", "Phage", "Coccus", "Flagella", "Microbe", "Cell", "Filament"]
-
-ICONS = ["🦠", "🧫", "🔬", "💊", "🧬", "⚗️", "🫧", "🌀", "💠", "🔮",
-         "🟣", "🔵", "🟢", "🟡", "⭕", "🔷", "🔶", "💎", "🌐", "⚛️"]
-
-
-# ─── DATA CLASSES ─────────────────────────────────────────────────────────────
-@dataclass
-class Microbe:
-    name: str
-    icon: str
-    attributes: Dict[str, int]   # Permeability, Mobility, Energy (1-10)
-    trait: str                   # exactly 1 trait
-
-    def __hash__(self):
-        return hash(self.name)
-
-    def __eq__(self, other):
-        return isinstance(other, Microbe) and self.name == other.name
-
-
-@dataclass
-class SiteReqs:
-    site_num: int
-    attr_names: List[str]
-    attr_ranges: Dict[str, Tuple[int, int]]
-    desired_trait: str
-    undesired_trait: str
-    neutral_traits: List[str]
-    all_traits: List[str]
-
-
-# ─── GENERATION (one-time at game start) ──────────────────────────────────────
-def _make_name(used_names: Set[str], rng: random.Random) -> str:
-    for _ in range(200):
-        n = f"{rng.choice(PREFIXES)} {rng.choice(SUFFIXES)}"
-        if n not in used_names:
-            used_names.add(n)
-            return n
-    return f"M-{rng.randint(1000, 9999)}"
-
-
-def _make_microbe(used_names: Set[str], rng: random.Random,
-                  site_traits: List[str], desired: str, undesired: str) -> dict:
-    """Create a microbe dict (serializable for session state)."""
-    attrs = {a: rng.randint(1, 10) for a in FIXED_ATTRIBUTES}
-    # Each microbe gets exactly 1 trait from the site's 5 traits
-    r = rng.random()
-    if r < 0.30:
-        trait = desired
-    elif r < 0.45:
-        trait = undesired
-    else:
-        trait = rng.choice(site_traits)  # could be any of the 5
-    return {
-        "name": _make_name(used_names, rng),
-        "icon": rng.choice(ICONS),
-        "attributes": attrs,
-        "trait": trait,
-    }
-
-
-def _make_site(num: int, used_traits: Set[str], rng: random.Random) -> dict:
-    """Create a site requirements dict."""
-    ranges = {a: rng.choice(POSSIBLE_RANGES) for a in FIXED_ATTRIBUTES}
-
-    avail_t = [t for t in ALL_TRAITS if t not in used_traits]
-    if len(avail_t) < 5:
-        avail_t = ALL_TRAITS.copy()
-    t5 = rng.sample(avail_t, 5)
-    used_traits.update(t5)
-
-    return {
-        "site_num": num,
-        "attr_names": list(FIXED_ATTRIBUTES),
-        "attr_ranges": ranges,
-        "desired_trait": t5[0],
-        "undesired_trait": t5[1],
-        "neutral_traits": t5[2:],
-        "all_traits": t5,
-    }
-
-
-def generate_game(seed=None):
-    """Generate all sites and all microbes upfront. Returns serializable dicts."""
-    rng = random.Random(seed)
-    used_names: Set[str] = set()
-    used_traits: Set[str] = set()
-
-    sites = [_make_site(i + 1, used_traits, rng) for i in range(NUM_SITES)]
-    all_microbes = {}
-
-    for si, site in enumerate(sites):
-        d = site["desired_trait"]
-        u = site["undesired_trait"]
-        traits = site["all_traits"]
-
-        pool = {
-            "step2": [_make_microbe(used_names, rng, traits, d, u) for _ in range(10)],
-            "step3_given": [_make_microbe(used_names, rng, traits, d, u) for _ in range(6)],
-            "step3_rounds": [
-                [_make_microbe(used_names, rng, traits, d, u) for _ in range(3)]
-                for _ in range(4)
-            ],
-        }
-        all_microbes[si] = pool
+import warnings
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, List
+
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from seawolf.game import (
+    TOTAL_TIME, NUM_SITES, FIXED_ATTRIBUTES, generate_game, to_microbe,
+)
+from seawolf.engine import GameEngine, InvalidTransition, KEEP, SAVE, REJECT
+from seawolf.render import (
+    FOCUS, REVIEW, CANDIDATE, SELECTED, UNSELECTED,
+    fmt_time, score_class, card, card_grid, category_lists, prospect_table, site_box, next_site_preview, preview_box,
+    render_cache_stats,
+)
+from seawolf.solver import solve_treatment
+from seawolf.calibrate import TIERS, VettedPool
+from seawolf.assets import build_assets
 
-    return sites, all_microbes
 
+# ─── CSS ──────────────────────────────────────────────────────────────────────
+@st.cache_resource(show_spinner=False)
+def asset_manifest() -> Dict[str, str]:
+    """Content-hashed names of the files in assets/, built into static/ once per process."""
+    return build_assets()
 
-# ─── HELPERS (dict -> dataclass) ──────────────────────────────────────────────
-def to_microbe(d: dict) -> Microbe:
-    return Microbe(name=d["name"], icon=d["icon"], attributes=d["attributes"], trait=d["trait"])
 
+def stylesheet_tag() -> str:
+    """
+    The class stylesheet is fetched (and cached) by the browser once; each
+    rerun only re-sends this short tag. Its hashed name changes with its content.
+    """
+    return f"<style>@import url('app/static/{asset_manifest()['seawolf.css']}');</style>"
 
-def to_site(d: dict) -> SiteReqs:
-    ar = {}
-    for k, v in d["attr_ranges"].items():
-        ar[k] = tuple(v) if isinstance(v, list) else v
-    return SiteReqs(
-        site_num=d["site_num"],
-        attr_names=d["attr_names"],
-        attr_ranges=ar,
-        desired_trait=d["desired_trait"],
-        undesired_trait=d["undesired_trait"],
-        neutral_traits=d["neutral_traits"],
-        all_traits=d["all_traits"],
-    )
 
+def component_stylesheet() -> str:
+    """The same stylesheet (and so the bundled fonts) as seen from a component iframe."""
+    return f"../../app/static/{asset_manifest()['seawolf.css']}"
 
-# ─── SCORING ──────────────────────────────────────────────────────────────────
-def score_treatment(site: SiteReqs, trio: List[Microbe]) -> Tuple[int, List[str]]:
-    details, penalties = [], 0
 
-    for a in site.attr_names:
-        vals = [m.attributes[a] for m in trio]
-        avg = sum(vals) / 3
-        lo, hi = site.attr_ranges[a]
-        ok = lo <= avg <= hi
-        details.append(f"{'✅' if ok else '❌'} {a}: avg {avg:.1f} (range {lo}–{hi})")
-        if not ok:
-            penalties += 1
+# ─── PAYLOAD METER ────────────────────────────────────────────────────────────
+PAYLOAD_METER_ENV = "SEAWOLF_PAYLOAD_METER"
 
-    has_d = any(m.trait == site.desired_trait for m in trio)
-    details.append(f"{'✅' if has_d else '❌'} Desired «{site.desired_trait}»: {'present' if has_d else 'MISSING'}")
-    if not has_d:
-        penalties += 1
 
-    bad = [m.name for m in trio if m.trait == site.undesired_trait]
-    if not bad:
-        details.append(f"✅ Undesired «{site.undesired_trait}»: absent")
-    else:
-        penalties += len(bad)
-        details.append(f"❌ Undesired «{site.undesired_trait}»: found in {', '.join(bad)} (−{len(bad) * 20}%)")
+def payload_meter_enabled() -> bool:
+    """The meter is a debugging aid: installed only when the server sets ``SEAWOLF_PAYLOAD_METER=1``."""
+    return os.environ.get(PAYLOAD_METER_ENV, "") not in ("", "0")
 
-    return max(0, 100 - penalties * PENALTY), details
 
+class PayloadStats:
+    """Bytes each rerun pushes to its client, per rendered step (server-wide)."""
 
-# ─── HTML HELPERS ─────────────────────────────────────────────────────────────
-def fmt_time(s: int) -> str:
-    return f"{s // 60:02d}:{s % 60:02d}"
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, List[int]] = {}    # label → [runs, total, last, peak]
+        self.unsupported = False                  # this Streamlit has no outgoing-queue hook
 
+    def record(self, label: str, n: int):
+        with self._lock:
+            s = self._stats.setdefault(label, [0, 0, 0, 0])
+            s[0] += 1
+            s[1] += n
+            s[2] = n
+            s[3] = max(s[3], n)
 
-def trait_html(t: str, desired: str, undesired: str) -> str:
-    if t == desired:
-        return f"<span style='background:#14532d;color:#86efac;padding:2px 10px;border-radius:6px;'>✅ {t}</span>"
-    if t == undesired:
-        return f"<span style='background:#7f1d1d;color:#fca5a5;padding:2px 10px;border-radius:6px;'>🚫 {t}</span>"
-    return f"<span style='background:#1e293b;color:#d1d5db;padding:2px 10px;border-radius:6px;'>⚪ {t}</span>"
+    def rows(self) -> List[dict]:
+        with self._lock:
+            return [{"view": label, "runs": r, "mean bytes": total // r, "last": last, "peak": peak}
+                    for label, (r, total, last, peak) in sorted(self._stats.items())]
 
 
-def card(m: Microbe, site: SiteReqs, border="#334155") -> str:
-    attr_spans = "".join(
-        f"<span style='margin-right:16px;'>"
-        f"<span style='color:#d1d5db;'>{a}:</span> "
-        f"<b style='color:#e5e7eb;'>{m.attributes[a]}</b>"
-        f"</span>"
-        for a in site.attr_names
-    )
-    return f"""
-    <div style="background:#0f172a;border:2px solid {border};border-radius:12px;
-         padding:14px 18px;margin-bottom:8px;">
-      <div style="font-size:1.1em;font-weight:700;color:#f1f5f9;margin-bottom:6px;">{m.icon} {m.name}</div>
-      <div style="margin-bottom:6px;">{attr_spans}</div>
-      <div>{trait_html(m.trait, site.desired_trait, site.undesired_trait)}</div>
-    </div>
-    """
+@st.cache_resource(show_spinner=False)
+def payload_stats() -> PayloadStats:
+    return PayloadStats()
 
 
-def site_box(site: SiteReqs) -> str:
-    rows = "".join(
-        f"<div style='display:inline-block;margin-right:28px;margin-bottom:6px;'>"
-        f"<div style='color:#d1d5db;font-size:.78em;'>📊 {a}</div>"
-        f"<div style='font-weight:700;font-size:1.15em;color:#f1f5f9;'>{lo} – {hi}</div></div>"
-        for a in site.attr_names for lo, hi in [site.attr_ranges[a]]
-    )
-    return f"""
-    <div style="background:#1e293b;border:1px solid #334155;border-radius:14px;
-         padding:18px;margin-bottom:14px;">
-      <div style="font-weight:700;color:#38bdf8;margin-bottom:10px;font-size:1.05em;">
-        📍 Site {site.site_num} — Requirements</div>
-      <div>{rows}</div>
-      <div style="margin-top:10px;">
-        <span style='background:#14532d;color:#86efac;padding:3px 12px;border-radius:6px;
-              font-size:.88em;margin-right:14px;'>✅ Desired: {site.desired_trait}</span>
-        <span style='background:#7f1d1d;color:#fca5a5;padding:3px 12px;border-radius:6px;
-              font-size:.88em;margin-right:14px;'>🚫 Undesired: {site.undesired_trait}</span>
-      </div>
-    </div>
-    """
+def view_label() -> str:
+    if st.query_params.get("page") == "ops" and ops_allowed():
+        return "ops"
+    eng = st.session_state.get("engine")
+    if eng is None:
+        return "menu"
+    return eng.cur_step if eng.phase == "playing" else eng.phase
 
 
-def next_site_preview(next_site: SiteReqs) -> str:
-    """Show a single attribute hint for the next site (like the real game)."""
-    rng = random.Random(next_site.site_num)
-    a = rng.choice(FIXED_ATTRIBUTES)
-    lo, hi = next_site.attr_ranges[a]
-    show_trait = next_site.desired_trait if rng.random() < 0.5 else next_site.undesired_trait
-    trait_label = "Desired" if show_trait == next_site.desired_trait else "Undesired"
-    return f"""
-    <div style="background:#1a1a2e;border:1px dashed #9ca3af;border-radius:10px;
-         padding:10px 14px;margin-top:10px;display:inline-block;">
-      <span style="color:#b0b8c4;font-size:.82em;">👁 Next site preview — </span>
-      <span style="color:#a5b4fc;font-weight:600;">{a}: {lo}–{hi}</span>
-      <span style="color:#9ca3af;margin-left:14px;font-size:.82em;">{trait_label}: {show_trait}</span>
-    </div>
+@contextmanager
+def payload_meter(suffix: str = ""):
+    """
+    Count the serialized size of every message this run sends to the browser
+    and file it under the view it rendered. Hooks the run context's private
+    outgoing queue, which is the only place the final (possibly cache-referenced)
+    messages are visible; nested meters (a fragment inside a full run) are no-ops,
+    and so is every meter (after one warning) if a Streamlit release drops the hook.
+    Off unless ``payload_meter_enabled()``: without it no run context is touched.
     """
+    ctx = get_script_run_ctx()
+    if ctx is None or not payload_meter_enabled() or getattr(ctx, "_payload_meter", False):
+        yield
+        return
+    enqueue = getattr(ctx, "_enqueue", None)
+    if enqueue is None:
+        stats = payload_stats()
+        if not stats.unsupported:
+            stats.unsupported = True
+            warnings.warn("payload meter disabled: ScriptRunContext has no _enqueue in this Streamlit release",
+                          RuntimeWarning, stacklevel=3)
+        yield
+        return
+    sent = [0]
 
+    def counting(msg):
+        sent[0] += msg.ByteSize()
+        enqueue(msg)
 
-# ─── CSS ──────────────────────────────────────────────────────────────────────
-CSS = """
-<style>
-@import url('https://fonts.googleapis.com/css2?family=Outfit:wght@300;400;600;700;800&display=swap');
-.stApp { background:#020617; color:#d1d5db; }
-* { color:#d1d5db; }
-h1,h2,h3,h4 { font-family:'Outfit',sans-serif !important; color:#e5e7eb !important; }
-p, li, span, label, td, th, summary { color:#d1d5db !important; }
-.big-title { font-family:'Outfit',sans-serif; font-size:2.6em; font-weight:800; text-align:center;
-  background:linear-gradient(135deg,#22d3ee,#3b82f6,#a78bfa);
-  -webkit-background-clip:text; -webkit-text-fill-color:transparent; }
-.sub { text-align:center; color:#9ca3af !important; font-size:1.05em; margin-bottom:18px; }
-.step-badge { display:inline-block; background:#1e40af; color:#dbeafe !important; padding:5px 16px;
-  border-radius:8px; font-weight:700; font-size:.95em; }
-.timer-box { font-family:'Outfit',sans-serif; text-align:center; font-size:2.2em;
-  font-weight:700; padding:8px; border-radius:12px; }
-.sbox { background:linear-gradient(135deg,#1e293b,#0f172a); border:1px solid #334155;
-  border-radius:14px; padding:14px; text-align:center; }
-.snum { font-family:'Outfit',sans-serif; font-size:2.2em; font-weight:800; }
-.cat-sec { background:#0f172a; border:1px solid #1e293b; border-radius:10px;
-  padding:10px 12px; min-height:60px; }
-.cat-hd { font-weight:700; margin-bottom:4px; font-size:.88em; }
-.cat-it { font-size:.82em; color:#d1d5db !important; padding:1px 0; }
-.stCheckbox label span { color:#d1d5db !important; }
-.stCheckbox label { color:#d1d5db !important; }
-.stMarkdown p, .stMarkdown li, .stMarkdown span { color:#d1d5db !important; }
-.stSlider label { color:#d1d5db !important; }
-div[data-testid="stExpander"] summary span { color:#d1d5db !important; }
-div[data-testid="stButton"] button { font-weight:600 !important; }
-div[data-testid="stAlert"] p { color:#1f2937 !important; }
-</style>
-"""
+    ctx._enqueue, ctx._payload_meter = counting, True
+    try:
+        yield
+    finally:
+        ctx._enqueue, ctx._payload_meter = enqueue, False
+        payload_stats().record(view_label() + suffix, sent[0])
+
+
+# ─── COMPONENTS ───────────────────────────────────────────────────────────────
+_countdown = components.declare_component(
+    "countdown", path=str(Path(__file__).parent / "components" / "countdown"))
+_categorize = components.declare_component(
+    "categorize", path=str(Path(__file__).parent / "components" / "categorize"))
 
 
 # ─── CORE APP ─────────────────────────────────────────────────────────────────
+GAME_CACHE_SIZE = 512
+RANDOM_TIER = "random"
+
+
+@st.cache_resource(max_entries=GAME_CACHE_SIZE, show_spinner=False)
+def load_game(seed: int):
+    """Materialized game shared by every session playing ``seed`` (bounded, evicted LRU)."""
+    return generate_game(seed)
+
+
 def reset_state():
     S = st.session_state
-    defaults = dict(
-        phase="menu",
-        sites=None,
-        microbes=None,
-        cur_site=0,
-        cur_step="step1",
-        s2_index=0,
-        s2_kept=None,
-        s2_saved=None,
-        s2_rejected=None,
-        s0_index=0,
-        s3_round=0,
-        s3_prospects=None,
-        s4_selection=None,
-        site_scores=None,
-        site_details=None,
-        start_time=None,
-        seed=None,
-    )
-    for k, v in defaults.items():
-        if k not in S:
-            S[k] = v
+    if "engine" not in S:
+        S.engine = None
 
 
-def init_new_game():
-    S = st.session_state
-    seed = int(time.time() * 1000) % (2**31)
-    sites, microbes = generate_game(seed)
+@st.cache_resource(show_spinner=False, on_release=VettedPool.close)
+def vetted_pool() -> VettedPool:
+    """Server-wide queues of pre-screened seeds per difficulty tier (workers start on the first pick)."""
+    return VettedPool()
 
-    S.seed = seed
-    S.sites = sites
-    S.microbes = microbes
 
-    S.phase = "playing"
-    S.cur_site, S.cur_step = 0, "step1"
-    S.start_time = time.time()
+def init_new_game(tier: str = RANDOM_TIER):
+    seed = None if tier == RANDOM_TIER else vetted_pool().pop(tier)
+    if seed is None:
+        if tier != RANDOM_TIER:
+            st.toast(f"No {tier} game is vetted yet, so this one is random. Try again in a moment.", icon="⏳")
+        seed = int(time.time() * 1000) % (2**31)
+    st.session_state.engine = GameEngine(seed, start_time=time.time(), loader=load_game)
 
-    S.s2_index, S.s0_index, S.s3_round = 0, 0, 0
-    S.s2_kept = {i: [] for i in range(NUM_SITES)}
-    S.s2_saved = {i: [] for i in range(NUM_SITES)}
-    S.s2_rejected = {i: [] for i in range(NUM_SITES)}
-    S.s3_prospects = {i: [] for i in range(NUM_SITES)}
-    S.s4_selection = set()
-    S.site_scores, S.site_details = {}, {}
 
+def best_possible(eng: GameEngine, si: int):
+    """Best Step 4 score reachable from the prospects the player built (None if unplayed)."""
+    mask = eng.s3_prospects[si]
+    if mask.bit_count() < 3:
+        return None
+    return solve_treatment(eng.site_reqs(si), eng.materialize(mask)).best_score
 
-def go_next_site_or_results():
-    S = st.session_state
-    si = S.cur_site
-    if si < NUM_SITES - 1:
-        S.cur_site = si + 1
-        # Step 0 only if previous site saved microbes exist
-        S.cur_step = "step0" if S.s2_saved.get(si, []) else "step1"
 
-        S.s4_selection = set()
-        S.s2_index = 0
-        S.s0_index = 0
-        S.s3_round = 0
-    else:
-        S.phase = "results"
+def time_left(eng: GameEngine) -> int:
+    """Seconds left by the server clock — the only clock trusted for transitions."""
+    return max(0, math.ceil(eng.deadline - time.time()))
 
 
-def build_step3_initial_prospects(si: int) -> List[dict]:
+def act(action: str, *args):
     """
-    FIX: Start Step 3 with microbes kept in Step 2 (up to 6),
-         then fill with step3_given to reach 6 (no duplicates).
+    Single transition function behind every widget callback. Callbacks run
+    before the script, so each user action costs exactly one script run.
     """
     S = st.session_state
-    kept = list(S.s2_kept[si])                 # kept microbes from Step 2
-    given = list(S.microbes[si]["step3_given"])  # fallback fillers
+    if action == "start":
+        init_new_game(*args)
+        return
+    if action == "play_again":
+        for k in list(S.keys()):
+            del S[k]
+        return
+
+    eng = S.engine
+    if eng is None or eng.phase != "playing":
+        return
+    if time_left(eng) <= 0:
+        eng.time_up()
+        return
+    try:
+        getattr(eng, action)(*args)
+    except InvalidTransition:
+        pass   # stale widget (e.g. a double click); the run shows the current state
+
+
+def confirm_profile(key: str):
+    """Step 1 form callback: the picks arrive all at once on submit."""
+    act("confirm_profile", list(st.session_state.get(key) or []))
+
+
+def remember_quick_mode():
+    """Widget state is dropped while the toggle is off screen (Steps 0/1/3/4); keep the choice for the game."""
+    st.session_state.quick_pref = st.session_state.quick_step2
+
+
+def categorize_all(key: str):
+    """Step 2 quick-mode callback: the whole categorization arrives at once."""
+    value = st.session_state.get(key) or {}
+    act("categorize_all", value.get("actions", []), value.get("names", []))
+    act("finish_step2")   # refused (a no-op) unless the categorization went through
+
+
+def pick_treatment(key: str):
+    """Step 4 pills callback: apply the toggled prospects, then mirror the engine's selection back."""
+    S = st.session_state
+    eng = S.engine
+    if eng is None:
+        return
+    want, have = set(S[key] or []), set(eng.selected())
+    for pi in sorted(have - want):
+        act("set_selected", pi, False)
+    for pi in sorted(want - have):
+        act("set_selected", pi, True)   # a 4th pick is refused by the engine
+    S[key] = eng.selected()
+
+
+@st.fragment
+@payload_meter(" (fragment)")
+def step4_panel():
+    """Step 4 selection grid + live preview; a pick reruns only this fragment."""
+    eng = st.session_state.engine
+    if eng is None or eng.phase != "playing" or eng.cur_step != "step4":
+        st.rerun()   # submitted or timed out: the whole page changes
+
+    si, site = eng.cur_site, eng.site
+    prospects = eng.prospects()
+    sel = eng.selected()
+
+    st.markdown(f"Select **3 microbes** from your prospects. ({len(sel)} / 3 selected)")
+
+    if sel:
+        sel_names = [prospects[j]["name"] for j in sel]
+        st.markdown(f"**Selected:** {', '.join(sel_names)}")
+        st.markdown(preview_box(eng.preview(), site), unsafe_allow_html=True)
 
-    prospects0 = []
-    seen = set()
+    st.markdown("---")
+
+    st.html(card_grid([card(to_microbe(p), site, SELECTED if pi in sel else UNSELECTED)
+                       for pi, p in enumerate(prospects)]))
+
+    key = f"s4p{si}"
+    if key not in st.session_state:
+        st.session_state[key] = sel
+    st.pills(
+        "Select 3 microbes", list(range(len(prospects))), selection_mode="multi", key=key,
+        format_func=lambda pi: f"{prospects[pi]['icon']} {prospects[pi]['name']}",
+        on_change=pick_treatment, args=(key,),
+    )
+
+    st.markdown("---")
 
-    for m in kept:
-        n = m.get("name")
-        if n and n not in seen:
-            prospects0.append(m)
-            seen.add(n)
-        if len(prospects0) == 6:
-            return prospects0
+    can_submit = len(sel) == 3
+    st.button("🔬 Submit Treatment", type="primary", disabled=not can_submit, use_container_width=True,
+              on_click=act, args=("submit",))
 
-    for m in given:
-        n = m.get("name")
-        if n and n not in seen:
-            prospects0.append(m)
-            seen.add(n)
-        if len(prospects0) == 6:
-            break
 
-    return prospects0
+OPS_TOKEN_ENV = "SEAWOLF_OPS_TOKEN"
+
+
+def ops_allowed() -> bool:
+    """``?page=ops`` is served only with ``&token=`` equal to the server's ops token; unset means never."""
+    token = os.environ.get(OPS_TOKEN_ENV, "")
+    given = st.query_params.get("token", "")
+    return bool(token) and hmac.compare_digest(given.encode(), token.encode())
+
+
+def ops_page():
+    """Server-wide cache counters and rerun payload sizes (``?page=ops``)."""
+    st.markdown("### 🛠 Ops")
+    rows = [
+        {"cache": name, "hits": c["hits"], "misses": c["misses"],
+         "hit rate": f"{c['hits'] / max(1, c['hits'] + c['misses']):.1%}",
+         "size": c["currsize"], "max": c["maxsize"]}
+        for name, c in render_cache_stats().items()
+    ]
+    st.dataframe(rows, hide_index=True, use_container_width=True)
+    st.markdown("**Bytes sent per rerun**")
+    if not payload_meter_enabled():
+        st.caption(f"Not measured: start the server with {PAYLOAD_METER_ENV}=1 to install the meter.")
+    elif payload_stats().unsupported:
+        st.caption("Not measured: this Streamlit release has no outgoing-queue hook.")
+    st.dataframe(payload_stats().rows(), hide_index=True, use_container_width=True)
+    st.caption(f"Vetted seeds queued per tier: {vetted_pool().levels()}")
 
 
 def main():
     st.set_page_config(page_title="🌊 Sea Wolf", layout="wide", initial_sidebar_state="collapsed")
-    st.markdown(CSS, unsafe_allow_html=True)
+    st.markdown(stylesheet_tag(), unsafe_allow_html=True)
+
+    if st.query_params.get("page") == "ops" and ops_allowed():
+        ops_page()
+        return
 
     reset_state()
     S = st.session_state
+    eng = S.engine
+    if eng is not None and eng.phase == "playing" and time_left(eng) <= 0:
+        eng.time_up()
+    phase = eng.phase if eng is not None else "menu"
 
     # ───────────────────────────── MENU ──────────────────────────────────────
-    if S.phase == "menu":
+    if phase == "menu":
         st.markdown("&nbsp;", unsafe_allow_html=True)
         st.markdown('<div class="big-title">🌊 Sea Wolf</div>', unsafe_allow_html=True)
         st.markdown('<div class="sub">Ocean Cleanup — McKinsey PSG Simulation</div>', unsafe_allow_html=True)
@@ -445,102 +381,87 @@ and **5 traits** (1 desired, 1 undesired, 3 neutral).
 - Desired trait missing → **−20 %**
 - Each microbe with undesired trait → **−20 %** each (max −60 %)
 """)
-            if st.button("🚀 Start Game", use_container_width=True, type="primary"):
-                init_new_game()
-                st.rerun()
+            tier = st.radio(
+                "Difficulty", [RANDOM_TIER] + list(TIERS), horizontal=True,
+                format_func=lambda t: "🎲 Random" if t == RANDOM_TIER else TIERS[t].label,
+            )
+            st.button("🚀 Start Game", use_container_width=True, type="primary",
+                      on_click=act, args=("start", tier))
         return
 
     # ───────────────────────────── RESULTS ───────────────────────────────────
-    if S.phase == "results":
+    if phase == "results":
         st.markdown('<div class="big-title">🌊 Mission Complete</div>', unsafe_allow_html=True)
         st.markdown('<div class="sub">Final Treatment Report</div>', unsafe_allow_html=True)
         st.markdown("---")
 
-        scores = [S.site_scores.get(i, 0) for i in range(NUM_SITES)]
+        scores = [eng.site_scores.get(i, 0) for i in range(NUM_SITES)]
         avg = sum(scores) / NUM_SITES
-        gc = "#4ade80" if avg >= 80 else ("#fbbf24" if avg >= 50 else "#f87171")
+        gc = "hi" if avg >= 80 else ("md" if avg >= 50 else "lo")
         grade = ("🏆 Excellent!" if avg >= 80 else
                  "✅ Good" if avg >= 60 else
                  "⚠️ Needs work" if avg >= 40 else "❌ Below threshold")
 
-        st.markdown(f"""
-        <div style="text-align:center;padding:30px;background:#0f172a;
-             border:2px solid {gc}40;border-radius:20px;margin-bottom:24px;">
-          <div style="color:#d1d5db;">Overall Effectiveness</div>
-          <div style="font-family:'Outfit',sans-serif;font-size:4em;font-weight:800;color:{gc};">{avg:.0f}%</div>
-          <div style="font-size:1.2em;color:#f1f5f9;">{grade}</div>
-          <div style="color:#9ca3af;margin-top:6px;">Total: {sum(scores)} / 300</div>
-        </div>
-        """, unsafe_allow_html=True)
+        st.markdown(
+            f"<div class='res {gc}'><div>Overall Effectiveness</div><div class='big {gc}'>{avg:.0f}%</div>"
+            f"<div class='grade'>{grade}</div><div class='mu'>Total: {sum(scores)} / 300</div></div>",
+            unsafe_allow_html=True
+        )
 
         cols = st.columns(NUM_SITES)
         for i in range(NUM_SITES):
             sc = scores[i]
-            c = "#4ade80" if sc >= 80 else ("#fbbf24" if sc >= 40 else "#f87171")
             with cols[i]:
                 st.markdown(
-                    f"<div class='sbox'><div style='color:#d1d5db;font-size:.78em;'>Site {i+1}</div>"
-                    f"<div class='snum' style='color:{c};'>{sc}%</div></div>",
+                    f"<div class='sbox'><div class='slbl'>Site {i+1}</div>"
+                    f"<div class='snum {score_class(sc)}'>{sc}%</div></div>",
                     unsafe_allow_html=True
                 )
-                for d in S.site_details.get(i, []):
+                best = best_possible(eng, i)
+                if best is not None:
+                    st.markdown(f"🎯 **Best possible:** {best}% · yours {sc}%")
+                for d in eng.site_details.get(i, []):
                     st.markdown(d)
 
-        if S.start_time:
-            used = min(time.time() - S.start_time, TOTAL_TIME)
+        if eng.start_time:
+            used = min(time.time() - eng.start_time, TOTAL_TIME)
             st.markdown(
-                f"<div style='text-align:center;color:#9ca3af;margin-top:16px;'>"
+                f"<div class='used'>"
                 f"⏱️ Time used: {fmt_time(int(used))} / {fmt_time(TOTAL_TIME)}</div>",
                 unsafe_allow_html=True
             )
 
         st.markdown("---")
-        if st.button("🔄 Play Again", type="primary", use_container_width=True):
-            for k in list(st.session_state.keys()):
-                del st.session_state[k]
-            st.rerun()
+        st.button("🔄 Play Again", type="primary", use_container_width=True,
+                  on_click=act, args=("play_again",))
         return
 
     # ───────────────────────────── PLAYING ───────────────────────────────────
-    sites_data = S.sites
-    si = S.cur_site
-    site = to_site(sites_data[si])
-    step = S.cur_step
-
-    elapsed = time.time() - S.start_time
-    remaining = max(0, TOTAL_TIME - int(elapsed))
-
-    if remaining <= 0:
-        for i in range(NUM_SITES):
-            if i not in S.site_scores:
-                S.site_scores[i] = 0
-                S.site_details[i] = ["⏰ Time's up — site not completed"]
-        S.phase = "results"
-        st.rerun()
+    si = eng.cur_site
+    site = eng.site
+    step = eng.cur_step
 
     # ── TOP BAR ──
-    tc = "#4ade80" if remaining > 300 else ("#fbbf24" if remaining > 60 else "#f87171")
     t1, t2, t3, t4, t5 = st.columns([1.6, .9, .9, .9, 1.4])
 
     with t1:
-        st.markdown(f"<div class='timer-box' style='color:{tc};'>⏱️ {fmt_time(remaining)}</div>",
-                    unsafe_allow_html=True)
+        # Ticks in the browser; its single expiry event reruns us into the time's-up path above
+        _countdown(remaining_ms=int((eng.deadline - time.time()) * 1000), stylesheet=component_stylesheet(),
+                   key="countdown", default=None)
 
     for idx, col in enumerate([t2, t3, t4]):
         with col:
-            if idx in S.site_scores:
-                sc = S.site_scores[idx]
-                c = "#4ade80" if sc >= 80 else ("#fbbf24" if sc >= 40 else "#f87171")
+            if idx in eng.site_scores:
+                sc = eng.site_scores[idx]
                 st.markdown(
-                    f"<div class='sbox'><div style='color:#d1d5db;font-size:.78em;'>Site {idx+1}</div>"
-                    f"<div class='snum' style='color:{c};'>{sc}%</div></div>",
+                    f"<div class='sbox'><div class='slbl'>Site {idx+1}</div>"
+                    f"<div class='snum {score_class(sc)}'>{sc}%</div></div>",
                     unsafe_allow_html=True
                 )
             else:
                 lbl = "▶ Active" if idx == si else "◻ Pending"
                 st.markdown(
-                    f"<div class='sbox'><div style='color:#d1d5db;font-size:.78em;'>Site {idx+1}</div>"
-                    f"<div style='color:#9ca3af;margin-top:4px;'>{lbl}</div></div>",
+                    f"<div class='sbox'><div class='slbl'>Site {idx+1}</div><div class='sst'>{lbl}</div></div>",
                     unsafe_allow_html=True
                 )
 
@@ -559,16 +480,8 @@ and **5 traits** (1 desired, 1 undesired, 3 neutral).
 
     # ───────────────────────────── STEP 0 ────────────────────────────────────
     if step == "step0":
-        prev_saved = S.s2_saved.get(si - 1, [])
-        if not prev_saved:
-            S.cur_step = "step1"
-            st.rerun()
-
-        idx = S.s0_index
-        if idx >= len(prev_saved):
-            S.cur_step = "step1"
-            S.s0_index = 0
-            st.rerun()
+        prev_saved = eng.prev_saved()
+        idx = eng.s0_index
 
         st.markdown("### Step 0 — Review Saved Microbes")
         st.markdown(
@@ -576,226 +489,147 @@ and **5 traits** (1 desired, 1 undesired, 3 neutral).
             f"**Keep** or **Reject** each one. ({idx + 1} / {len(prev_saved)})"
         )
 
-        m_data = prev_saved[idx]
-        m = to_microbe(m_data)
-        st.markdown(card(m, site, "#6366f1"), unsafe_allow_html=True)
+        m = to_microbe(eng.step0_current())
+        st.markdown(card(m, site, REVIEW), unsafe_allow_html=True)
 
         c1, c2, _ = st.columns([1, 1, 2])
         with c1:
-            if st.button("✅ Keep for this site", key=f"s0k{si}_{idx}", use_container_width=True, type="primary"):
-                S.s2_kept[si].append(m_data)
-                S.s0_index += 1
-                st.rerun()
+            st.button("✅ Keep for this site", key=f"s0k{si}_{idx}", use_container_width=True, type="primary",
+                      on_click=act, args=("review_saved", True))
         with c2:
-            if st.button("🗑️ Reject", key=f"s0r{si}_{idx}", use_container_width=True):
-                S.s0_index += 1
-                st.rerun()
+            st.button("🗑️ Reject", key=f"s0r{si}_{idx}", use_container_width=True,
+                      on_click=act, args=("review_saved", False))
 
     # ───────────────────────────── STEP 1 ────────────────────────────────────
     elif step == "step1":
         st.markdown("### Step 1 — Build Microbe Profile")
         st.markdown("Choose **2 characteristics** (attributes or traits).")
 
-        chosen = []
-
-        st.markdown("**📊 Numerical Attributes:**")
-        cols_a = st.columns(3)
-        for i, attr in enumerate(FIXED_ATTRIBUTES):
-            with cols_a[i]:
-                lo, hi = site.attr_ranges[attr]
-                if st.checkbox(f"📊 {attr} ({lo}–{hi})", key=f"s1c_{si}_{attr}"):
-                    chosen.append(attr)
-
-        st.markdown("**🧪 Traits:**")
-        cols_t = st.columns(3)
-        for i, tr in enumerate(site.all_traits):
-            with cols_t[i % 3]:
-                if tr == site.desired_trait:
-                    label = f"✅ {tr} (Desired)"
-                elif tr == site.undesired_trait:
-                    label = f"🚫 {tr} (Undesired)"
-                else:
-                    label = f"⚪ {tr}"
-                if st.checkbox(label, key=f"s1c_{si}_{tr}"):
-                    chosen.append(tr)
-
-        if len(chosen) > 2:
-            st.warning("⚠️ Select exactly 2 characteristics. (Only first 2 will be used for sliders below.)")
-
-        for ch in chosen[:2]:
-            if ch in FIXED_ATTRIBUTES:
+        def profile_label(ch: str) -> str:
+            if ch in site.attr_ranges:
                 lo, hi = site.attr_ranges[ch]
-                st.slider(f"Preferred range for **{ch}**", 1, 10, (lo, hi), key=f"s1r_{si}_{ch}")
-
-        if st.button("✅ Confirm Profile & Continue →", type="primary", disabled=(len(chosen) != 2), use_container_width=True):
-            S.cur_step = "step2"
-            S.s2_index = 0
-            st.rerun()
+                return f"📊 {ch} ({lo}–{hi})"
+            if ch == site.desired_trait:
+                return f"✅ {ch} (Desired)"
+            if ch == site.undesired_trait:
+                return f"🚫 {ch} (Undesired)"
+            return f"⚪ {ch}"
+
+        # One form: nothing reaches the server until Confirm; the browser caps the pick at 2
+        key = f"s1m_{si}"
+        with st.form(f"s1f_{si}", border=False):
+            st.multiselect(
+                "📊 Numerical attributes · 🧪 Traits", list(FIXED_ATTRIBUTES) + list(site.all_traits),
+                max_selections=2, key=key, format_func=profile_label, placeholder="Pick 2 characteristics",
+            )
+            st.markdown("**Preferred ranges** (used for the attributes you pick)")
+            cols_r = st.columns(3)
+            for i, attr in enumerate(FIXED_ATTRIBUTES):
+                with cols_r[i]:
+                    lo, hi = site.attr_ranges[attr]
+                    st.slider(attr, 1, 10, (lo, hi), key=f"s1r_{si}_{attr}")
+            submitted = st.form_submit_button("✅ Confirm Profile & Continue →", type="primary",
+                                              use_container_width=True, on_click=confirm_profile, args=(key,))
+        if submitted:   # still on Step 1, so the engine refused it
+            st.warning("⚠️ Select exactly 2 characteristics.")
 
     # ───────────────────────────── STEP 2 ────────────────────────────────────
     elif step == "step2":
-        pool = S.microbes[si]["step2"]  # stable list
-        idx = S.s2_index
+        pool = eng.step2_pool()  # stable list
+        idx = eng.s2_index
 
         st.markdown("### Step 2 — Categorize Microbes")
 
         if idx >= len(pool):
             st.success(
                 f"All 10 microbes categorized! "
-                f"**Kept:** {len(S.s2_kept[si])} · "
-                f"**Saved:** {len(S.s2_saved[si])} · "
-                f"**Rejected:** {len(S.s2_rejected[si])}"
+                f"**Kept:** {eng.s2_kept[si].bit_count()} · "
+                f"**Saved:** {eng.s2_saved[si].bit_count()} · "
+                f"**Rejected:** {eng.s2_rejected[si].bit_count()}"
+            )
+            # ✅ FIX: Step 3 prospects start from kept microbes (up to 6), then fill with given
+            st.button("➡️ Continue to Step 3", type="primary", use_container_width=True,
+                      on_click=act, args=("finish_step2",))
+        elif st.toggle("⌨️ Quick mode — categorize in the browser (K / S / R)", key="quick_step2",
+                       value=st.session_state.get("quick_pref", False), on_change=remember_quick_mode):
+            key = f"s2q{si}"
+            if st.session_state.get(key) is not None:   # still here, so the engine refused it
+                st.error("⚠️ That categorization did not match this site's microbes — please redo it.")
+            remaining = pool[idx:]
+            is_last = si >= NUM_SITES - 1
+            _categorize(
+                token=f"{eng.seed}:{si}:{idx}", first=idx + 1, total=len(pool),
+                microbes=[{"name": m["name"], "icon": m["icon"]} for m in remaining],
+                cards=[card(to_microbe(m), site, FOCUS) for m in remaining],
+                preview="" if is_last else next_site_preview(eng.site_reqs(si + 1)),
+                keep_label=f"✅ Keep for Site {si + 1}",
+                save_label="📦 N/A (last site)" if is_last else f"📦 Save for Site {si + 2}",
+                can_save=not is_last,
+                stylesheet=component_stylesheet(),
+                key=key, default=None, on_change=categorize_all, args=(key,),
             )
-            if st.button("➡️ Continue to Step 3", type="primary", use_container_width=True):
-                S.cur_step = "step3"
-                S.s3_round = 0
-
-                # ✅ FIX: Initialize Step 3 prospects from kept microbes (up to 6), then fill with given
-                S.s3_prospects[si] = build_step3_initial_prospects(si)
-
-                st.rerun()
         else:
             st.markdown(f"**Microbe {idx + 1} / 10**")
-            m_data = pool[idx]
-            m = to_microbe(m_data)
-            st.markdown(card(m, site, "#38bdf8"), unsafe_allow_html=True)
+            m = to_microbe(pool[idx])
+            st.markdown(card(m, site, FOCUS), unsafe_allow_html=True)
 
             if si < NUM_SITES - 1:
-                next_site = to_site(sites_data[si + 1])
+                next_site = eng.site_reqs(si + 1)
                 st.markdown(next_site_preview(next_site), unsafe_allow_html=True)
 
             c1, c2, c3 = st.columns(3)
             with c1:
-                if st.button(f"✅ Keep for Site {si + 1}", key=f"s2k{si}_{idx}", use_container_width=True, type="primary"):
-                    S.s2_kept[si].append(m_data)
-                    S.s2_index += 1
-                    st.rerun()
+                st.button(f"✅ Keep for Site {si + 1}", key=f"s2k{si}_{idx}", use_container_width=True,
+                          type="primary", on_click=act, args=("categorize", KEEP))
             with c2:
                 is_last = si >= NUM_SITES - 1
                 btn_label = f"📦 Save for Site {si + 2}" if not is_last else "📦 N/A (last site)"
-                if st.button(btn_label, key=f"s2s{si}_{idx}", use_container_width=True, disabled=is_last):
-                    S.s2_saved[si].append(m_data)
-                    S.s2_index += 1
-                    st.rerun()
+                st.button(btn_label, key=f"s2s{si}_{idx}", use_container_width=True, disabled=is_last,
+                          on_click=act, args=("categorize", SAVE))
             with c3:
-                if st.button("🗑️ Reject", key=f"s2r{si}_{idx}", use_container_width=True):
-                    S.s2_rejected[si].append(m_data)
-                    S.s2_index += 1
-                    st.rerun()
+                st.button("🗑️ Reject", key=f"s2r{si}_{idx}", use_container_width=True,
+                          on_click=act, args=("categorize", REJECT))
 
             st.markdown("---")
-            cc1, cc2, cc3 = st.columns(3)
-            with cc1:
-                st.markdown(
-                    f"<div class='cat-sec'><div class='cat-hd' style='color:#4ade80;'>✅ Kept ({len(S.s2_kept[si])})</div>",
-                    unsafe_allow_html=True
-                )
-                for km in S.s2_kept[si]:
-                    st.markdown(f"<div class='cat-it'>{km['icon']} {km['name']}</div>", unsafe_allow_html=True)
-                st.markdown("</div>", unsafe_allow_html=True)
-            with cc2:
-                st.markdown(
-                    f"<div class='cat-sec'><div class='cat-hd' style='color:#a78bfa;'>📦 Saved ({len(S.s2_saved[si])})</div>",
-                    unsafe_allow_html=True
-                )
-                for sm in S.s2_saved[si]:
-                    st.markdown(f"<div class='cat-it'>{sm['icon']} {sm['name']}</div>", unsafe_allow_html=True)
-                st.markdown("</div>", unsafe_allow_html=True)
-            with cc3:
-                st.markdown(
-                    f"<div class='cat-sec'><div class='cat-hd' style='color:#9ca3af;'>🗑️ Rejected ({len(S.s2_rejected[si])})</div>",
-                    unsafe_allow_html=True
-                )
-                for rm in S.s2_rejected[si]:
-                    st.markdown(f"<div class='cat-it'>{rm['icon']} {rm['name']}</div>", unsafe_allow_html=True)
-                st.markdown("</div>", unsafe_allow_html=True)
+            st.html(category_lists([
+                ("✅ Kept", "hi", eng.materialize(eng.s2_kept[si])),
+                ("📦 Saved", "sv", eng.materialize(eng.s2_saved[si])),
+                ("🗑️ Rejected", "mu", eng.materialize(eng.s2_rejected[si])),
+            ]))
 
     # ───────────────────────────── STEP 3 ────────────────────────────────────
     elif step == "step3":
-        prospects = S.s3_prospects[si]
-        rnd = S.s3_round
-        rounds_data = S.microbes[si]["step3_rounds"]
+        prospects = eng.prospects()
+        rnd = eng.s3_round
 
         st.markdown("### Step 3 — Build Prospect Pool")
         st.markdown(f"**{len(prospects)} / 10** prospects in pool. 6 starters + pick 1 of 3 in each round.")
 
         with st.expander(f"📋 Current prospects ({len(prospects)})", expanded=False):
-            for p_data in prospects:
-                p = to_microbe(p_data)
-                st.markdown(card(p, site), unsafe_allow_html=True)
+            # one cached table per pool state instead of a card per prospect
+            st.html(prospect_table([to_microbe(p) for p in prospects], site))
 
         if rnd >= 4:
             st.success(f"Prospect pool complete! ({len(prospects)} microbes)")
-            if st.button("➡️ Continue to Step 4", type="primary", use_container_width=True):
-                S.cur_step = "step4"
-                S.s4_selection = set()
-                st.rerun()
+            st.button("➡️ Continue to Step 4", type="primary", use_container_width=True,
+                      on_click=act, args=("finish_step3",))
         else:
             st.markdown(f"#### Round {rnd + 1} of 4 — Pick 1 of 3")
-            cands = rounds_data[rnd]
+            cands = eng.round_candidates()
             cols = st.columns(3)
             for ci, cand_data in enumerate(cands):
                 cand = to_microbe(cand_data)
                 with cols[ci]:
-                    st.markdown(card(cand, site, "#475569"), unsafe_allow_html=True)
-                    if st.button("✅ Select", key=f"s3p{si}_{rnd}_{ci}", use_container_width=True, type="primary"):
-                        # avoid duplicates
-                        existing_names = {m["name"] for m in S.s3_prospects[si]}
-                        if cand_data["name"] not in existing_names:
-                            S.s3_prospects[si].append(cand_data)
-                        S.s3_round += 1
-                        st.rerun()
+                    st.markdown(card(cand, site, CANDIDATE), unsafe_allow_html=True)
+                    st.button("✅ Select", key=f"s3p{si}_{rnd}_{ci}", use_container_width=True, type="primary",
+                              on_click=act, args=("pick_candidate", ci))
 
     # ───────────────────────────── STEP 4 ────────────────────────────────────
     elif step == "step4":
-        prospects = S.s3_prospects[si]
-        sel = S.s4_selection if S.s4_selection else set()
-
         st.markdown("### Step 4 — Create Treatment")
-        st.markdown(f"Select **3 microbes** from your prospects. ({len(sel)} / 3 selected)")
-
-        if sel:
-            sel_names = [to_microbe(prospects[j]).name for j in sorted(sel)]
-            st.markdown(f"**Selected:** {', '.join(sel_names)}")
-
-        st.markdown("---")
-
-        col_l, col_r = st.columns(2)
-        for pi, p_data in enumerate(prospects):
-            p = to_microbe(p_data)
-            col = col_l if pi < 5 else col_r
-            with col:
-                is_sel = pi in sel
-                border = "#3b82f6" if is_sel else "#1e293b"
-                st.markdown(card(p, site, border), unsafe_allow_html=True)
-
-                disabled = len(sel) >= 3 and not is_sel
-                checked = st.checkbox(
-                    f"Select {p.icon} {p.name}",
-                    value=is_sel,
-                    key=f"s4c{si}_{pi}",
-                    disabled=disabled
-                )
-
-                if checked and pi not in sel:
-                    S.s4_selection.add(pi)
-                    st.rerun()
-                elif not checked and pi in sel:
-                    S.s4_selection.discard(pi)
-                    st.rerun()
-
-        st.markdown("---")
-
-        can_submit = len(sel) == 3
-        if st.button("🔬 Submit Treatment", type="primary", disabled=not can_submit, use_container_width=True):
-            trio = [to_microbe(prospects[j]) for j in sorted(sel)]
-            score, details = score_treatment(site, trio)
-            S.site_scores[si] = score
-            S.site_details[si] = details
-
-            go_next_site_or_results()
-            st.rerun()
+        step4_panel()
 
 
 if __name__ == "__main__":
-    main()
+    with payload_meter():
+        main()
@@ -0,0 +1,26 @@
+"""Asset bundle: fonts ship with the app and the stylesheet points at their hashed names."""
+
+import re
+
+from seawolf.assets import SRC_DIR, build_assets, hashed_name, load_manifest
+
+
+def test_fonts_are_bundled(tmp_path):
+    manifest = build_assets(out=tmp_path)
+    assert load_manifest(tmp_path) == manifest
+    font = manifest["fonts/Outfit.woff2"]
+    assert font == hashed_name("fonts/Outfit.woff2", (SRC_DIR / "fonts/Outfit.woff2").read_bytes())
+    assert (tmp_path / font).read_bytes()[:4] == b"wOF2"
+
+    css = (tmp_path / manifest["seawolf.css"]).read_text()
+    assert "@import" not in css and "googleapis" not in css
+    assert f"url('{font}')" in css
+    for url in re.findall(r"url\('([^']+)'\)", css):
+        assert (tmp_path / url).is_file()
+
+
+def test_rebuild_is_stable(tmp_path):
+    first = build_assets(out=tmp_path)
+    assert build_assets(out=tmp_path) == first
+    assert sorted(p.relative_to(tmp_path).as_posix() for p in tmp_path.rglob("*") if p.is_file()) == \
+        sorted(list(first.values()) + ["manifest.json"])
@@ -0,0 +1,19 @@
+"""Benchmark script: the scripted player finishes games, every benchmark runs."""
+
+from seawolf.bench import BENCHMARKS, main, scripted_game
+from seawolf.engine import GameEngine
+from seawolf.game import NUM_SITES, generate_game
+
+
+def test_scripted_game_plays_to_the_end():
+    for seed in range(20):
+        eng = GameEngine(seed, game=generate_game(seed))
+        total = scripted_game(eng)
+        assert eng.phase == "results" and len(eng.site_scores) == NUM_SITES
+        assert total == eng.total_score()
+
+
+def test_every_benchmark_runs(capsys):
+    main(["-n", "20"])
+    out = capsys.readouterr().out
+    assert all(name in out for name in BENCHMARKS)
@@ -0,0 +1,41 @@
+"""Difficulty tiers: par bands, the worker protocol and the background pool."""
+
+import io
+import json
+import time
+
+from seawolf.calibrate import TIERS, VettedPool, screen, screen_many, serve
+
+
+def test_tiers_use_par_bands():
+    assert TIERS["easy"].accepts(300, [10, 12, 40])
+    assert not TIERS["easy"].accepts(300, [9, 12, 40])
+    assert TIERS["normal"].accepts(280, [2, 5, 9])
+    assert not TIERS["normal"].accepts(260, [2, 5, 9])
+    assert TIERS["hard"].accepts(260, [1, 30, 30]) and TIERS["hard"].accepts(280, [50, 50, 50])
+    assert not TIERS["hard"].accepts(300, [50, 50, 50])
+    assert TIERS["expert"].accepts(300, [1, 20, 20])
+    assert not TIERS["expert"].accepts(280, [1, 20, 20])
+
+
+def test_serve_answers_each_line():
+    batches = [["normal", list(range(8))], ["expert", list(range(8, 24))]]
+    out = io.StringIO()
+    serve(io.StringIO("".join(json.dumps(b) + "\n" for b in batches)), out)
+    assert [json.loads(line) for line in out.getvalue().splitlines()] == [screen_many(*b) for b in batches]
+
+
+def test_pool_starts_lazily_and_never_blocks():
+    pool = VettedPool(tiers=["normal"], size=4, batch=4, workers=1)
+    try:
+        assert not pool._threads
+        assert pool.pop("normal") is None   # starts the workers, answers at once
+        deadline = time.monotonic() + 60
+        while not pool.levels()["normal"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        seed = pool.pop("normal")
+        assert seed is not None and screen(seed, "normal")
+    finally:
+        pool.close()
+    assert all(w.proc.poll() is not None for w in pool._workers)
+    assert not any(th.is_alive() for th in pool._threads)
@@ -0,0 +1,62 @@
+"""Corpus format: games survive a write / memory-mapped read round trip."""
+
+import numpy as np
+import pytest
+
+from seawolf.batch import generate_batch
+from seawolf.corpus import MAX_SEED, Corpus, CorpusWriter, decode_batch, encode_batch
+from seawolf.game import generate_game
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "games.swgc"
+    games = [generate_game(seed) for seed in range(40)]
+    batch = generate_batch(500, seed=3)
+    with CorpusWriter(str(path)) as w:
+        for seed, game in enumerate(games):
+            w.add_game(*game, seed=seed)
+        w.add_batch(batch)
+
+    with Corpus(str(path)) as c:
+        assert len(c) == len(games) + len(batch)
+        for k, game in enumerate(games):
+            assert c[k] == game
+            assert c.seed(k) == k
+        for k in (0, 123, len(batch) - 1):
+            assert c[len(games) + k] == batch.game(k)
+            assert c.seed(len(games) + k) is None
+        assert c[-1] == batch.game(len(batch) - 1)
+        with pytest.raises(IndexError):
+            c[len(c)]
+
+        back = c.batch(len(games), len(c))
+        for field in ("attrs", "traits", "site_traits", "ranges", "names", "icons"):
+            assert np.array_equal(getattr(back, field), getattr(batch, field)), field
+
+
+def test_encode_decode_arrays():
+    batch = generate_batch(200, seed=4)
+    back = decode_batch(encode_batch(batch))
+    for field in ("attrs", "traits", "site_traits", "ranges", "names", "icons"):
+        assert np.array_equal(getattr(back, field), getattr(batch, field)), field
+
+
+def test_rejects_other_files(tmp_path):
+    path = tmp_path / "not.swgc"
+    path.write_bytes(b"JUNK" + bytes(60))
+    with pytest.raises(ValueError):
+        Corpus(str(path))
+
+
+def test_seeds_keep_their_full_range(tmp_path):
+    path = tmp_path / "seeds.swgc"
+    game = generate_game(0)
+    with CorpusWriter(str(path)) as w:
+        for seed in (0, MAX_SEED, None):
+            w.add_game(*game, seed=seed)
+        for seed in (-1, MAX_SEED + 1, 2 ** 64):
+            with pytest.raises(ValueError):
+                w.add_game(*game, seed=seed)
+    with Corpus(str(path)) as c:
+        assert len(c) == 3
+        assert [c.seed(k) for k in range(3)] == [0, MAX_SEED, None]
@@ -0,0 +1,25 @@
+"""Random-access generation: any site or microbe of a game, straight from its key."""
+
+import pytest
+
+from seawolf.game import NUM_SITES, POOL_SLOTS, generate_game, generate_microbe, generate_site
+
+
+def _pool(microbes: dict):
+    return microbes["step2"] + microbes["step3_given"] + [m for r in microbes["step3_rounds"] for m in r]
+
+
+@pytest.mark.parametrize("seed", list(range(40)) + [2**31 - 1, 2**40 + 11])
+def test_sites_and_microbes_match_the_full_game(seed):
+    sites, microbes = generate_game(seed)
+    for si in reversed(range(NUM_SITES)):   # no site depends on the ones before it
+        assert generate_site(seed, si) == (sites[si], microbes[si])
+        pool = _pool(microbes[si])
+        assert len(pool) == POOL_SLOTS
+        for slot in reversed(range(POOL_SLOTS)):
+            assert generate_microbe(seed, si, slot) == pool[slot]
+
+
+def test_games_are_reproducible_and_distinct():
+    assert generate_game(3) == generate_game(3)
+    assert generate_game(3) != generate_game(4)
@@ -0,0 +1,85 @@
+"""Ref bitmasks: the mask-based engine state matches the list-based flow it replaced."""
+
+import json
+import random
+
+import pytest
+
+from seawolf.engine import KEEP, REJECT, SAVE, STEP2_POOL, STEP3_ROUNDS, TRIO, GameEngine
+from seawolf.game import (
+    GIVEN_SLOT, POOL_SLOTS, STEP2_SLOT, build_step3_initial_mask, build_step3_initial_prospects,
+    generate_game, mask_refs, microbe_at, microbe_ref, refs_mask, score_treatment, to_microbe,
+)
+
+
+def test_mask_refs_round_trip():
+    rng = random.Random(0)
+    for _ in range(500):
+        refs = sorted(rng.sample(range(3 * POOL_SLOTS), rng.randrange(12)))
+        assert mask_refs(refs_mask(refs)) == refs
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_initial_mask_matches_list(seed):
+    _, microbes = generate_game(seed)
+    rng = random.Random(seed)
+    si = 1
+    carried = [microbe_ref(si - 1, STEP2_SLOT + j) for j in range(STEP2_POOL)]
+    own = [microbe_ref(si, STEP2_SLOT + j) for j in range(STEP2_POOL)]
+    given = [microbe_ref(si, GIVEN_SLOT + j) for j in range(6)]
+    for _ in range(20):
+        kept = sorted(rng.sample(carried, rng.randrange(4)) + rng.sample(own, rng.randrange(9)))
+        by_mask = build_step3_initial_mask(refs_mask(kept), refs_mask(given))
+        by_list = build_step3_initial_prospects([microbe_at(microbes, r) for r in kept],
+                                                [microbe_at(microbes, r) for r in given])
+        assert [microbe_at(microbes, r) for r in mask_refs(by_mask)] == by_list
+
+
+def _play(seed: int, rng: random.Random):
+    """Random legal game on the engine, mirrored with plain lists as the pre-bitmask engine kept them."""
+    game = generate_game(seed)
+    eng = GameEngine(seed, game=game)
+    saved, scores = [], []
+    while eng.phase == "playing":
+        si, site = eng.cur_site, eng.site
+        pool = eng.microbes[si]
+        kept = [m for m in saved if rng.random() < 0.5]
+        for m in saved:
+            eng.review_saved(m in kept)
+        eng.confirm_profile(["a", "b"])
+        saved = []
+        for m in pool["step2"]:
+            action = rng.choice([KEEP, REJECT] + ([] if eng.is_last_site else [SAVE]))
+            eng.categorize(action)
+            if action == KEEP:
+                kept.append(m)
+            elif action == SAVE:
+                saved.append(m)
+        eng.finish_step2()
+        prospects = build_step3_initial_prospects(kept, pool["step3_given"])
+        assert eng.prospects() == prospects
+        for r in range(STEP3_ROUNDS):
+            ci = rng.randrange(3)
+            eng.pick_candidate(ci)
+            pick = pool["step3_rounds"][r][ci]
+            if all(p["name"] != pick["name"] for p in prospects):
+                prospects.append(pick)
+        eng.finish_step3()
+        assert eng.prospects() == prospects
+
+        picks = rng.sample(range(len(prospects)), TRIO)
+        for pi in picks:
+            eng.toggle_selected(pi)
+        snapshot = GameEngine.from_state(json.loads(json.dumps(eng.state())), game=game)
+        assert snapshot.state() == eng.state() and snapshot.preview() == eng.preview()
+        expected, _ = score_treatment(site, [to_microbe(prospects[pi]) for pi in sorted(picks)])
+        assert eng.preview().score == expected
+        score, _ = eng.submit()
+        assert score == expected
+        scores.append(score)
+    return scores
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_engine_matches_list_flow(seed):
+    assert len(_play(seed, random.Random(seed))) == 3
@@ -0,0 +1,55 @@
+"""Name allocator: every draw of a game's capacity is a distinct name."""
+
+import pytest
+
+from seawolf.corpus import Corpus, CorpusWriter
+from seawolf.game import NameAllocator, PREFIXES, SUFFIXES, generate_game, name_at, name_index
+
+BASE = len(PREFIXES) * len(SUFFIXES)
+
+
+@pytest.mark.parametrize("capacity", [1, 84, BASE - 1, BASE, BASE + 1, 3 * BASE + 17, 5000])
+@pytest.mark.parametrize("seed", [0, 7, 2**40 + 3])
+def test_full_capacity_is_unique(seed, capacity):
+    names = NameAllocator(seed, capacity)
+    drawn = [names[k] for k in range(capacity)]
+    assert len(set(drawn)) == capacity
+    assert all(name_index(n) < names.size for n in drawn)
+    if capacity > BASE:
+        assert any(len(n.split(" ")) == 3 for n in drawn)   # roman-numeral generations in play
+    with pytest.raises(IndexError):
+        names[capacity]
+
+
+def test_names_are_seeded():
+    a, b = NameAllocator(1, 84), NameAllocator(2, 84)
+    assert [a[k] for k in range(84)] == [NameAllocator(1, 84)[k] for k in range(84)]
+    assert [a[k] for k in range(84)] != [b[k] for k in range(84)]
+
+
+def test_name_index_inverts_name_at():
+    assert name_at(0) == "Cyro Virus" and name_at(BASE) == "Cyro Virus II"
+    for i in range(0, 20 * BASE, 7):
+        assert name_index(name_at(i)) == i
+    for bad in ("Cyro", "Cyro Virus I", "Cyro Virus IIII", "Foo Virus", "M-1234"):
+        with pytest.raises(ValueError):
+            name_index(bad)
+
+
+def test_generation_names_survive_the_corpus(tmp_path):
+    sites, microbes = generate_game(5)
+    pools = [microbes[si]["step2"] + microbes[si]["step3_given"] + [m for r in microbes[si]["step3_rounds"] for m in r]
+             for si in range(len(sites))]
+    for j, m in enumerate(m for pool in pools for m in pool):
+        m["name"] = name_at(7 * BASE + j)   # up to "… VIII"
+
+    path = tmp_path / "names.swgc"
+    with CorpusWriter(str(path)) as w:
+        w.add_game(sites, microbes)
+        pools[0][0]["name"] = name_at(8 * BASE)   # "… IX" does not fit in 3 bits
+        with pytest.raises(ValueError):
+            w.add_game(sites, microbes)
+    pools[0][0]["name"] = name_at(7 * BASE)
+    with Corpus(str(path)) as c:
+        assert len(c) == 1
+        assert c[0] == (sites, microbes)
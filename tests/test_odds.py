@@ -0,0 +1,42 @@
+"""Outcome odds: the shipped Monte Carlo table regenerates, and agrees with the exact pieces."""
+
+import numpy as np
+import pytest
+
+from seawolf.odds import (
+    SAMPLED_BEST, SAMPLED_POOLS, pool_odds, sample_best, sampled_best, sampled_headline, trio_score_pmf,
+)
+
+ROUNDING = 0.00005   # the table keeps 4 decimals
+
+
+def _within(estimate: np.ndarray, shipped: np.ndarray, pools: int, sigmas: float = 5) -> bool:
+    p = np.clip(shipped, 1 / SAMPLED_POOLS, None)
+    se = np.sqrt(p * (1 - p) * (1 / pools + 1 / SAMPLED_POOLS))
+    return bool((np.abs(estimate - shipped) <= sigmas * se + ROUNDING).all())
+
+
+@pytest.mark.parametrize("n", [3, 6, 10, 12])
+def test_table_regenerates_within_sampling_error(n):
+    pools = 50_000
+    counts = sample_best(n, pools, seed=1000 + n)   # independent of the table's seeds
+    assert counts.sum() == pools
+    assert _within(counts / pools, sampled_best(n), pools)
+
+
+def test_table_rows_are_distributions():
+    for n, row in SAMPLED_BEST.items():
+        assert abs(sum(row) - 1) <= len(row) * ROUNDING, n
+
+
+def test_three_microbe_row_is_the_exact_trio_law():
+    assert _within(trio_score_pmf(), sampled_best(3), SAMPLED_POOLS)
+
+
+def test_lower_bounds_hold():
+    odds = pool_odds(10)
+    at_least = np.cumsum(sampled_best(10)[::-1])[::-1]
+    assert (odds.lower <= at_least + 5e-3).all()
+    perfect, best = sampled_headline(10)
+    assert odds.best_lower() <= best.value
+    assert perfect.stderr < 1e-3 and best.stderr < 0.1
@@ -0,0 +1,26 @@
+"""Whole-game oracle: its plans are legal, replay to par, and par bounds every strategy."""
+
+import pytest
+
+from seawolf.engine import GameEngine
+from seawolf.game import generate_game
+from seawolf.oracle import play_plan, solve_game
+from seawolf.simulate import STRATEGIES, play_game
+
+SEEDS = range(60)
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_plan_replays_to_par(seed):
+    game = generate_game(seed)
+    result = solve_game(*game)
+    assert sum(result.site_scores) == result.par_score
+    assert play_plan(GameEngine(seed, game=game), result.plan) == result.par_score
+
+
+@pytest.mark.parametrize("seed", SEEDS)
+def test_par_bounds_strategies(seed):
+    game = generate_game(seed)
+    par = solve_game(*game).par_score
+    for strategy in STRATEGIES.values():
+        assert sum(play_game(strategy, seed, game)) <= par
@@ -0,0 +1,56 @@
+"""Step 4 solvers: branch-and-bound and NumPy scoring agree with exhaustive search."""
+
+import random
+from itertools import combinations
+
+import pytest
+
+from seawolf.game import GameConfig, generate_game, score_treatment, to_microbe, to_site
+from seawolf.solver import best_treatment, solve_treatment
+
+
+def _case(seed: int):
+    """A site, a random pool with skewed trait odds, a treatment size and a penalty."""
+    rng = random.Random(seed)
+    site = to_site(rng.choice(generate_game(seed)[0]))
+    size = rng.randint(1, 5)
+    p_desired, p_undesired = rng.random() * 0.6, rng.random() * 0.6
+    pool = []
+    for i in range(rng.randint(size, 12)):
+        r = rng.random()
+        trait = (site.desired_trait if r < p_desired else
+                 site.undesired_trait if r < p_desired + p_undesired else rng.choice(site.neutral_traits))
+        pool.append({"name": f"m{i}", "icon": "", "trait": trait,
+                     "attributes": {a: rng.randint(1, 10) for a in site.attr_names}})
+    return site, pool, size, GameConfig(penalty=rng.randint(1, 50))
+
+
+def _exhaustive(site, pool, size, config):
+    microbes = [to_microbe(m) for m in pool]
+    return {c: score_treatment(site, [microbes[i] for i in c], config)[0]
+            for c in combinations(range(len(pool)), size)}
+
+
+@pytest.mark.parametrize("seed", range(300))
+def test_best_treatment_matches_exhaustive(seed):
+    site, pool, size, config = _case(seed)
+    scores = _exhaustive(site, pool, size, config)
+    best, pick = best_treatment(site, pool, size, config.penalty)
+    assert best == max(scores.values())
+    assert scores[pick] == best
+
+
+@pytest.mark.parametrize("seed", range(0, 300, 10))
+def test_solve_treatment_matches_exhaustive(seed):
+    site, pool, size, config = _case(seed)
+    scores = _exhaustive(site, pool, size, config)
+    sol = solve_treatment(site, pool, size=size, penalty=config.penalty)
+    assert sol.best_score == max(scores.values())
+    assert set(sol.optimal) == {c for c, s in scores.items() if s == sol.best_score}
+    assert sorted(sol.ranked, reverse=True) == sorted(((s, c) for c, s in scores.items()), reverse=True)
+
+
+def test_pool_smaller_than_treatment():
+    site, pool, _, _ = _case(0)
+    assert best_treatment(site, pool[:2], size=3) == (0, ())
+    assert solve_treatment(site, pool[:2]).best_score == 0
@@ -0,0 +1,44 @@
+"""Vectorized environment: deterministic strategies score like the scalar simulator."""
+
+import numpy as np
+import pytest
+
+from seawolf.batch import GameBatch
+from seawolf.corpus import game_to_batch
+from seawolf.engine import InvalidTransition
+from seawolf.game import NUM_SITES, PENALTY, generate_game
+from seawolf.simulate import STRATEGIES, Strategy, play_game
+from seawolf.vecenv import BATCH_STRATEGIES, VecEnv, play_batch
+
+SEEDS = range(200)
+
+
+@pytest.fixture(scope="module")
+def games():
+    return [generate_game(seed) for seed in SEEDS]
+
+
+@pytest.fixture(scope="module")
+def batch(games):
+    parts = [game_to_batch(*g) for g in games]
+    return GameBatch(**{f: np.concatenate([getattr(p, f) for p in parts]) for f in GameBatch.__dataclass_fields__})
+
+
+@pytest.mark.parametrize("name", ["base", "keep_desired", "greedy"])
+def test_matches_simulate(name, games, batch):
+    scalar = STRATEGIES.get(name, Strategy())
+    assert scalar.name == name
+    expected = np.array([play_game(scalar, seed, game) for seed, game in zip(SEEDS, games)])
+    np.testing.assert_array_equal(play_batch(BATCH_STRATEGIES[name], batch), expected)
+
+
+def test_random_scores_in_range(batch):
+    scores = play_batch(BATCH_STRATEGIES["random"], batch, np.random.default_rng(0))
+    assert scores.shape == (len(batch), NUM_SITES)
+    assert ((scores >= 0) & (scores <= 100) & (scores % PENALTY == 0)).all()
+
+
+def test_rejects_bad_action(batch):
+    env = VecEnv(batch)
+    with pytest.raises(InvalidTransition):
+        env.step(np.full(len(batch), 5))